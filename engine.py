@@ -6,7 +6,8 @@ A simulation engine for running poker bot competitions. This engine implements
 standard Texas Hold'em rules and provides a framework for AI agents to compete.
 
 Usage:
-    python engine.py
+    python engine.py            # random master seed (printed at start-up)
+    python engine.py 12345      # reproduce a run from its master seed
 
 For detailed documentation, see DOCUMENTATION.md
 """
@@ -15,8 +16,13 @@ import random
 import os
 import sys
 import importlib.util
+import hashlib
+import inspect
+import time
+from array import array
+from copy import copy
 from treys import Card, Evaluator, Deck  # Card/hand evaluation library
-from enum import Enum, auto
+from enum import Enum, IntEnum, auto
 from dataclasses import dataclass
 from typing import List, Dict, Optional
 import signal
@@ -48,6 +54,95 @@ def timeout_handler(signum, frame):
     raise TimeoutException("Timeout reached")
 
 
+@dataclass
+class TimeControl:
+    """
+    Thinking-time rules for the bots at a table. All times are float seconds.
+
+    A bot's budget for one act() call is the smallest of the limits that are
+    set; running over it is a timeout (random action), and a bot whose street
+    allowance or time bank is used up times out immediately. Limits must be
+    positive: None (not 0) means no limit.
+
+    Attributes:
+        per_action: Limit for a single act() call (default: 3.0; None = no limit)
+        per_street: Total a bot may use per street (default: None = no limit)
+        bank: Chess-clock time bank per bot (default: None = no bank)
+        increment: Added to a bot's bank after each of its actions (default: 0.0)
+        bank_per: When banks are refilled: "hand" or "simulation" (default: "hand")
+        ponder: Seconds a sandboxed bot's ponder() may run after each change of the hand
+                (default: 0.0 = pondering off); it is cancelled when the bot's turn arrives
+
+    Examples:
+        TimeControl()                                   # 3 s per action (classic rules)
+        TimeControl(per_action=0.05)                    # blitz, for regression runs
+        TimeControl(per_action=2.0, bank=30.0, increment=0.5, bank_per="simulation")
+    """
+    per_action: Optional[float] = 3.0
+    per_street: Optional[float] = None
+    bank: Optional[float] = None
+    increment: float = 0.0
+    bank_per: str = "hand"
+    ponder: float = 0.0
+
+    def __post_init__(self):
+        for name in ("per_action", "per_street", "bank"):
+            value = getattr(self, name)
+            if value is not None and value <= 0:
+                raise ValueError(f"{name} must be positive or None (no limit), not {value!r}")
+        for name in ("increment", "ponder"):
+            if getattr(self, name) < 0:
+                raise ValueError(f"{name} must not be negative, not {getattr(self, name)!r}")
+        if self.bank_per not in ("hand", "simulation"):
+            raise ValueError(f"bank_per must be 'hand' or 'simulation', not {self.bank_per!r}")
+
+
+class Deadline:
+    """
+    When the engine will stop waiting for a bot's current action.
+
+    Handed to bots as state.deadline. It is taken from the same budget the
+    engine enforces (time per action, per street and the time bank), on the
+    time.monotonic() clock, and is never later than the real cut-off.
+
+    Attributes:
+        at: time.monotonic() value of the deadline (None = no limit)
+        budget: Seconds the bot was given for this action (None = no limit)
+
+    Usage (e.g. in a Monte Carlo loop):
+        while not state.deadline.expired(margin=0.05):
+            for _ in range(200):     # poll every N iterations
+                simulate_once()
+    """
+    __slots__ = ("at", "budget")
+
+    def __init__(self, budget: Optional[float]):
+        self.budget = budget
+        self.at = None if budget is None else time.monotonic() + budget
+
+    def remaining(self) -> float:
+        """Seconds left (float('inf') if there is no limit, never negative)."""
+        if self.at is None:
+            return float("inf")
+        return max(0.0, self.at - time.monotonic())
+
+    def expired(self, margin: float = 0.0) -> bool:
+        """True once fewer than `margin` seconds are left."""
+        return self.at is not None and time.monotonic() >= self.at - margin
+
+    def cancel(self):
+        """Expire the deadline now (used to stop a ponder() call)."""
+        self.at = time.monotonic()
+
+    def __eq__(self, other):
+        if not isinstance(other, Deadline):
+            return NotImplemented
+        return self.at == other.at and self.budget == other.budget
+
+    def __repr__(self):
+        return f"Deadline(budget={self.budget!r}, remaining={self.remaining():.3f})"
+
+
 # =============================================================================
 # LOGGING UTILITY
 # =============================================================================
@@ -88,6 +183,55 @@ class DualLogger:
         self.log.flush()
 
 
+# =============================================================================
+# REPRODUCIBLE RANDOM NUMBER STREAMS
+# =============================================================================
+
+def derive_seed(master_seed: int, *keys) -> int:
+    """
+    Derive an independent 64-bit seed from a master seed and a path of keys.
+    
+    The same (master_seed, keys) always gives the same seed, on any machine and
+    in any process, so e.g. simulation 17 can be re-run on its own.
+    
+    Args:
+        master_seed: The run's master seed
+        *keys: Labels identifying the stream (e.g. "simulation", 17, "bot", 3)
+        
+    Returns:
+        int: Derived seed
+    """
+    text = ":".join(str(k) for k in (master_seed,) + keys)
+    return int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], "big")
+
+
+def make_rng(master_seed: Optional[int], *keys) -> random.Random:
+    """
+    Create a random.Random stream for the given keys (see derive_seed).
+    
+    If master_seed is None, the stream is seeded from system entropy.
+    """
+    if master_seed is None:
+        return random.Random()
+    return random.Random(derive_seed(master_seed, *keys))
+
+
+class SeededDeck(Deck):
+    """
+    Treys Deck that shuffles with a caller-supplied random.Random stream
+    instead of the global random module (or an unseeded private one).
+    """
+    
+    def __init__(self, rng: random.Random):
+        self._rng = rng
+        self.shuffle()
+
+    def shuffle(self):
+        """Reset to a full deck and shuffle it with the deck's stream."""
+        self.cards = Deck.GetFullDeck()
+        self._rng.shuffle(self.cards)
+
+
 # =============================================================================
 # ACTION TYPES AND DATA STRUCTURES
 # =============================================================================
@@ -124,7 +268,34 @@ class Action:
     amount: int = 0
 
 
-@dataclass
+# All 52 cards as Treys ints; bit i of a card mask stands for FULL_DECK[i]
+FULL_DECK = tuple(Deck.GetFullDeck())
+CARD_BITS = {card: 1 << i for i, card in enumerate(FULL_DECK)}
+
+# Card int -> interned string ('Ah', 'Td', ...) for all 52 cards, so the
+# engine never formats the same card twice
+CARD_STRINGS = {card: sys.intern(Card.int_to_str(card)) for card in FULL_DECK}
+
+
+def card_mask(cards: List[int]) -> int:
+    """Bitmask of Treys int cards (bit i = FULL_DECK[i])."""
+    mask = 0
+    for card in cards:
+        mask |= CARD_BITS[card]
+    return mask
+
+
+class LoggedAction(IntEnum):
+    """Action codes used in PlayerState.action_log."""
+    FOLD = 0
+    CHECK = 1
+    CALL = 2
+    RAISE = 3
+
+
+STREET_NAMES = ("Pre-Flop", "Flop", "Turn", "River")  # Indexed by street number (engine.street)
+
+
 class PlayerState:
     """
     Information provided to a bot when it's their turn to act.
@@ -138,18 +309,399 @@ class PlayerState:
         current_bet: The amount the player needs to add to match the current bet
         pot: Total chips in the pot
         min_raise: The minimum valid raise amount (current bet + big blind)
+        hand_ints: Hole cards as Treys ints (ready for Evaluator.evaluate, no Card.new needed)
+        board_ints: Community cards as Treys ints
+        dead_mask: Bitmask of the cards you can see (hand + board); bit i is
+                   FULL_DECK[i], so the unseen cards are
+                   [c for c in FULL_DECK if not CARD_BITS[c] & state.dead_mask]
+        seat: Your seat index at the table
+        button: Seat index of the dealer button
+        num_seats: Number of seats at the table (including busted players)
+        small_blind: Small blind amount
+        big_blind: Big blind amount
+        live_opponents: Opponents still in the hand (not folded, including all-in)
+        all_in_count: Players still in the hand who are all-in
+        stacks: Chip count of every seat, by seat index (array)
+        action_log: This hand's actions so far as a flat array of
+                    (street, seat, action, amount) quadruples - street 0 = pre-flop
+                    ... 3 = river, action is a LoggedAction code, amount is the
+                    call amount or raise-to total (see actions())
+        deadline: Deadline of the current action - poll deadline.expired() or
+                  deadline.remaining() to use the thinking time the engine allows
+        committed: Last action published with commit() during this turn (None = none yet)
     
     Card Notation:
         Rank: 2, 3, 4, 5, 6, 7, 8, 9, T, J, Q, K, A
         Suit: s (spades), h (hearts), d (diamonds), c (clubs)
+    
+    The engine builds one PlayerState per seat per hand and only refreshes
+    the fields that change between turns; stacks and action_log are shared
+    and updated in place. Treat the state as read-only and copy the values
+    you want to keep across turns instead of keeping the object itself.
+    
+    Anytime bots: act() may call state.commit(action) whenever it has a
+    better answer, or be a generator that yields successive actions. If the
+    time runs out, the engine plays the last committed action instead of a
+    random one.
+    """
+    __slots__ = (
+        "name", "hand", "community_cards", "stack", "current_bet", "pot", "min_raise",
+        "hand_ints", "board_ints", "dead_mask",
+        "seat", "button", "num_seats", "small_blind", "big_blind", "live_opponents", "all_in_count",
+        "stacks", "action_log", "deadline", "committed", "_commit_hook",
+    )
+
+    def __init__(
+        self, name: str, hand: List[str], community_cards: List[str], stack: int,
+        current_bet: int, pot: int, min_raise: int,
+        hand_ints: Optional[List[int]] = None, board_ints: Optional[List[int]] = None,
+        dead_mask: int = 0, seat: int = 0, button: int = 0, num_seats: int = 0,
+        small_blind: int = 0, big_blind: int = 0, live_opponents: int = 0, all_in_count: int = 0,
+        stacks: Optional[array] = None, action_log: Optional[array] = None,
+        deadline: Optional[Deadline] = None
+    ):
+        self.name = name
+        self.hand = hand  # ['Ah', 'Td'] = Ace of hearts, Ten of diamonds
+        self.community_cards = community_cards
+        self.stack = stack
+        self.current_bet = current_bet  # The amount needed to match to stay in
+        self.pot = pot
+        self.min_raise = min_raise
+        self.hand_ints = hand_ints if hand_ints is not None else []
+        self.board_ints = board_ints if board_ints is not None else []
+        self.dead_mask = dead_mask
+        self.seat = seat
+        self.button = button
+        self.num_seats = num_seats
+        self.small_blind = small_blind
+        self.big_blind = big_blind
+        self.live_opponents = live_opponents
+        self.all_in_count = all_in_count
+        self.stacks = stacks if stacks is not None else array("q")
+        self.action_log = action_log if action_log is not None else array("q")
+        self.deadline = deadline if deadline is not None else Deadline(None)
+        self.committed = None
+        self._commit_hook = None  # Called with every committed action (sandbox workers forward them)
+
+    def commit(self, action: Action):
+        """Publish the best action found so far; it is played if the time runs out."""
+        self.committed = action
+        if self._commit_hook is not None:
+            self._commit_hook(action)
+
+    @property
+    def position(self) -> int:
+        """Seats after the button (0 = button, 1 = small blind, ...), counting busted seats."""
+        return (self.seat - self.button) % self.num_seats if self.num_seats else 0
+
+    @property
+    def opponent_stacks(self) -> List[int]:
+        """Stacks of the other seats, in seat order starting after yours."""
+        n = len(self.stacks)
+        return [self.stacks[(self.seat + i) % n] for i in range(1, n)]
+
+    def actions(self) -> List[tuple]:
+        """action_log as a list of (street, seat, LoggedAction, amount) tuples."""
+        log = self.action_log
+        return [
+            (log[i], log[i + 1], LoggedAction(log[i + 2]), log[i + 3])
+            for i in range(0, len(log), 4)
+        ]
+
+    def __eq__(self, other):
+        if not isinstance(other, PlayerState):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in self.__slots__ if f[0] != "_")
+
+    def __repr__(self):
+        fields = ", ".join(f"{f}={getattr(self, f)!r}" for f in self.__slots__ if f[0] != "_")
+        return f"PlayerState({fields})"
+
+
+def run_anytime(actions, state: PlayerState) -> Action:
+    """
+    Drive an anytime act() generator: commit every action it yields until it
+    finishes or the state's deadline passes.
+
+    Args:
+        actions: Generator returned by act(); it may also return a final action
+        state: The PlayerState the generator was created for
+
+    Returns:
+        The last committed action
+
+    Raises:
+        RuntimeError: If the generator finished without producing any action
+    """
+    while True:
+        try:
+            action = next(actions)
+        except StopIteration as stop:
+            if stop.value is not None:
+                state.commit(stop.value)
+            break
+        state.commit(action)
+        if state.deadline.expired():
+            break
+    if state.committed is None:
+        raise RuntimeError("act() finished without an action")
+    return state.committed
+
+
+# =============================================================================
+# GAME EVENTS AND EVENT SINKS
+# =============================================================================
+
+class Verbosity(IntEnum):
+    """
+    How much of a game an event sink wants to receive.
+    
+    NONE: Nothing at all (headless runs)
+    SUMMARY: Hand starts, showdowns, winners, stacks and bot faults
+    FULL: Everything, including blinds, streets and every single action
+    """
+    NONE = 0
+    SUMMARY = 1
+    FULL = 2
+
+
+class GameEvent:
+    """
+    Base class for the typed events emitted by the engine.
+    
+    Events only carry raw data (names, chip amounts, treys card ints); the
+    text is built lazily by format(), so it costs nothing unless a sink
+    actually asks for it.
+    
+    Attributes:
+        level: Lowest Verbosity at which the event is emitted
+    """
+    level = Verbosity.FULL
+
+    def format(self) -> Optional[str]:
+        """Return the event as history.txt text (None if it has no text form)."""
+        return None
+
+
+@dataclass
+class HandStartEvent(GameEvent):
+    """
+    A new hand starts. hand_number counts hands played at this table;
+    seats lists (player, stack) for every seat, in seat order.
+    """
+    level = Verbosity.SUMMARY
+    hand_number: int
+    button: str
+    seats: List[tuple]
+
+    def format(self):
+        return f"\n=== New Hand (Button: {self.button}) ==="
+
+
+@dataclass
+class BlindsEvent(GameEvent):
+    """
+    Small and big blinds have been posted. The amounts are what was posted (less
+    than the blind for a short stack all-in); big_blind is the table's big blind
+    (0 if unknown, e.g. replayed from a binary history).
+    """
+    sb_player: str
+    sb_amount: int
+    bb_player: str
+    bb_amount: int
+    big_blind: int = 0
+
+
+@dataclass
+class DealEvent(GameEvent):
+    """Hole cards dealt: (player, cards) per seat, cards empty for busted seats."""
+    hands: List[tuple]
+
+
+@dataclass
+class StreetEvent(GameEvent):
+    """A betting round starts. street is 'Pre-Flop', 'Flop', 'Turn' or 'River'."""
+    street: str
+    board: List[int]
+
+    def format(self):
+        if not self.board:
+            return f"--- {self.street} ---"
+        return f"\n--- {self.street}: {[CARD_STRINGS[c] for c in self.board]} ---"
+
+
+@dataclass
+class ActionEvent(GameEvent):
+    """
+    A player acted. action is 'FOLD', 'CHECK', 'CALL' or 'RAISE';
+    amount is the call amount or the raise-to total; pot is the pot afterwards.
     """
-    name: str
-    hand: List[str]  # ['Ah', 'Td'] = Ace of hearts, Ten of diamonds
-    community_cards: List[str]
-    stack: int
-    current_bet: int  # The amount needed to match to stay in
+    player: str
+    action: str
+    amount: int
     pot: int
-    min_raise: int
+
+    def format(self):
+        if self.action == "FOLD":
+            text = f"  {self.player} Folds."
+        elif self.action == "CHECK":
+            text = f"  {self.player} Checks."
+        elif self.action == "CALL":
+            text = f"  {self.player} Calls {self.amount}."
+        else:
+            text = f"  {self.player} Raises to {self.amount}."
+        return f"{text}\n    [Pot: {self.pot}]"
+
+
+@dataclass
+class NoticeEvent(GameEvent):
+    """A free-form engine message (bot faults, all-in runouts, game over)."""
+    level = Verbosity.SUMMARY
+    message: str
+
+    def format(self):
+        return self.message
+
+
+@dataclass
+class ShowdownEvent(GameEvent):
+    """Hands revealed at showdown: (player, hole cards, treys score) per survivor."""
+    level = Verbosity.SUMMARY
+    hands: List[tuple]
+
+    def format(self):
+        lines = ["\n--- Showdown ---"]
+        for player, hand, score in self.hands:
+            hand_str = [CARD_STRINGS[c] for c in hand]
+            lines.append(f"{player} shows {hand_str} ({hand_description(score)})")
+        return "\n".join(lines)
+
+
+@dataclass
+class WinEvent(GameEvent):
+    """A player wins chips. method is 'Fold' or 'Showdown'."""
+    level = Verbosity.SUMMARY
+    player: str
+    amount: int
+    method: str
+
+    def format(self):
+        if self.method == "Fold":
+            return f"Winner by fold: {self.player} wins {self.amount}"
+        return f"*** {self.player} WINS {self.amount} ***"
+
+
+@dataclass
+class StacksEvent(GameEvent):
+    """Chip counts at the end of a hand: (player, stack, disqualified) per seat."""
+    level = Verbosity.SUMMARY
+    stacks: List[tuple]
+
+    def format(self):
+        lines = ["\n--- Player Stacks ---"]
+        for player, stack, disqualified in self.stacks:
+            status = ""
+            if disqualified:
+                status = " [DISQUALIFIED]"
+            elif stack == 0:
+                status = " [BUSTED]"
+            lines.append(f"  {player}: {stack}{status}")
+        lines.append("")
+        return "\n".join(lines)
+
+
+_description_evaluator = None
+
+
+def hand_description(score: int) -> str:
+    """
+    Human-readable hand class for a treys score (e.g. 'Two Pair').
+    
+    The Evaluator (and its lookup tables) is only built on first use.
+    """
+    global _description_evaluator
+    if _description_evaluator is None:
+        _description_evaluator = Evaluator()
+    return _description_evaluator.class_to_string(_description_evaluator.get_rank_class(score))
+
+
+class EventSink:
+    """
+    Base class for consumers of engine events.
+    
+    Subclasses set `verbosity` and implement emit(). The engine checks the
+    verbosity before it even builds an event, so a sink only pays for the
+    events it asked for.
+    
+    Example:
+        class ShowdownCounter(EventSink):
+            verbosity = Verbosity.SUMMARY
+            def __init__(self):
+                self.count = 0
+            def emit(self, event):
+                if isinstance(event, ShowdownEvent):
+                    self.count += 1
+    """
+    verbosity = Verbosity.FULL
+
+    def emit(self, event: GameEvent):
+        """Consume one event."""
+        raise NotImplementedError("Implement emit method")
+
+    def close(self):
+        """Release any resources held by the sink."""
+        pass
+
+
+class NullSink(EventSink):
+    """Sink for headless runs: asks for no events, so none are ever built."""
+    verbosity = Verbosity.NONE
+
+    def emit(self, event: GameEvent):
+        pass
+
+
+class PrintSink(EventSink):
+    """
+    Sink that formats events as the classic text log and prints them.
+    
+    Args:
+        verbosity: Verbosity level (default: FULL)
+        stream: Stream to write to (default: sys.stdout at the time of each event)
+    """
+    
+    def __init__(self, verbosity: Verbosity = Verbosity.FULL, stream=None):
+        self.verbosity = verbosity
+        self.stream = stream
+
+    def emit(self, event: GameEvent):
+        if event.level > self.verbosity:
+            return
+        text = event.format()
+        if text is not None:
+            print(text, file=self.stream or sys.stdout)
+
+
+class MultiSink(EventSink):
+    """
+    Sink that forwards events to several sinks, each at its own verbosity.
+    
+    Args:
+        sinks: The sinks to forward to
+    """
+    
+    def __init__(self, sinks: List[EventSink]):
+        self.sinks = list(sinks)
+        self.verbosity = max((s.verbosity for s in self.sinks), default=Verbosity.NONE)
+
+    def emit(self, event: GameEvent):
+        for sink in self.sinks:
+            if event.level <= sink.verbosity:
+                sink.emit(event)
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
 
 
 # =============================================================================
@@ -199,6 +751,104 @@ class BaseAgent:
         """
         raise NotImplementedError("Implement act method")
 
+    def ponder(self, state: PlayerState):
+        """
+        Optional: think while the other players act.
+
+        When the table allows pondering (TimeControl.ponder), the engine calls
+        this after every change of the hand (new street, another player's
+        action) in the bot's worker process. Only isolated (sandboxed) bots
+        ponder: an in-process thread would share the global random streams
+        and the memory limit with the bot that is acting. state is a snapshot of what the bot would see if it
+        had to act now; state.deadline expires when the pondering budget is
+        used up, when the hand changes again or when the bot's turn arrives,
+        so poll it like in act(). Keep what you compute on self for act().
+
+        Exceptions raised here are ignored.
+
+        Args:
+            state: PlayerState snapshot with a pondering deadline
+        """
+        pass
+
+
+# =============================================================================
+# SEAT STATE
+# =============================================================================
+
+class Seat:
+    """
+    State of one seat at the table.
+
+    A compact __slots__ object: the engine reads and writes attributes
+    (p.stack, p.folded, ...). Dict-style access (p["stack"], p.get(...)) keeps
+    working for code written against the old per-player dicts.
+
+    Attributes:
+        agent: The BaseAgent playing this seat
+        stack: Chips behind
+        hand: Hole cards (Treys Int objects, internal card representation)
+        folded: Folded this hand (busted seats are folded at hand start)
+        all_in: Has no chips left to bet this hand
+        current_round_bet: How much was put in THIS betting round
+        disqualified: Removed for breaking the bot constraints (always folds)
+        rng_state: Seat's global-random state (None = unseeded)
+        state: PlayerState handed to the bot, rebuilt once per hand (None before dealing)
+        hand_mask: card_mask() of the hole cards
+        time_bank: Seconds left on the seat's chess clock (None = no bank)
+        street_time: Seconds the bot has thought on the current street
+        ponders: The bot is isolated and overrides BaseAgent.ponder()
+        ponder_deadline: Deadline of the bot's running ponder() call (None = not pondering)
+    """
+    __slots__ = (
+        "agent", "stack", "hand", "folded", "all_in", "current_round_bet", "disqualified", "rng_state", "state",
+        "hand_mask", "time_bank", "street_time", "ponders", "ponder_deadline",
+    )
+
+    def __init__(self, agent: BaseAgent, stack: int, rng_state=None):
+        self.agent = agent
+        self.stack = stack
+        self.hand = []
+        self.folded = False
+        self.all_in = False
+        self.current_round_bet = 0
+        self.disqualified = False
+        self.rng_state = rng_state
+        self.state = None
+        self.hand_mask = 0
+        self.time_bank = None
+        self.street_time = 0.0
+        self.ponders = getattr(agent, "isolated", False) and type(agent).ponder is not BaseAgent.ponder
+        self.ponder_deadline = None
+
+    @property
+    def name(self) -> str:
+        """Name of the seated bot."""
+        return self.agent.name
+
+    # Dict-style access (compatibility with the former player dicts)
+    def __getitem__(self, key: str):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__slots__
+
+    def get(self, key: str, default=None):
+        return getattr(self, key) if key in self.__slots__ else default
+
+    def keys(self):
+        return list(self.__slots__)
+
+    def __repr__(self):
+        return f"Seat({self.agent.name!r}, stack={self.stack}, folded={self.folded}, all_in={self.all_in})"
+
 
 # =============================================================================
 # MAIN GAME ENGINE
@@ -216,14 +866,29 @@ class TexasHoldemEngine:
     - Bot safety (time/memory limits, crash handling)
     
     Attributes:
-        players: List of player dictionaries containing agent, stack, and state
+        players: List of Seat objects (agent, stack and hand state)
         sb_amt: Small blind amount
         bb_amt: Big blind amount
         start_stack: Initial chip count for each player
         evaluator: Treys Evaluator for hand ranking
         deck: Current deck of cards
+        seed: Seed of this table (None = not reproducible)
+        rng: Random stream used for shuffling
+        fallback_rng: Random stream used for the random action on timeout
+        sink: EventSink receiving game events (None = headless)
+        verbosity: Verbosity of the sink (events above it are never built)
+        time_control: TimeControl applied to every bot
+        hand_number: Number of hands started at this table
+        num_surviving: Players still in the hand (kept up to date by _fold)
+        num_active: Players who can still act (kept up to date by _fold/_set_all_in)
         button_idx: Index of the dealer button
         community_cards: Shared cards on the table
+        board_strings: community_cards as strings, shared by all PlayerStates of a street
+        board_ints: Copy of community_cards shared by all PlayerStates of a street
+        board_mask: card_mask() of community_cards
+        street: Current street (0 = pre-flop ... 3 = river)
+        seat_stacks: Stack per seat, kept up to date during the hand (PlayerState.stacks)
+        action_log: Flat log of this hand's actions (PlayerState.action_log)
         pot: Total chips in the pot
         active_bet: Current highest bet in the betting round
         last_hand_result: Result of the most recent hand (for debugging)
@@ -236,7 +901,9 @@ class TexasHoldemEngine:
     """
     
     def __init__(
-        self, small_blind: int = 10, big_blind: int = 20, start_stack: int = 1000
+        self, small_blind: int = 10, big_blind: int = 20, start_stack: int = 1000,
+        seed: Optional[int] = None, sink: Optional[EventSink] = None,
+        time_control: Optional[TimeControl] = None, telemetry=None, tracer=None, profiler=None
     ):
         """
         Initialize the poker engine.
@@ -245,12 +912,40 @@ class TexasHoldemEngine:
             small_blind: Amount of the small blind (default: 10)
             big_blind: Amount of the big blind (default: 20)
             start_stack: Starting chip count for each player (default: 1000)
+            seed: Seed for the table's random streams (deck, timeout fallback and
+                  one stream per bot seat). None keeps the table unseeded.
+            sink: EventSink for game events (default: PrintSink at FULL verbosity,
+                  i.e. the classic text log on stdout; use NullSink() for headless runs)
+            time_control: Thinking-time rules (default: TimeControl(), 3 s per action)
+            telemetry: Collector whose record() is called after every act() call
+                       (e.g. poker_toolkit.telemetry.BotTelemetry; default: None = off)
+            tracer: Timeline tracer recording hands, streets, actions and showdowns
+                    (e.g. poker_toolkit.tracing.Tracer; default: None = off)
+            profiler: Per-bot profiler asked before every in-process act() call
+                      (e.g. poker_toolkit.profiling.BotProfiler; default: None = off)
         """
         self.players = []
         self.sb_amt = small_blind
         self.bb_amt = big_blind
         self.start_stack = start_stack
 
+        # Independent random streams, all derived from the table seed
+        self.seed = seed
+        self.rng = make_rng(seed, "deck")
+        self.fallback_rng = make_rng(seed, "fallback")
+
+        # Event logging
+        if sink is None:
+            sink = PrintSink()
+        self.sink = sink
+        self.verbosity = int(sink.verbosity)
+
+        # Bot time limits
+        self.time_control = time_control if time_control is not None else TimeControl()
+        self.telemetry = telemetry
+        self.tracer = tracer
+        self.profiler = profiler
+
         # Treys library components for hand evaluation
         self.evaluator = Evaluator()
         self.deck = None
@@ -258,27 +953,40 @@ class TexasHoldemEngine:
         # Game state
         self.button_idx = 0           # Dealer button position
         self.community_cards = []     # Flop/Turn/River cards
+        self.board_strings = []       # community_cards as strings (rebuilt once per street)
+        self.board_ints = []          # Copy of community_cards handed to bots (rebuilt once per street)
+        self.board_mask = 0           # card_mask() of community_cards
+        self.street = 0               # Current street (0 = pre-flop ... 3 = river)
+        self.seat_stacks = array("q")  # Stack per seat, shared by this hand's PlayerStates
+        self.action_log = array("q")   # This hand's (street, seat, action, amount) quadruples
         self.pot = 0                  # Total pot size
         self.active_bet = 0           # Current highest bet on the table
         self.last_hand_result = None  # For debugging/analysis
+        self.hand_number = 0          # Hands started at this table
+        self.num_surviving = 0        # Players not folded this hand
+        self.num_active = 0           # Players not folded and not all-in (can still act)
 
     def add_agent(self, agent: BaseAgent):
         """
         Add a bot to the game.
         
+        If the table is seeded, the seat gets its own random stream: while the
+        bot acts, the global `random` module is switched to that stream, so bots
+        that use `random.random()` etc. become reproducible too.
+        
         Args:
             agent: BaseAgent instance to add to the game
         """
-        self.players.append(
-            {
-                "agent": agent,
-                "stack": self.start_stack,
-                "hand": [],  # Treys Int objects (internal card representation)
-                "folded": False,
-                "all_in": False,
-                "current_round_bet": 0,  # How much put in THIS betting round
-            }
-        )
+        rng_state = None
+        if self.seed is not None:
+            rng_state = make_rng(self.seed, "bot", len(self.players)).getstate()
+            if getattr(agent, "isolated", False):
+                # Isolated agents run in their own process: the stream lives there
+                agent.set_random_state(rng_state)
+                rng_state = None
+        seat = Seat(agent, self.start_stack, rng_state)
+        seat.time_bank = self.time_control.bank
+        self.players.append(seat)
 
     def _reset_round_bets(self):
         """
@@ -287,27 +995,297 @@ class TexasHoldemEngine:
         """
         self.active_bet = 0
         for p in self.players:
-            p["current_round_bet"] = 0
+            p.current_round_bet = 0
+            p.street_time = 0.0
 
     def _get_active_players(self):
         """
         Get players who can still act (not folded and not all-in).
         
         Returns:
-            List of player dictionaries for active players
+            List of Seat objects for active players
         """
-        return [p for p in self.players if not p["folded"] and not p["all_in"]]
+        return [p for p in self.players if not p.folded and not p.all_in]
 
     def _get_surviving_players(self):
         """
         Get players still in the hand (not folded, but may be all-in).
         
         Returns:
-            List of player dictionaries for non-folded players
+            List of Seat objects for non-folded players
+        """
+        return [p for p in self.players if not p.folded]
+
+    def _fold(self, p: Seat):
+        """Fold a player and update the surviving/active counters."""
+        if p.folded:
+            return
+        p.folded = True
+        self.num_surviving -= 1
+        if not p.all_in:
+            self.num_active -= 1
+
+    def _set_all_in(self, p: Seat):
+        """Mark a player all-in and update the active counter."""
+        if p.all_in:
+            return
+        p.all_in = True
+        if not p.folded:
+            self.num_active -= 1
+
+    def _log_action(self, seat_idx: int, code: LoggedAction, amount: int):
+        """Append an action to the hand's action log and refresh the seat's stack entry."""
+        self.action_log.extend((self.street, seat_idx, code, amount))
+        self.seat_stacks[seat_idx] = self.players[seat_idx].stack
+
+    def _update_board(self):
+        """Rebuild the per-street board views shared by all PlayerStates."""
+        self.street = len(self.community_cards) - 2  # 3 cards = flop (1) ... 5 = river (3)
+        self.board_strings = [CARD_STRINGS[c] for c in self.community_cards]
+        self.board_ints = list(self.community_cards)
+        self.board_mask = card_mask(self.community_cards)
+
+    def _refresh_state(self, p: Seat, state: PlayerState):
+        """Bring a seat's PlayerState up to date (name and hole cards are set once per hand)."""
+        state.community_cards = self.board_strings
+        state.board_ints = self.board_ints
+        state.dead_mask = p.hand_mask | self.board_mask
+        state.live_opponents = self.num_surviving - 1
+        state.all_in_count = self.num_surviving - self.num_active
+        state.stack = p.stack
+        state.current_bet = self.active_bet - p.current_round_bet
+        state.pot = self.pot
+        state.min_raise = self.active_bet + self.bb_amt  # Minimum raise is current bet + big blind (simplified rule)
+
+    # =========================================================================
+    # PONDERING
+    # =========================================================================
+
+    def _start_pondering(self):
+        """
+        (Re)start ponder() for every pondering (isolated) bot still able to act,
+        with a snapshot of the hand as it is now. Bots that folded or are all-in stop.
+        """
+        if not self.time_control.ponder:
+            return
+        for p in self.players:
+            if not p.ponders:
+                continue
+            if p.folded or p.all_in or p.disqualified:
+                self._stop_pondering(p)
+            else:
+                self._ponder(p)
+
+    def _ponder(self, p: Seat):
+        """Cancel the seat's current ponder() call and start a new one."""
+        self._stop_pondering(p)
+        state = copy(p.state)  # Snapshot: the bot's own state object is only refreshed on its turn
+        self._refresh_state(p, state)
+        state.stacks = array("q", state.stacks)  # The engine keeps updating the shared arrays
+        state.action_log = array("q", state.action_log)
+        state.deadline = Deadline(self.time_control.ponder)
+        state.committed = None
+        p.ponder_deadline = state.deadline
+        p.agent.ponder(state)  # Forwarded to the bot's worker process; returns at once
+
+    def _stop_pondering(self, p: Seat):
+        """Cancel the seat's ponder() call (cooperative: its deadline expires)."""
+        if p.ponder_deadline is not None:
+            p.ponder_deadline.cancel()
+            p.ponder_deadline = None
+
+    def stop_pondering(self):
+        """Cancel all running ponder() calls (e.g. when the table is finished)."""
+        for p in self.players:
+            self._stop_pondering(p)
+
+    def players_with_chips(self):
+        """
+        Get players that are not busted.
+
+        Returns:
+            List of Seat objects with a stack above zero
         """
-        return [p for p in self.players if not p["folded"]]
+        return [p for p in self.players if p.stack > 0]
+
+    def stacks(self):
+        """
+        Get a summary of all stacks.
+
+        Returns:
+            Dict {bot name: chip count} in seat order
+        """
+        return {p.agent.name: p.stack for p in self.players}
+
+    def _time_budget(self, p: Seat) -> Optional[float]:
+        """
+        Seconds the bot in seat p may think about its next action.
+
+        Returns:
+            The smallest of the per-action limit, what is left of the per-street
+            allowance and what is left on the time bank (None = unlimited)
+        """
+        tc = self.time_control
+        budget = tc.per_action
+        if tc.per_street is not None:
+            left = tc.per_street - p.street_time
+            budget = left if budget is None else min(budget, left)
+        if p.time_bank is not None:
+            budget = p.time_bank if budget is None else min(budget, p.time_bank)
+        return budget
+
+    def _charge_time(self, p: Seat, elapsed: float):
+        """Charge thinking time to the seat's street allowance and time bank."""
+        p.street_time += elapsed
+        if p.time_bank is not None:
+            p.time_bank = max(0.0, p.time_bank - elapsed) + self.time_control.increment
+
+    def _get_action(self, p: Seat, state: PlayerState) -> Action:
+        """
+        Ask a bot for its action, within the time and memory limits.
+
+        In-process bots run under an ITIMER_REAL timer (SIGALRM) set to their
+        time budget and an RLIMIT_AS cap, both set up around every call.
+        Isolated agents (agent.isolated = True, e.g.
+        poker_toolkit.sandbox.SandboxedAgent) enforce the limits in their own
+        worker process: they get the budget through act_timed(), and no
+        signals or rlimits touch the engine process. If they have a start()
+        method, it is called before the clock starts, so (re)starting a
+        worker is not charged to the bot.
+
+        Args:
+            p: Seat of the acting bot
+            state: PlayerState to hand to the bot
+
+        Returns:
+            The bot's Action (FOLD if it crashed or is disqualified, a random
+            action if it timed out)
+        """
+        if p.disqualified:
+            # Disqualified bots automatically fold
+            return Action(ActionType.FOLD)
+
+        self._stop_pondering(p)  # The bot's turn: its background thinking ends
+        isolated = getattr(p.agent, "isolated", False)
+        if isolated and hasattr(p.agent, "start"):
+            try:
+                p.agent.start()  # Worker start-up (e.g. after a timeout kill) is not thinking time
+            except Exception as e:
+                if self.verbosity >= Verbosity.SUMMARY:
+                    self.sink.emit(NoticeEvent(f"  Bot {p.agent.name} crashed: {e}. Folding."))
+                return Action(ActionType.FOLD)
+        budget = self._time_budget(p)
+        state.deadline = Deadline(budget)  # Taken before the timer starts: never later than the cut-off
+        state.committed = None
+        if not isolated:
+            # Safety limits for bot execution
+            LIMIT_MEMORY = 1024 * 1024 * 1024  # 1GB memory limit
+
+            # Save current resource limits to restore later
+            old_soft, old_hard = resource.getrlimit(resource.RLIMIT_AS)
+            
+            # Calculate safe memory limit (don't exceed hard limit)
+            new_soft = LIMIT_MEMORY
+            if old_hard != resource.RLIM_INFINITY and LIMIT_MEMORY > old_hard:
+                new_soft = old_hard
+
+            # Switch the global random module to the seat's stream
+            if p.rng_state is not None:
+                saved_rng_state = random.getstate()
+                random.setstate(p.rng_state)
+
+            # Set up timeout handler
+            old_handler = signal.signal(signal.SIGALRM, timeout_handler)
+            if budget is not None and budget > 0:
+                signal.setitimer(signal.ITIMER_REAL, budget)  # Start the countdown
+        
+        timed_out = False
+        if self.telemetry is not None:
+            cpu_started = time.thread_time()
+        if self.tracer is not None:
+            trace_start = self.tracer.now()
+        started = time.perf_counter()
+        try:
+            if budget is not None and budget <= 0:
+                # Street allowance or time bank already used up
+                raise TimeoutException("No time left")
+            if isolated:
+                return p.agent.act_timed(state, budget)
+            profile = self.profiler.sample(p.agent.name) if self.profiler is not None else None
+            # Apply memory limit and execute bot's decision
+            resource.setrlimit(resource.RLIMIT_AS, (new_soft, old_hard))
+            if profile is not None:
+                profile.enable()  # Only the bot's own code: the engine's handlers stay out of its profile
+            try:
+                action = p.agent.act(state)
+                if inspect.isgenerator(action):
+                    # Anytime bot: keep its best action so far
+                    action = run_anytime(action, state)
+            finally:
+                if profile is not None:
+                    profile.disable()
+            return action
+            
+        except MemoryError:
+            # Bot exceeded memory limit - disqualify immediately
+            if self.verbosity >= Verbosity.SUMMARY:
+                self.sink.emit(NoticeEvent(f"  Bot {p.agent.name} exceeded memory limit! Disqualifying."))
+            p.disqualified = True
+            p.stack = 0  # Disqualified bots lose all chips
+            return Action(ActionType.FOLD)
+            
+        except TimeoutException:
+            timed_out = True
+            if state.committed is not None:
+                # Anytime bot ran out of time - play its last committed action
+                return state.committed
+            # Bot exceeded time limit - take random action
+            if self.verbosity >= Verbosity.SUMMARY:
+                self.sink.emit(NoticeEvent(f"  Bot {p.agent.name} exceeded time limit! Random action."))
+            opts = [ActionType.FOLD, ActionType.CHECK_CALL, ActionType.RAISE]
+            rt = self.fallback_rng.choice(opts)
+            return Action(rt, self.fallback_rng.randint(0, p.stack))
+            
+        except Exception as e:
+            # Bot crashed - fold and continue
+            if self.verbosity >= Verbosity.SUMMARY:
+                self.sink.emit(NoticeEvent(f"  Bot {p.agent.name} crashed: {e}. Folding."))
+            return Action(ActionType.FOLD)
+            
+        finally:
+            if not isolated:
+                # Always restore original limits and handler
+                signal.setitimer(signal.ITIMER_REAL, 0)  # Cancel the timer
+                signal.signal(signal.SIGALRM, old_handler)
+                resource.setrlimit(resource.RLIMIT_AS, (old_soft, old_hard))
+                if p.rng_state is not None:
+                    p.rng_state = random.getstate()
+                    random.setstate(saved_rng_state)
+            elapsed = time.perf_counter() - started
+            self._charge_time(p, elapsed)
+            if self.telemetry is not None:
+                if isolated:
+                    # Measured in the worker process (None after a timeout)
+                    cpu, peak_memory = getattr(p.agent, "last_usage", (None, None))
+                else:
+                    cpu, peak_memory = time.thread_time() - cpu_started, None
+                self.telemetry.record(p.agent.name, self.street, elapsed, cpu, peak_memory, budget, timed_out)
+            if self.tracer is not None:
+                self.tracer.complete(p.agent.name, "act", trace_start, {
+                    "seat": state.seat, "street": self.street, "budget": budget, "timed_out": timed_out,
+                })
 
     def _betting_round(self, starting_index):
+        """Run a betting round (see _play_betting_round), traced as a street span if tracing."""
+        if self.tracer is None:
+            return self._play_betting_round(starting_index)
+        start = self.tracer.now()
+        try:
+            return self._play_betting_round(starting_index)
+        finally:
+            self.tracer.complete(STREET_NAMES[self.street], "street", start, {"pot": self.pot})
+
+    def _play_betting_round(self, starting_index):
         """
         Execute a complete betting round.
         
@@ -319,19 +1297,20 @@ class TexasHoldemEngine:
         Args:
             starting_index: Index of the first player to act
         """
-        active_players = self._get_active_players()
-        
         # Check if betting is even needed
-        if len(active_players) <= 1:
-            surviving = self._get_surviving_players()
-            all_in_count = sum(1 for p in surviving if p["all_in"])
-            if all_in_count > 0 and len(active_players) == 0:
-                print("  (All remaining players are all-in)")
+        # (num_active/num_surviving are maintained incrementally by _fold and _set_all_in)
+        if self.num_active <= 1:
+            all_in_count = self.num_surviving - self.num_active
+            if all_in_count > 0 and self.num_active == 0 and self.verbosity >= Verbosity.SUMMARY:
+                self.sink.emit(NoticeEvent("  (All remaining players are all-in)"))
             return
 
+        # New street: waiting bots start thinking about the new board
+        self._start_pondering()
+
         # Track how many players still need to act
         # When someone raises, this counter is reset to give others a chance to respond
-        players_to_act = len(active_players)
+        players_to_act = self.num_active
         
         # Current position in the player rotation
         curr_idx = starting_index % len(self.players)
@@ -343,86 +1322,31 @@ class TexasHoldemEngine:
             p = self.players[curr_idx]
 
             # Skip players who can't act (folded or all-in)
-            if p["folded"] or p["all_in"]:
+            if p.folded or p.all_in:
                 curr_idx = (curr_idx + 1) % len(self.players)
                 continue
 
             # Check if betting is complete
             # (player has matched the bet and everyone has had a chance to act)
-            if p["current_round_bet"] == self.active_bet and players_to_act <= 0:
+            if p.current_round_bet == self.active_bet and players_to_act <= 0:
                 betting_open = False
                 break
 
             # Calculate how much this player needs to call
-            to_call = self.active_bet - p["current_round_bet"]
+            to_call = self.active_bet - p.current_round_bet
             
             # Minimum raise is current bet + big blind (simplified rule)
             min_raise = self.active_bet + self.bb_amt
 
-            # Prepare the state information for the bot
-            state = PlayerState(
-                name=p["agent"].name,
-                hand=[Card.int_to_str(c) for c in p["hand"]],  # Convert to readable format
-                community_cards=[Card.int_to_str(c) for c in self.community_cards],
-                stack=p["stack"],
-                current_bet=to_call,
-                pot=self.pot,
-                min_raise=min_raise,
-            )
+            # Refresh the seat's state object (to_call and min_raise as above)
+            state = p.state
+            self._refresh_state(p, state)
 
             # =================================================================
             # GET ACTION FROM BOT (with safety constraints)
             # =================================================================
             
-            if p.get("disqualified", False):
-                # Disqualified bots automatically fold
-                action = Action(ActionType.FOLD)
-            else:
-                # Safety limits for bot execution
-                LIMIT_MEMORY = 1024 * 1024 * 1024  # 1GB memory limit
-                LIMIT_TIME = 3  # 3 second time limit
-
-                # Save current resource limits to restore later
-                old_soft, old_hard = resource.getrlimit(resource.RLIMIT_AS)
-                
-                # Calculate safe memory limit (don't exceed hard limit)
-                new_soft = LIMIT_MEMORY
-                if old_hard != resource.RLIM_INFINITY and LIMIT_MEMORY > old_hard:
-                    new_soft = old_hard
-
-                # Set up timeout handler
-                old_handler = signal.signal(signal.SIGALRM, timeout_handler)
-                signal.alarm(LIMIT_TIME)  # Start the countdown
-                
-                try:
-                    # Apply memory limit and execute bot's decision
-                    resource.setrlimit(resource.RLIMIT_AS, (new_soft, old_hard))
-                    action = p["agent"].act(state)
-                    
-                except MemoryError:
-                    # Bot exceeded memory limit - disqualify immediately
-                    print(f"  Bot {p['agent'].name} exceeded memory limit! Disqualifying.")
-                    p["disqualified"] = True
-                    p["stack"] = 0  # Disqualified bots lose all chips
-                    action = Action(ActionType.FOLD)
-                    
-                except TimeoutException:
-                    # Bot exceeded time limit - take random action
-                    print(f"  Bot {p['agent'].name} exceeded time limit! Random action.")
-                    opts = [ActionType.FOLD, ActionType.CHECK_CALL, ActionType.RAISE]
-                    rt = random.choice(opts)
-                    action = Action(rt, random.randint(0, p["stack"]))
-                    
-                except Exception as e:
-                    # Bot crashed - fold and continue
-                    print(f"  Bot {p['agent'].name} crashed: {e}. Folding.")
-                    action = Action(ActionType.FOLD)
-                    
-                finally:
-                    # Always restore original limits and handler
-                    signal.alarm(0)  # Cancel the alarm
-                    signal.signal(signal.SIGALRM, old_handler)
-                    resource.setrlimit(resource.RLIMIT_AS, (old_soft, old_hard))
+            action = self._get_action(p, state)
 
             # =================================================================
             # PROCESS THE ACTION
@@ -437,72 +1361,73 @@ class TexasHoldemEngine:
 
             # --- FOLD ---
             if atype == "FOLD" or atype == ActionType.FOLD.name:
-                p["folded"] = True
-                print(f"  {p['agent'].name} Folds.")
-                print(f"    [Pot: {self.pot}]")
+                self._fold(p)
+                self._log_action(curr_idx, LoggedAction.FOLD, 0)
+                if self.verbosity >= Verbosity.FULL:
+                    self.sink.emit(ActionEvent(p.agent.name, "FOLD", 0, self.pot))
                 
                 # Check if only one player remains (instant win)
-                survivors = self._get_surviving_players()
-                if len(survivors) == 1:
+                if self.num_surviving == 1:
                     return  # Hand ends, winner determined in play_hand()
 
             # --- CHECK/CALL ---
             elif atype == "CHECK_CALL" or atype == ActionType.CHECK_CALL.name:
                 # Call amount is capped at player's stack (all-in call)
-                amount = min(to_call, p["stack"])
-                p["stack"] -= amount
-                p["current_round_bet"] += amount
+                amount = min(to_call, p.stack)
+                p.stack -= amount
+                p.current_round_bet += amount
                 self.pot += amount
                 
                 # Check if player went all-in
-                if p["stack"] == 0:
-                    p["all_in"] = True
+                if p.stack == 0:
+                    self._set_all_in(p)
                 
-                # Display appropriate message
-                if amount == 0:
-                    print(f"  {p['agent'].name} Checks.")
-                else:
-                    print(f"  {p['agent'].name} Calls {amount}.")
-                print(f"    [Pot: {self.pot}]")
+                self._log_action(curr_idx, LoggedAction.CALL if amount else LoggedAction.CHECK, amount)
+                if self.verbosity >= Verbosity.FULL:
+                    self.sink.emit(ActionEvent(p.agent.name, "CALL" if amount else "CHECK", amount, self.pot))
 
             # --- RAISE ---
             elif atype == "RAISE" or atype == ActionType.RAISE.name:
                 actual_raise = action.amount
                 
                 # Validate raise amount (must meet minimum unless going all-in)
-                if actual_raise < min_raise and actual_raise < p["stack"]:
+                if actual_raise < min_raise and actual_raise < p.stack:
                     actual_raise = min_raise  # Force minimum raise if invalid
 
                 # Calculate the cost (difference from what already bet)
-                cost = actual_raise - p["current_round_bet"]
+                cost = actual_raise - p.current_round_bet
 
                 # Cap at player's stack (all-in raise)
-                if cost > p["stack"]:
-                    cost = p["stack"]
-                    actual_raise = p["current_round_bet"] + cost
-                    p["all_in"] = True
+                if cost > p.stack:
+                    cost = p.stack
+                    actual_raise = p.current_round_bet + cost
+                    self._set_all_in(p)
 
                 # Update player state
-                p["stack"] -= cost
+                p.stack -= cost
                 self.pot += cost
-                p["current_round_bet"] += cost
+                p.current_round_bet += cost
 
                 # Update the betting high-water mark
-                if p["current_round_bet"] > self.active_bet:
-                    diff = p["current_round_bet"] - self.active_bet
-                    self.active_bet = p["current_round_bet"]
+                if p.current_round_bet > self.active_bet:
+                    diff = p.current_round_bet - self.active_bet
+                    self.active_bet = p.current_round_bet
                     # Re-open action for all other players
-                    players_to_act = len(self._get_active_players()) - 1
+                    players_to_act = self.num_active - 1
 
-                print(f"  {p['agent'].name} Raises to {actual_raise}.")
-                print(f"    [Pot: {self.pot}]")
+                self._log_action(curr_idx, LoggedAction.RAISE, actual_raise)
+                if self.verbosity >= Verbosity.FULL:
+                    self.sink.emit(ActionEvent(p.agent.name, "RAISE", actual_raise, self.pot))
                 
+            # The hand changed: waiting bots start thinking about it
+            self._start_pondering()
+
             # Move to next player
             players_to_act -= 1
             curr_idx = (curr_idx + 1) % len(self.players)
 
             # Safety check: if no active players remain, end betting
-            if len(self._get_active_players()) < 1:
+            if self.num_active < 1:
                 betting_open = False
 
     def play_hand(self):
@@ -521,28 +1446,60 @@ class TexasHoldemEngine:
         Returns:
             bool: True if the hand was played successfully, False if not enough players
         """
-        print(
-            f"\n=== New Hand (Button: {self.players[self.button_idx]['agent'].name}) ==="
-        )
+        if self.tracer is None:
+            return self._play_hand()
+        start = self.tracer.now()
+        try:
+            return self._play_hand()
+        finally:
+            self.tracer.complete("Hand", "hand", start, {"hand": self.hand_number, "pot": self.pot})
+
+    def _play_hand(self):
+        """play_hand() itself (the public method adds the tracing span)."""
+        self.hand_number += 1
+        if self.verbosity >= Verbosity.SUMMARY:
+            self.sink.emit(HandStartEvent(
+                self.hand_number,
+                self.players[self.button_idx].agent.name,
+                [(p.agent.name, p.stack) for p in self.players],
+            ))
 
         # =================================================================
         # STEP 1: SETUP
         # =================================================================
-        self.deck = Deck()  # Fresh shuffled deck
+        if self.tracer is None:
+            self.deck = SeededDeck(self.rng)  # Fresh deck shuffled with the table's stream
+        else:
+            start = self.tracer.now()
+            self.deck = SeededDeck(self.rng)
+            self.tracer.complete("Deck", "deal", start)
         self.community_cards = []
+        self.board_strings = []
+        self.board_ints = []
+        self.board_mask = 0
+        self.street = 0
+        self.action_log = array("q")  # New arrays per hand: old PlayerStates keep their own
         self.pot = 0
+        self.stop_pondering()  # Last hand's snapshots are stale
 
         # Reset each player's hand state (preserve stack from previous hands)
         for p in self.players:
-            p["folded"] = p["stack"] == 0  # Auto-fold if busted (no chips)
-            p["all_in"] = False
-            p["hand"] = []
-            p["current_round_bet"] = 0
+            p.folded = p.stack == 0  # Auto-fold if busted (no chips)
+            p.all_in = False
+            p.hand = []
+            p.current_round_bet = 0
+            p.street_time = 0.0
+            if self.time_control.bank_per == "hand":
+                p.time_bank = self.time_control.bank
+        self.num_surviving = sum(1 for p in self.players if not p.folded)
+        self.num_active = self.num_surviving
+        self.seat_stacks = array("q", (p.stack for p in self.players))
 
         # Check if we have enough players to continue
-        active_count = len([p for p in self.players if p["stack"] > 0])
+        active_count = len(self.players_with_chips())
         if active_count < 2:
-            print("Game Over: Not enough players.")
+            if self.verbosity >= Verbosity.SUMMARY:
+                self.sink.emit(NoticeEvent("Game Over: Not enough players."))
             return False
 
         # =================================================================
@@ -553,7 +1510,7 @@ class TexasHoldemEngine:
             """Find the next player with chips (skips busted players)."""
             idx = start_idx % len(self.players)
             for _ in range(len(self.players)):
-                if self.players[idx]["stack"] > 0:
+                if self.players[idx].stack > 0:
                     return idx
                 idx = (idx + 1) % len(self.players)
             return start_idx  # Fallback (shouldn't happen)
@@ -564,36 +1521,64 @@ class TexasHoldemEngine:
 
         # Post Small Blind
         sb_p = self.players[sb_idx]
-        sb_val = min(self.sb_amt, sb_p["stack"])  # Can only post what you have
-        sb_p["stack"] -= sb_val
-        sb_p["current_round_bet"] = sb_val
+        sb_val = min(self.sb_amt, sb_p.stack)  # Can only post what you have
+        sb_p.stack -= sb_val
+        sb_p.current_round_bet = sb_val
         self.pot += sb_val
-        if sb_p["stack"] == 0:
-            sb_p["all_in"] = True
+        if sb_p.stack == 0:
+            self._set_all_in(sb_p)
 
         # Post Big Blind
         bb_p = self.players[bb_idx]
-        bb_val = min(self.bb_amt, bb_p["stack"])
-        bb_p["stack"] -= bb_val
-        bb_p["current_round_bet"] = bb_val
+        bb_val = min(self.bb_amt, bb_p.stack)
+        bb_p.stack -= bb_val
+        bb_p.current_round_bet = bb_val
         self.pot += bb_val
-        if bb_p["stack"] == 0:
-            bb_p["all_in"] = True
+        if bb_p.stack == 0:
+            self._set_all_in(bb_p)
+
+        self.seat_stacks[sb_idx] = sb_p.stack
+        self.seat_stacks[bb_idx] = bb_p.stack
 
         # Set the active bet to the highest blind posted
         self.active_bet = max(sb_val, bb_val)
+        if self.verbosity >= Verbosity.FULL:
+            self.sink.emit(BlindsEvent(sb_p.agent.name, sb_val, bb_p.agent.name, bb_val, self.bb_amt))
 
         # =================================================================
         # STEP 3: DEAL HOLE CARDS
         # =================================================================
-        for p in self.players:
-            if not p["folded"]:
-                p["hand"] = self.deck.draw(2)  # 2 private cards per player
+        for i, p in enumerate(self.players):
+            if not p.folded:
+                p.hand = self.deck.draw(2)  # 2 private cards per player
+                p.hand_mask = card_mask(p.hand)
+                p.state = PlayerState(
+                    name=p.agent.name,
+                    hand=[CARD_STRINGS[c] for c in p.hand],  # Converted once per hand
+                    community_cards=self.board_strings,
+                    stack=p.stack,
+                    current_bet=0,
+                    pot=self.pot,
+                    min_raise=0,
+                    hand_ints=list(p.hand),
+                    board_ints=self.board_ints,
+                    dead_mask=p.hand_mask,
+                    seat=i,
+                    button=self.button_idx,
+                    num_seats=len(self.players),
+                    small_blind=self.sb_amt,
+                    big_blind=self.bb_amt,
+                    stacks=self.seat_stacks,
+                    action_log=self.action_log,
+                )
+        if self.verbosity >= Verbosity.FULL:
+            self.sink.emit(DealEvent([(p.agent.name, p.hand) for p in self.players]))
 
         # =================================================================
         # STEP 4: PRE-FLOP BETTING
         # =================================================================
-        print("--- Pre-Flop ---")
+        if self.verbosity >= Verbosity.FULL:
+            self.sink.emit(StreetEvent("Pre-Flop", []))
         # Action starts with player left of big blind (under the gun)
         start_idx = (bb_idx + 1) % len(self.players)
         self._betting_round(start_idx)
@@ -607,7 +1592,9 @@ class TexasHoldemEngine:
         # =================================================================
         self._reset_round_bets()
         self.community_cards = self.deck.draw(3)  # 3 community cards
-        print(f"\n--- Flop: {[Card.int_to_str(c) for c in self.community_cards]} ---")
+        if self.verbosity >= Verbosity.FULL:
+            self.sink.emit(StreetEvent("Flop", list(self.community_cards)))
+        self._update_board()
         
         # Post-flop betting starts with first active player left of button
         self._betting_round((self.button_idx + 1) % len(self.players))
@@ -619,7 +1606,9 @@ class TexasHoldemEngine:
         # =================================================================
         self._reset_round_bets()
         self.community_cards.extend(self.deck.draw(1))  # 1 more community card
-        print(f"\n--- Turn: {[Card.int_to_str(c) for c in self.community_cards]} ---")
+        if self.verbosity >= Verbosity.FULL:
+            self.sink.emit(StreetEvent("Turn", list(self.community_cards)))
+        self._update_board()
         
         self._betting_round((self.button_idx + 1) % len(self.players))
         if self._check_early_win():
@@ -630,7 +1619,9 @@ class TexasHoldemEngine:
         # =================================================================
         self._reset_round_bets()
         self.community_cards.extend(self.deck.draw(1))  # Final community card
-        print(f"\n--- River: {[Card.int_to_str(c) for c in self.community_cards]} ---")
+        if self.verbosity >= Verbosity.FULL:
+            self.sink.emit(StreetEvent("River", list(self.community_cards)))
+        self._update_board()
         
         self._betting_round((self.button_idx + 1) % len(self.players))
         if self._check_early_win():
@@ -639,7 +1630,12 @@ class TexasHoldemEngine:
         # =================================================================
         # STEP 8: SHOWDOWN
         # =================================================================
-        self._showdown()
+        if self.tracer is None:
+            self._showdown()
+        else:
+            start = self.tracer.now()
+            self._showdown()
+            self.tracer.complete("Showdown", "showdown", start, {"pot": self.pot})
 
         # Display final chip counts
         self._print_stacks()
@@ -655,16 +1651,16 @@ class TexasHoldemEngine:
         Returns:
             bool: True if there's an early winner, False if play continues
         """
-        survivors = self._get_surviving_players()
-        if len(survivors) == 1:
+        if self.num_surviving == 1:
             # Only one player left - they win the pot
-            winner = survivors[0]
-            winner["stack"] += self.pot
-            print(f"Winner by fold: {winner['agent'].name} wins {self.pot}")
+            winner = next(p for p in self.players if not p.folded)
+            winner.stack += self.pot
+            if self.verbosity >= Verbosity.SUMMARY:
+                self.sink.emit(WinEvent(winner.agent.name, self.pot, "Fold"))
             
             # Store result for analysis/debugging
             self.last_hand_result = {
-                "winners": [winner['agent'].name],
+                "winners": [winner.agent.name],
                 "pot": self.pot,
                 "method": "Fold"
             }
@@ -680,24 +1676,18 @@ class TexasHoldemEngine:
         Uses the Treys library to rank hands. Lower scores are better.
         In case of ties, the pot is split equally among winners.
         """
-        print("\n--- Showdown ---")
         survivors = self._get_surviving_players()
 
         # Evaluate each player's hand
         scores = []
         for p in survivors:
             # Treys evaluator returns a score (lower = better)
-            score = self.evaluator.evaluate(self.community_cards, p["hand"])
-            
-            # Get human-readable hand description
-            class_str = self.evaluator.get_rank_class(score)
-            desc = self.evaluator.class_to_string(class_str)
-            
-            scores.append((score, p, desc))
+            score = self.evaluator.evaluate(self.community_cards, p.hand)
+            scores.append((score, p))
 
-            # Display the player's hand
-            hand_str = [Card.int_to_str(c) for c in p["hand"]]
-            print(f"{p['agent'].name} shows {hand_str} ({desc})")
+        # Reveal the hands (descriptions are only built if the sink formats them)
+        if self.verbosity >= Verbosity.SUMMARY:
+            self.sink.emit(ShowdownEvent([(p.agent.name, p.hand, score) for score, p in scores]))
 
         # Sort by score (lowest/best first)
         scores.sort(key=lambda x: x[0])
@@ -710,9 +1700,10 @@ class TexasHoldemEngine:
         share = self.pot // len(winners)
         winner_names = []
         for w in winners:
-            w["stack"] += share
-            print(f"*** {w['agent'].name} WINS {share} ***")
-            winner_names.append(w['agent'].name)
+            w.stack += share
+            if self.verbosity >= Verbosity.SUMMARY:
+                self.sink.emit(WinEvent(w.agent.name, share, "Showdown"))
+            winner_names.append(w.agent.name)
 
         # Store result for analysis
         self.last_hand_result = {
@@ -722,16 +1713,11 @@ class TexasHoldemEngine:
         }
 
     def _print_stacks(self):
-        """Display current chip counts for all players."""
-        print("\n--- Player Stacks ---")
-        for p in self.players:
-            status = ""
-            if p.get("disqualified", False):
-                status = " [DISQUALIFIED]"
-            elif p["stack"] == 0:
-                status = " [BUSTED]"
-            print(f"  {p['agent'].name}: {p['stack']}{status}")
-        print()
+        """Report current chip counts for all players to the event sink."""
+        if self.verbosity >= Verbosity.SUMMARY:
+            self.sink.emit(StacksEvent(
+                [(p.agent.name, p.stack, p.disqualified) for p in self.players]
+            ))
 
 
 # =============================================================================
@@ -805,15 +1791,69 @@ class RandomBot(BaseAgent):
 # BOT LOADER
 # =============================================================================
 
+def load_bot(path: str) -> Optional[BaseAgent]:
+    """
+    Load one bot agent from a Python file.
+
+    The module is imported under the file name (without .py), which is also
+    the bot's name. A valid bot class must:
+    - Have an 'act' method
+    - Not be named 'BaseAgent'
+    - Be instantiable with a single name argument (or no arguments)
+
+    Args:
+        path: Path of the bot file
+
+    Returns:
+        The bot instance, or None if the file has no valid agent class or fails to load
+    """
+    filename = os.path.basename(path)
+    name = filename[:-3]  # Remove .py extension
+
+    # Add the bot's directory to Python path for imports
+    abs_dir = os.path.dirname(os.path.abspath(path))
+    if abs_dir not in sys.path:
+        sys.path.append(abs_dir)
+
+    try:
+        # Load the module dynamically
+        spec = importlib.util.spec_from_file_location(name, path)
+        if spec and spec.loader:
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[name] = module
+            spec.loader.exec_module(module)
+            
+            # Search for a valid agent class in the module
+            for attr_name in dir(module):
+                attr = getattr(module, attr_name)
+                
+                # Check if it's a class with an 'act' method (but not BaseAgent)
+                if isinstance(attr, type) and hasattr(attr, 'act') and attr_name != 'BaseAgent':
+                    try:
+                        # Try to instantiate with name argument
+                        return attr(name)
+                    except TypeError:
+                        # Try without arguments (some bots might not take name)
+                        try:
+                            agent = attr()
+                            agent.name = name
+                            return agent
+                        except:
+                            pass
+            
+            print(f"No valid agent class found in {filename}")
+                
+    except Exception as e:
+        print(f"Failed to load bot from {filename}: {e}")
+    return None
+
+
 def load_bots(directory: str) -> List[BaseAgent]:
     """
     Dynamically load bot agents from Python files in a directory.
     
     This function scans the specified directory for .py files and attempts
-    to instantiate bot classes from each file. A valid bot class must:
-    - Have an 'act' method
-    - Not be named 'BaseAgent'
-    - Be instantiable with a single name argument (or no arguments)
+    to instantiate bot classes from each file (see load_bot).
     """
     bots = []
     
@@ -821,58 +1861,191 @@ def load_bots(directory: str) -> List[BaseAgent]:
     if not os.path.exists(directory):
         return bots
     
-    # Add directory to Python path for imports
-    abs_dir = os.path.abspath(directory)
-    if abs_dir not in sys.path:
-        sys.path.append(abs_dir)
-    
     # Scan for Python files
     for filename in os.listdir(directory):
         if filename.endswith(".py") and filename != "__init__.py":
-            name = filename[:-3]  # Remove .py extension
-            path = os.path.join(directory, filename)
-            
-            try:
-                # Load the module dynamically
-                spec = importlib.util.spec_from_file_location(name, path)
-                if spec and spec.loader:
-                    module = importlib.util.module_from_spec(spec)
-                    sys.modules[name] = module
-                    spec.loader.exec_module(module)
-                    
-                    # Search for a valid agent class in the module
-                    found = False
-                    for attr_name in dir(module):
-                        attr = getattr(module, attr_name)
-                        
-                        # Check if it's a class with an 'act' method (but not BaseAgent)
-                        if isinstance(attr, type) and hasattr(attr, 'act') and attr_name != 'BaseAgent':
-                            try:
-                                # Try to instantiate with name argument
-                                agent = attr(name)
-                                bots.append(agent)
-                                found = True
-                                break 
-                            except TypeError:
-                                # Try without arguments (some bots might not take name)
-                                try:
-                                    agent = attr()
-                                    agent.name = name
-                                    bots.append(agent)
-                                    found = True
-                                    break
-                                except:
-                                    pass
-                    
-                    if not found:
-                        print(f"No valid agent class found in {filename}")
-                        
-            except Exception as e:
-                print(f"Failed to load bot from {filename}: {e}")
+            agent = load_bot(os.path.join(directory, filename))
+            if agent is not None:
+                bots.append(agent)
                 
     return bots
 
 
+# =============================================================================
+# SIMULATION HELPERS
+# =============================================================================
+
+def example_bots() -> List[BaseAgent]:
+    """
+    Build the built-in example bots used when no bot files are found.
+    
+    Returns:
+        List of fresh CallBot/AggroBot/RandomBot instances
+    """
+    return [
+        CallBot("Caller"),
+        AggroBot("Maniac"),
+        RandomBot("Randy"),
+        RandomBot("Randy2")
+    ]
+
+
+def run_simulation(
+    bots: List[BaseAgent], start_stack: int = 2000, max_hands: int = 100, seed: Optional[int] = None,
+    sink: Optional[EventSink] = None, time_control: Optional[TimeControl] = None, telemetry=None,
+    tracer=None, profiler=None
+) -> Dict:
+    """
+    Play one simulation (a fresh table) until one player holds all the chips
+    or the hand limit is reached.
+    
+    Args:
+        bots: Agents to seat at the table, in seating order
+        start_stack: Starting chip count for each player (default: 2000)
+        max_hands: Maximum hands before the chip leader is declared winner (default: 100)
+        seed: Table seed (see TexasHoldemEngine); None for an unseeded table
+        sink: EventSink for the table's game events (default: full text log)
+        time_control: Thinking-time rules for the bots (default: 3 s per action)
+        telemetry: Collector for per-bot act() timings (see poker_toolkit.telemetry)
+        tracer: Timeline tracer for the simulation (see poker_toolkit.tracing)
+        profiler: Per-bot act() profiler (see poker_toolkit.profiling)
+    
+    Returns:
+        Dict with the compact simulation result:
+        - "stacks": {bot name: final chip count}
+        - "winner": name of the simulation winner (None if nobody has chips)
+        - "hands": number of hands played
+    """
+    # Create a fresh game engine
+    game = TexasHoldemEngine(
+        start_stack=start_stack, seed=seed, sink=sink, time_control=time_control, telemetry=telemetry,
+        tracer=tracer, profiler=profiler,
+    )
+    for bot in bots:
+        game.add_agent(bot)
+
+    # Play hands until elimination or hand limit
+    hand_num = 0
+    winner_name = None
+    if tracer is not None:
+        trace_start = tracer.now()
+    
+    # Result lines go through the table's sink, like the rest of the game output
+    notify = game.sink.emit if game.verbosity >= Verbosity.SUMMARY else None
+
+    while True:
+        hand_num += 1
+        
+        # Check for winner (only one player with chips)
+        players_with_chips = game.players_with_chips()
+        if len(players_with_chips) <= 1:
+            if len(players_with_chips) == 1:
+                winner = players_with_chips[0]
+                winner_name = winner.agent.name
+                if notify:
+                    notify(NoticeEvent(
+                        f"\n=== SIMULATION WINNER: {winner.agent.name} with {winner.stack} chips after {hand_num-1} hands ==="
+                    ))
+            elif notify:
+                notify(NoticeEvent(f"\n=== No players left with chips after {hand_num-1} hands ==="))
+            break
+        
+        # Check hand limit (declare winner by chip lead)
+        if hand_num > max_hands:
+            players_with_chips.sort(key=lambda p: p.stack, reverse=True)
+            winner = players_with_chips[0]
+            winner_name = winner.agent.name
+            if notify:
+                notify(NoticeEvent(f"\n=== HAND LIMIT REACHED ({max_hands} hands) ==="))
+                notify(NoticeEvent(f"=== SIMULATION WINNER: {winner.agent.name} with {winner.stack} chips ==="))
+                standings = "\n".join(
+                    f"  {idx}. {p.agent.name}: {p.stack} chips" for idx, p in enumerate(players_with_chips, 1)
+                )
+                notify(NoticeEvent("Final standings:\n" + standings))
+            break
+        
+        # Play the next hand
+        if not game.play_hand():
+            if notify:
+                notify(NoticeEvent("Game could not be played (not enough players?)"))
+            break
+
+    game.stop_pondering()
+    if tracer is not None:
+        tracer.complete("Simulation", "simulation", trace_start, {
+            "seed": str(seed), "winner": winner_name, "hands": hand_num - 1,  # 64-bit seeds as text for JSON
+        })
+    return {
+        "stacks": game.stacks(),
+        "winner": winner_name,
+        "hands": hand_num - 1,
+    }
+
+
+def seat_bots(bots: List, subset_size: int, master_seed: int, sim_index: int) -> List:
+    """
+    Choose the bots seated in one simulation.
+    
+    The draw uses its own stream per simulation, so the seating of simulation
+    `sim_index` depends only on the master seed (not on earlier simulations).
+    
+    Args:
+        bots: All loaded bots (or their names)
+        subset_size: Maximum number of players per table
+        master_seed: The run's master seed
+        sim_index: 0-based simulation number
+        
+    Returns:
+        List of seated bots, in seating order
+    """
+    if len(bots) <= subset_size:
+        return list(bots)
+    return make_rng(master_seed, "seating", sim_index).sample(bots, subset_size)
+
+
+def record_simulation(result: Dict, total_chips: Dict, games_played: Dict, games_won: Dict):
+    """
+    Merge one simulation result (see run_simulation) into the running totals.
+    
+    Args:
+        result: Result dict returned by run_simulation
+        total_chips: {bot name: total chips across simulations}, updated in place
+        games_played: {bot name: games participated}, updated in place
+        games_won: {bot name: simulation wins}, updated in place
+    """
+    for bot_name, stack in result["stacks"].items():
+        total_chips[bot_name] += stack
+        games_played[bot_name] += 1
+    if result["winner"] is not None:
+        games_won[result["winner"]] += 1
+
+
+def print_final_ranking(total_chips: Dict, games_played: Dict, games_won: Dict):
+    """
+    Display the final ranking, sorted by total chips across all simulations.
+    
+    Args:
+        total_chips: {bot name: total chips across simulations}
+        games_played: {bot name: games participated}
+        games_won: {bot name: simulation wins}
+    """
+    print("\n" + "=" * 80)
+    print("=== FINAL RANKING (Total chips across all simulations) ===")
+    print("=" * 80)
+    
+    # Sort bots by total chips earned (descending)
+    ranking = sorted(total_chips.items(), key=lambda x: x[1], reverse=True)
+    
+    for rank, (bot_name, chips) in enumerate(ranking, 1):
+        games = games_played[bot_name]
+        wins = games_won[bot_name]
+        avg_chips = chips / games if games > 0 else 0
+        win_pct = (wins / games * 100) if games > 0 else 0
+        print(f"  {rank:2}. {bot_name:20} | Total: {chips:8} chips | Games: {games:4} | Wins: {wins:3} ({win_pct:5.1f}%) | Avg: {avg_chips:8.1f}")
+    
+    print("=" * 80)
+
+
 # =============================================================================
 # MAIN SIMULATION RUNNER
 # =============================================================================
@@ -882,7 +2055,7 @@ if __name__ == "__main__":
     Main entry point for running poker simulations.
     
     This script:
-    1. Sets up logging to both console and history.txt
+    1. Sets up logging to both console and history.txt (background writer)
     2. Loads bots from the 'bots/' directory
     3. Runs multiple simulations (tournaments)
     4. Tracks and displays final rankings
@@ -891,124 +2064,77 @@ if __name__ == "__main__":
     - If ≤10 bots: 10 simulations with all players
     - If >10 bots: 100 simulations with random 10-player subsets
     - Each simulation plays up to 100 hands or until one player wins all chips
+    
+    For a multi-core run of the same simulations, see poker_toolkit/tournament.py
     """
     
     # Setup paths
     script_dir = os.path.dirname(os.path.abspath(__file__))
     history_file = os.path.join(script_dir, "history.txt")
     
-    # Enable dual logging (console + file)
-    sys.stdout = DualLogger(history_file)
-
-    # Load bots from the bots/ directory
-    bots_dir = os.path.join(script_dir, "bots")
-    loaded_bots = load_bots(bots_dir)
-    
-    # Fall back to example bots if none found
-    if not loaded_bots:
-        print(f"No bots found in '{bots_dir}'. Using example bots.")
-        loaded_bots = [
-            CallBot("Caller"),
-            AggroBot("Maniac"),
-            RandomBot("Randy"),
-            RandomBot("Randy2")
-        ]
+    # Log to history.txt (and the console) from a background thread, so the
+    # game never waits on the disk
+    from poker_toolkit.logwriter import BackgroundLogWriter
+    log_writer = BackgroundLogWriter(history_file, echo=sys.__stdout__)
+    sys.stdout = log_writer
+    try:
+        # Master seed: every random stream of the run is derived from it
+        if len(sys.argv) > 1:
+            master_seed = int(sys.argv[1])
+        else:
+            master_seed = random.randrange(2**32)
+        print(f"Master seed: {master_seed}")
 
-    num_players = len(loaded_bots)
-    print(f"Loaded {num_players} bots.")
-
-    # Configure simulation parameters based on number of bots
-    if num_players > 10:
-        # Large field: run more simulations with random subsets
-        num_simulations = 100
-        subset_size = 10
-        print(f"More than 10 players. Running {num_simulations} simulations with subsets of {subset_size}.")
-    else:
-        # Small field: fewer simulations with all players
-        num_simulations = 10
-        subset_size = num_players
-        print(f"Running {num_simulations} simulations with all players.")
-
-    # Statistics tracking
-    total_chips = {bot.name: 0 for bot in loaded_bots}    # Total chips earned
-    games_played = {bot.name: 0 for bot in loaded_bots}   # Number of games participated
-    games_won = {bot.name: 0 for bot in loaded_bots}      # Number of tournament wins
-
-    # =================================================================
-    # RUN SIMULATIONS
-    # =================================================================
-    
-    for i in range(num_simulations):
-        # Select players for this simulation
+        # Load bots from the bots/ directory
+        bots_dir = os.path.join(script_dir, "bots")
+        loaded_bots = load_bots(bots_dir)
+    
+        # Fall back to example bots if none found
+        if not loaded_bots:
+            print(f"No bots found in '{bots_dir}'. Using example bots.")
+            loaded_bots = example_bots()
+
+        num_players = len(loaded_bots)
+        print(f"Loaded {num_players} bots.")
+
+        # Configure simulation parameters based on number of bots
         if num_players > 10:
-            current_bots = random.sample(loaded_bots, subset_size)
+            # Large field: run more simulations with random subsets
+            num_simulations = 100
+            subset_size = 10
+            print(f"More than 10 players. Running {num_simulations} simulations with subsets of {subset_size}.")
         else:
-            current_bots = loaded_bots
+            # Small field: fewer simulations with all players
+            num_simulations = 10
+            subset_size = num_players
+            print(f"Running {num_simulations} simulations with all players.")
 
-        # Create a fresh game engine
-        game = TexasHoldemEngine(start_stack=2000)
-        for bot in current_bots:
-            game.add_agent(bot)
+        # Statistics tracking
+        total_chips = {bot.name: 0 for bot in loaded_bots}    # Total chips earned
+        games_played = {bot.name: 0 for bot in loaded_bots}   # Number of games participated
+        games_won = {bot.name: 0 for bot in loaded_bots}      # Number of tournament wins
 
-        print(f"\n--- Simulation {i+1}/{num_simulations} ---")
-        
-        # Play hands until elimination or hand limit
-        hand_num = 0
-        MAX_HANDS = 100  # Prevent infinite games
-        
-        while True:
-            hand_num += 1
-            
-            # Check for winner (only one player with chips)
-            players_with_chips = [p for p in game.players if p["stack"] > 0]
-            if len(players_with_chips) <= 1:
-                if len(players_with_chips) == 1:
-                    winner = players_with_chips[0]
-                    print(f"\n=== SIMULATION WINNER: {winner['agent'].name} with {winner['stack']} chips after {hand_num-1} hands ===")
-                    games_won[winner['agent'].name] += 1
-                else:
-                    print(f"\n=== No players left with chips after {hand_num-1} hands ===")
-                break
-            
-            # Check hand limit (declare winner by chip lead)
-            if hand_num > MAX_HANDS:
-                players_with_chips.sort(key=lambda p: p["stack"], reverse=True)
-                winner = players_with_chips[0]
-                print(f"\n=== HAND LIMIT REACHED ({MAX_HANDS} hands) ===")
-                print(f"=== SIMULATION WINNER: {winner['agent'].name} with {winner['stack']} chips ===")
-                games_won[winner['agent'].name] += 1
-                print("Final standings:")
-                for idx, p in enumerate(players_with_chips, 1):
-                    print(f"  {idx}. {p['agent'].name}: {p['stack']} chips")
-                break
-            
-            # Play the next hand
-            if not game.play_hand():
-                print("Game could not be played (not enough players?)")
-                break
+        # =================================================================
+        # RUN SIMULATIONS
+        # =================================================================
+    
+        for i in range(num_simulations):
+            # Select players for this simulation
+            current_bots = seat_bots(loaded_bots, subset_size, master_seed, i)
 
-        # Record final chip counts for statistics
-        for p in game.players:
-            bot_name = p["agent"].name
-            total_chips[bot_name] += p["stack"]
-            games_played[bot_name] += 1
+            print(f"\n--- Simulation {i+1}/{num_simulations} ---")
+        
+            # Play up to MAX_HANDS hands (prevents infinite games) and record the result
+            sim_seed = derive_seed(master_seed, "simulation", i)
+            result = run_simulation(current_bots, start_stack=2000, max_hands=100, seed=sim_seed)
+            record_simulation(result, total_chips, games_played, games_won)
 
-    # =================================================================
-    # DISPLAY FINAL RANKINGS
-    # =================================================================
-    
-    print("\n" + "=" * 80)
-    print("=== FINAL RANKING (Total chips across all simulations) ===")
-    print("=" * 80)
-    
-    # Sort bots by total chips earned (descending)
-    ranking = sorted(total_chips.items(), key=lambda x: x[1], reverse=True)
-    
-    for rank, (bot_name, chips) in enumerate(ranking, 1):
-        games = games_played[bot_name]
-        wins = games_won[bot_name]
-        avg_chips = chips / games if games > 0 else 0
-        win_pct = (wins / games * 100) if games > 0 else 0
-        print(f"  {rank:2}. {bot_name:20} | Total: {chips:8} chips | Games: {games:4} | Wins: {wins:3} ({win_pct:5.1f}%) | Avg: {avg_chips:8.1f}")
+        # =================================================================
+        # DISPLAY FINAL RANKINGS
+        # =================================================================
     
-    print("=" * 80)
+        print_final_ranking(total_chips, games_played, games_won)
+
+    finally:
+        sys.stdout = sys.__stdout__
+        log_writer.close()  # Waits until everything is written
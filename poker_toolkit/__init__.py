@@ -0,0 +1,11 @@
+"""
+Poker Toolkit
+=============
+
+Tools built around the Texas Hold'em engine (engine.py): tournament runners,
+logging, analysis and benchmarking utilities.
+
+Run the modules from the project root so that `engine` and the bot
+directories are importable, e.g.:
+    python -m poker_toolkit.tournament
+"""
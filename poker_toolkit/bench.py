@@ -0,0 +1,308 @@
+"""
+Engine Microbenchmarks
+======================
+
+Measures the engine itself - with the built-in CallBot / AggroBot /
+RandomBot, so bot thinking time does not drown the numbers - and compares
+the results with a stored baseline, so engine changes can be shown to make
+tournaments faster rather than slower.
+
+Benchmarks:
+    hands_per_sec/<N>_seats/<log>   play_hand() throughput at 2, 6 and 10 seats,
+                                    with logging off (NullSink) and on (full
+                                    text log formatted into an in-memory stream)
+    betting_round_us_per_action     _betting_round() time per bot action
+    showdown_us_per_eval            _showdown() time per hand evaluated
+    player_state_us                 PlayerState construction
+    logging_overhead_pct/<N>_seats  extra play_hand() time with the full text log
+
+Usage:
+    python -m poker_toolkit.bench                          # run and print
+    python -m poker_toolkit.bench --save-baseline          # store bench_baseline.json
+    python -m poker_toolkit.bench --compare                # flag regressions > 10%
+    python -m poker_toolkit.bench --compare --threshold 0.05 --json results.json
+
+Every benchmark is repeated (--repeat, default 5) and the best run is kept,
+as timeit does: the fastest run is the one least disturbed by the rest of
+the machine. Baselines are only comparable on the same machine and Python.
+--compare exits with status 1 if anything regressed, so it can gate CI.
+"""
+
+import argparse
+import datetime
+import gc
+import io
+import json
+import os
+import platform
+import sys
+import time
+from typing import Callable, Dict, List
+
+from engine import (
+    AggroBot,
+    CallBot,
+    NullSink,
+    PlayerState,
+    PrintSink,
+    RandomBot,
+    SeededDeck,
+    TexasHoldemEngine,
+    Verbosity,
+)
+
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BASELINE = os.path.join(PROJECT_DIR, "bench_baseline.json")
+DEFAULT_THRESHOLD = 0.10       # Relative slowdown reported as a regression
+SEAT_COUNTS = (2, 6, 10)
+BENCH_STACK = 2000             # Tournament starting stack, restored before every hand
+BENCH_SEED = 12345
+
+
+# =============================================================================
+# HELPERS
+# =============================================================================
+
+class _TimedEngine(TexasHoldemEngine):
+    """Engine that accumulates the time spent in _betting_round and the actions taken there."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.betting_time = 0.0
+        self.betting_actions = 0
+
+    def _betting_round(self, starting_index):
+        logged = len(self.action_log)
+        start = time.perf_counter()
+        super()._betting_round(starting_index)
+        self.betting_time += time.perf_counter() - start
+        self.betting_actions += (len(self.action_log) - logged) // 4  # 4 entries per action
+
+
+def _bench_bots(seats: int) -> List:
+    """A fixed mix of the built-in bots (CallBot, AggroBot, RandomBot, repeating)."""
+    kinds = (CallBot, AggroBot, RandomBot)
+    return [kinds[i % 3](f"{kinds[i % 3].__name__}_{i}") for i in range(seats)]
+
+
+def _table(seats: int, sink, engine_class=TexasHoldemEngine) -> TexasHoldemEngine:
+    """A seeded table of the built-in bots."""
+    game = engine_class(start_stack=BENCH_STACK, seed=BENCH_SEED, sink=sink)
+    for bot in _bench_bots(seats):
+        game.add_agent(bot)
+    return game
+
+
+def _play(game: TexasHoldemEngine, hands: int):
+    """Play hands, refilling the stacks first so every hand is played at the full table."""
+    for _ in range(hands):
+        for p in game.players:
+            p.stack = BENCH_STACK
+        game.play_hand()
+
+
+def _best_of(repeat: int, run: Callable[[], float]) -> float:
+    """Smallest of `repeat` results of run(), with the garbage collector off (as in timeit)."""
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return min(run() for _ in range(repeat))
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+# =============================================================================
+# BENCHMARKS
+# =============================================================================
+
+def bench_hands(seats: int, hands: int, logging: bool) -> float:
+    """Seconds for `hands` hands of play_hand() (logging: full text log into a StringIO)."""
+    sink = PrintSink(Verbosity.FULL, stream=io.StringIO()) if logging else NullSink()
+    game = _table(seats, sink)
+    start = time.perf_counter()
+    _play(game, hands)
+    return time.perf_counter() - start
+
+
+def bench_betting_round(hands: int) -> float:
+    """Seconds per bot action spent in _betting_round (6 seats, no logging)."""
+    game = _table(6, NullSink(), _TimedEngine)
+    _play(game, hands)
+    return game.betting_time / max(1, game.betting_actions)
+
+
+def bench_showdown(calls: int, survivors: int = 6) -> float:
+    """Seconds per hand evaluated by _showdown() (river board, `survivors` players)."""
+    game = _table(survivors, NullSink())
+    game.deck = SeededDeck(game.rng)
+    for p in game.players:
+        p.folded = False
+        p.hand = game.deck.draw(2)
+    game.community_cards = game.deck.draw(5)
+    game.pot = 0
+    start = time.perf_counter()
+    for _ in range(calls):
+        game._showdown()
+    return (time.perf_counter() - start) / (calls * survivors)
+
+
+def bench_player_state(count: int) -> float:
+    """Seconds per PlayerState construction (arguments as play_hand passes them)."""
+    hand = ["Ah", "Kd"]
+    board: List[str] = []
+    hand_ints = [268471337, 134236965]
+    stacks = [2000] * 10
+    start = time.perf_counter()
+    for i in range(count):
+        PlayerState(
+            name="bench", hand=hand, community_cards=board, stack=2000, current_bet=0,
+            pot=30, min_raise=0, hand_ints=hand_ints, board_ints=board, dead_mask=0,
+            seat=i % 10, button=0, num_seats=10, small_blind=10, big_blind=20,
+            stacks=stacks, action_log=board,
+        )
+    return (time.perf_counter() - start) / count
+
+
+def run_benchmarks(repeat: int = 5, scale: float = 1.0, verbose: bool = True) -> Dict[str, Dict]:
+    """
+    Run the whole suite.
+
+    Args:
+        repeat: Runs per benchmark; the best is kept (default: 5)
+        scale: Multiplier for the work per run (e.g. 0.2 for a quick check)
+        verbose: Print each result as it is measured
+
+    Returns:
+        {benchmark name: {"value": float, "unit": str, "higher_is_better": bool}}
+    """
+    hands = max(20, int(2000 * scale))
+    results: Dict[str, Dict] = {}
+
+    def record(name: str, value: float, unit: str, higher_is_better: bool):
+        results[name] = {"value": value, "unit": unit, "higher_is_better": higher_is_better}
+        if verbose:
+            print(f"  {name:40} {value:12.2f} {unit}")
+
+    # Bots run under the engine's normal time limits (SIGALRM + setrlimit per action),
+    # which are part of the engine's cost; their hand-by-hand prints are not.
+    for seats in SEAT_COUNTS:
+        quiet = _best_of(repeat, lambda: bench_hands(seats, hands, logging=False))
+        logged = _best_of(repeat, lambda: bench_hands(seats, hands, logging=True))
+        record(f"hands_per_sec/{seats}_seats/no_log", hands / quiet, "hands/s", True)
+        record(f"hands_per_sec/{seats}_seats/full_log", hands / logged, "hands/s", True)
+        record(f"logging_overhead_pct/{seats}_seats", (logged / quiet - 1) * 100, "%", False)
+
+    record("betting_round_us_per_action",
+           _best_of(repeat, lambda: bench_betting_round(hands)) * 1e6, "us", False)
+    record("showdown_us_per_eval",
+           _best_of(repeat, lambda: bench_showdown(max(100, int(5000 * scale)))) * 1e6, "us", False)
+    record("player_state_us",
+           _best_of(repeat, lambda: bench_player_state(max(1000, int(100_000 * scale)))) * 1e6, "us", False)
+    return results
+
+
+# =============================================================================
+# BASELINE COMPARISON
+# =============================================================================
+
+def make_report(results: Dict[str, Dict], repeat: int, scale: float) -> Dict:
+    """Results plus the metadata needed to judge whether two reports are comparable."""
+    return {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()} ({os.cpu_count()} CPUs)",
+        "repeat": repeat,
+        "scale": scale,
+        "results": results,
+    }
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float) -> List[Dict]:
+    """
+    Compare results with a baseline.
+
+    Args:
+        results: run_benchmarks() output
+        baseline: "results" of a stored report
+        threshold: Relative slowdown that counts as a regression (0.10 = 10%)
+
+    Returns:
+        One row per benchmark present in both: name, baseline, current,
+        change (positive = better) and status ("ok", "faster", "REGRESSION")
+    """
+    rows = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        old, new = base["value"], current["value"]
+        if name.startswith("logging_overhead_pct"):
+            # A difference of percentages: compare in points of the no-log time
+            change = (old - new) / 100
+        elif current["higher_is_better"]:
+            change = new / old - 1 if old else 0.0
+        else:
+            change = old / new - 1 if new else 0.0
+        if change < -threshold:
+            status = "REGRESSION"
+        elif change > threshold:
+            status = "faster"
+        else:
+            status = "ok"
+        rows.append({"name": name, "baseline": old, "current": new, "change": change, "status": status})
+    return rows
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Engine microbenchmarks with a regression baseline.")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per benchmark, best kept (default: 5)")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="work per run, relative to the default (e.g. 0.2 for a quick check)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE,
+                        help="baseline file (default: bench_baseline.json in the project directory)")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the baseline")
+    parser.add_argument("--compare", action="store_true",
+                        help="compare with the baseline; exit status 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="relative slowdown reported as a regression (default: 0.10)")
+    parser.add_argument("--json", default=None, metavar="PATH", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    print(f"Engine benchmarks (best of {args.repeat}, scale {args.scale}):")
+    results = run_benchmarks(repeat=args.repeat, scale=args.scale)
+    report = make_report(results, args.repeat, args.scale)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+
+    if args.compare:
+        if not os.path.exists(args.baseline):
+            print(f"No baseline at {args.baseline}; create one with --save-baseline.")
+            return 2
+        with open(args.baseline) as f:
+            stored = json.load(f)
+        if stored.get("machine") != report["machine"] or stored.get("python") != report["python"]:
+            print(f"Warning: baseline is from {stored.get('machine')}, Python {stored.get('python')}")
+        rows = compare(results, stored["results"], args.threshold)
+        print(f"\nAgainst baseline of {stored.get('created')} (threshold {args.threshold:.0%}):")
+        for r in rows:
+            print(f"  {r['name']:40} {r['baseline']:12.2f} -> {r['current']:12.2f}  "
+                  f"{r['change'] * 100:+6.1f}%  {r['status']}")
+        regressions = [r for r in rows if r["status"] == "REGRESSION"]
+        if regressions:
+            print(f"{len(regressions)} regression(s).")
+            return 1
+        print("No regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
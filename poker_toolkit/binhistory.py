@@ -0,0 +1,517 @@
+"""
+Binary Hand History
+===================
+
+A compact, length-prefixed record format for hand histories, written by an
+event sink alongside (or instead of) the text log, plus a pretty-printer that
+renders any hand back into the classic history.txt text.
+
+Usage:
+    writer = BinaryHistoryWriter("logs/simulation_0001.phh", table_id=1)
+    game = TexasHoldemEngine(sink=writer)                        # binary only
+    game = TexasHoldemEngine(sink=MultiSink([PrintSink(), writer]))  # both
+    ...
+    writer.close()
+
+    python -m poker_toolkit.binhistory logs/simulation_0001.phh            # whole file as text
+    python -m poker_toolkit.binhistory logs/simulation_0001.phh --hand 17  # one hand
+
+File layout:
+    b"PKHH" + version (u8), then records of: type (u8), payload length (u32 LE), payload
+
+    NAME record: name id (u16 LE), utf-8 name
+    HAND record (v = zigzag LEB128 varint, u8 = one byte):
+        table id (v), hand number (v), button seat (u8), seat count (u8)
+        per seat:   name id (v), stack at hand start (v), hole cards (2 x u8)
+        blinds:     sb seat (u8), sb amount (v), bb seat (u8), bb amount (v)
+        board:      count (u8), cards (u8 each)
+        actions:    count (v), per action: seat (u8), street << 4 | type (u8), amount (v)
+        notices:    count (v), per notice: street (u8), action index (v), length (v), utf-8 text
+        showdown:   count (u8), per hand shown: seat (u8), treys score (v)
+        wins:       count (u8), per win: seat << 1 | method (u8, 0 = fold, 1 = showdown), amount (v)
+        stacks:     per seat: stack at hand end (v); disqualified seats bitmask
+
+Cards are 6-bit codes (rank * 4 + suit, 255 = no card). Pots are not stored;
+they are replayed from the blinds and actions, exactly as the engine does.
+"""
+
+import argparse
+import gzip
+import struct
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional
+
+from treys import Card, Deck
+
+from engine import (
+    ActionEvent,
+    BlindsEvent,
+    DealEvent,
+    EventSink,
+    GameEvent,
+    HandStartEvent,
+    NoticeEvent,
+    ShowdownEvent,
+    StacksEvent,
+    StreetEvent,
+    Verbosity,
+    WinEvent,
+)
+
+
+MAGIC = b"PKHH"
+VERSION = 1
+
+REC_NAME = 1
+REC_HAND = 2
+
+STREETS = ["Pre-Flop", "Flop", "Turn", "River"]
+ACTIONS = ["FOLD", "CHECK", "CALL", "RAISE"]
+WIN_METHODS = ["Fold", "Showdown"]
+NO_CARD = 0xFF
+
+_RECORD_HEADER = struct.Struct("<BI")
+_U8 = struct.Struct("<B")
+_U16 = struct.Struct("<H")
+
+
+# =============================================================================
+# CARD CODES
+# =============================================================================
+
+_SUIT_INDEX = {1: 0, 2: 1, 4: 2, 8: 3}  # treys suit bits (s, h, d, c)
+
+CARD_TO_CODE: Dict[int, int] = {}
+CODE_TO_CARD: List[int] = [0] * 52
+for _card in Deck.GetFullDeck():
+    _code = Card.get_rank_int(_card) * 4 + _SUIT_INDEX[Card.get_suit_int(_card)]
+    CARD_TO_CODE[_card] = _code
+    CODE_TO_CARD[_code] = _card
+
+
+# =============================================================================
+# HAND RECORD
+# =============================================================================
+
+@dataclass
+class HandRecord:
+    """
+    One decoded hand. Seats are indices into `players`; cards are treys ints.
+
+    Attributes:
+        table_id: Table (simulation) the hand was played at
+        hand_number: Hand number at that table
+        button: Seat of the dealer button
+        players: Player names, in seat order
+        start_stacks: Stacks at the start of the hand (before blinds)
+        hole_cards: Hole cards per seat (empty for busted seats)
+        blinds: [(sb seat, amount), (bb seat, amount)] (empty if none were posted)
+        board: Community cards dealt
+        actions: (street, seat, action, amount) tuples; street indexes STREETS,
+                 action indexes ACTIONS, amount is the call or raise-to amount
+        notices: (street, action index, message) - engine messages shown before
+                 the action with that index
+        showdown: (seat, treys score) for every hand shown
+        wins: (seat, amount, method) - method is 'Fold' or 'Showdown'
+        final_stacks: Stacks at the end of the hand
+        disqualified: Disqualified flag per seat
+    """
+    table_id: int
+    hand_number: int
+    button: int
+    players: List[str]
+    start_stacks: List[int]
+    hole_cards: List[List[int]] = field(default_factory=list)
+    blinds: List[tuple] = field(default_factory=list)
+    board: List[int] = field(default_factory=list)
+    actions: List[tuple] = field(default_factory=list)
+    notices: List[tuple] = field(default_factory=list)
+    showdown: List[tuple] = field(default_factory=list)
+    wins: List[tuple] = field(default_factory=list)
+    final_stacks: List[int] = field(default_factory=list)
+    disqualified: List[bool] = field(default_factory=list)
+
+
+def _put_varint(buf: bytearray, value: int):
+    """Append a signed integer as a zigzag LEB128 varint (1 byte below 64)."""
+    value = (value << 1) if value >= 0 else ((-value << 1) - 1)
+    while value >= 0x80:
+        buf.append(value & 0x7F | 0x80)
+        value >>= 7
+    buf.append(value)
+
+
+def _get_varint(data: bytes, pos: int):
+    """Read a zigzag LEB128 varint; returns (value, new position)."""
+    result = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            break
+        shift += 7
+    return (result >> 1) if not result & 1 else -((result + 1) >> 1), pos
+
+
+def encode_hand(record: HandRecord, name_ids: Dict[str, int]) -> bytes:
+    """Encode a hand record as a HAND payload (names must already have ids)."""
+    buf = bytearray()
+    n = len(record.players)
+    _put_varint(buf, record.table_id)
+    _put_varint(buf, record.hand_number)
+    buf.append(record.button)
+    buf.append(n)
+
+    for seat in range(n):
+        _put_varint(buf, name_ids[record.players[seat]])
+        _put_varint(buf, record.start_stacks[seat])
+        cards = [CARD_TO_CODE[c] for c in record.hole_cards[seat]] + [NO_CARD, NO_CARD]
+        buf.append(cards[0])
+        buf.append(cards[1])
+
+    if record.blinds:
+        (sb_seat, sb_amt), (bb_seat, bb_amt) = record.blinds
+    else:
+        sb_seat, sb_amt, bb_seat, bb_amt = NO_CARD, 0, NO_CARD, 0
+    buf.append(sb_seat)
+    _put_varint(buf, sb_amt)
+    buf.append(bb_seat)
+    _put_varint(buf, bb_amt)
+
+    buf.append(len(record.board))
+    buf.extend(CARD_TO_CODE[c] for c in record.board)
+
+    _put_varint(buf, len(record.actions))
+    for street, seat, action, amount in record.actions:
+        buf.append(seat)
+        buf.append(street << 4 | action)
+        _put_varint(buf, amount)
+
+    _put_varint(buf, len(record.notices))
+    for street, index, message in record.notices:
+        data = message.encode("utf-8")
+        buf.append(street)
+        _put_varint(buf, index)
+        _put_varint(buf, len(data))
+        buf.extend(data)
+
+    buf.append(len(record.showdown))
+    for seat, score in record.showdown:
+        buf.append(seat)
+        _put_varint(buf, score)
+
+    buf.append(len(record.wins))
+    for seat, amount, method in record.wins:
+        buf.append(seat << 1 | WIN_METHODS.index(method))
+        _put_varint(buf, amount)
+
+    for stack in record.final_stacks:
+        _put_varint(buf, stack)
+    mask = sum(1 << seat for seat, dq in enumerate(record.disqualified) if dq)
+    buf.extend(mask.to_bytes((n + 7) // 8, "little"))
+    return bytes(buf)
+
+
+def decode_hand(payload: bytes, names: Dict[int, str]) -> HandRecord:
+    """Decode a HAND payload (inverse of encode_hand)."""
+    table_id, pos = _get_varint(payload, 0)
+    hand_number, pos = _get_varint(payload, pos)
+    button, n = payload[pos], payload[pos + 1]
+    pos += 2
+    record = HandRecord(table_id, hand_number, button, [], [])
+
+    for _ in range(n):
+        name_id, pos = _get_varint(payload, pos)
+        stack, pos = _get_varint(payload, pos)
+        record.players.append(names[name_id])
+        record.start_stacks.append(stack)
+        record.hole_cards.append([CODE_TO_CARD[c] for c in payload[pos:pos + 2] if c != NO_CARD])
+        pos += 2
+
+    sb_seat = payload[pos]
+    sb_amt, pos = _get_varint(payload, pos + 1)
+    bb_seat = payload[pos]
+    bb_amt, pos = _get_varint(payload, pos + 1)
+    if sb_seat != NO_CARD:
+        record.blinds = [(sb_seat, sb_amt), (bb_seat, bb_amt)]
+
+    count = payload[pos]
+    pos += 1
+    record.board = [CODE_TO_CARD[c] for c in payload[pos:pos + count]]
+    pos += count
+
+    count, pos = _get_varint(payload, pos)
+    for _ in range(count):
+        seat, packed = payload[pos], payload[pos + 1]
+        amount, pos = _get_varint(payload, pos + 2)
+        record.actions.append((packed >> 4, seat, packed & 0xF, amount))
+
+    count, pos = _get_varint(payload, pos)
+    for _ in range(count):
+        street = payload[pos]
+        index, pos = _get_varint(payload, pos + 1)
+        length, pos = _get_varint(payload, pos)
+        record.notices.append((street, index, payload[pos:pos + length].decode("utf-8")))
+        pos += length
+
+    count = payload[pos]
+    pos += 1
+    for _ in range(count):
+        seat = payload[pos]
+        score, pos = _get_varint(payload, pos + 1)
+        record.showdown.append((seat, score))
+
+    count = payload[pos]
+    pos += 1
+    for _ in range(count):
+        packed = payload[pos]
+        amount, pos = _get_varint(payload, pos + 1)
+        record.wins.append((packed >> 1, amount, WIN_METHODS[packed & 1]))
+
+    for _ in range(n):
+        stack, pos = _get_varint(payload, pos)
+        record.final_stacks.append(stack)
+    mask = int.from_bytes(payload[pos:pos + (n + 7) // 8], "little")
+    record.disqualified = [bool(mask >> seat & 1) for seat in range(n)]
+    return record
+
+
+# =============================================================================
+# WRITER (EVENT SINK)
+# =============================================================================
+
+class BinaryHistoryWriter(EventSink):
+    """
+    Event sink that records every hand as a binary HAND record.
+
+    Events are collected while the hand is played and encoded once, when the
+    final stacks are reported. Needs FULL verbosity (actions and hole cards).
+
+    Args:
+        path: Output file (conventionally *.phh)
+        table_id: Table id stored with each hand (e.g. the simulation number)
+        compress: gzip the file as it is written
+    """
+    verbosity = Verbosity.FULL
+
+    def __init__(self, path: str, table_id: int = 0, compress: bool = False):
+        self.path = path
+        self.table_id = table_id
+        self._file = gzip.open(path, "wb") if compress else open(path, "wb", buffering=1024 * 1024)
+        self._file.write(MAGIC + _U8.pack(VERSION))
+        self._name_ids: Dict[str, int] = {}
+        self._seat_of: Dict[str, int] = {}
+        self._street = 0
+        self._hand: Optional[HandRecord] = None
+
+    def start_table(self, table_id: int):
+        """Tag the following hands with a new table id (e.g. next simulation)."""
+        self.table_id = table_id
+        self._hand = None
+
+    def emit(self, event: GameEvent):
+        if isinstance(event, HandStartEvent):
+            players = [name for name, _ in event.seats]
+            self._seat_of = {name: seat for seat, name in enumerate(players)}
+            self._street = 0
+            self._hand = HandRecord(
+                self.table_id, event.hand_number, self._seat_of[event.button],
+                players, [stack for _, stack in event.seats],
+                hole_cards=[[] for _ in players],
+            )
+            return
+
+        hand = self._hand
+        if hand is None:
+            return
+        if isinstance(event, ActionEvent):
+            hand.actions.append(
+                (self._street, self._seat_of[event.player], ACTIONS.index(event.action), event.amount)
+            )
+        elif isinstance(event, StreetEvent):
+            self._street = STREETS.index(event.street)
+            hand.board = list(event.board)
+        elif isinstance(event, DealEvent):
+            hand.hole_cards = [list(cards) for _, cards in event.hands]
+        elif isinstance(event, BlindsEvent):
+            hand.blinds = [
+                (self._seat_of[event.sb_player], event.sb_amount),
+                (self._seat_of[event.bb_player], event.bb_amount),
+            ]
+        elif isinstance(event, NoticeEvent):
+            hand.notices.append((self._street, len(hand.actions), event.message))
+        elif isinstance(event, ShowdownEvent):
+            hand.showdown = [(self._seat_of[name], score) for name, _, score in event.hands]
+        elif isinstance(event, WinEvent):
+            hand.wins.append((self._seat_of[event.player], event.amount, event.method))
+        elif isinstance(event, StacksEvent):
+            hand.final_stacks = [stack for _, stack, _ in event.stacks]
+            hand.disqualified = [dq for _, _, dq in event.stacks]
+            self._write_hand(hand)
+            self._hand = None
+
+    def _write_hand(self, hand: HandRecord):
+        """Encode a finished hand, defining any new player names first."""
+        for name in hand.players:
+            if name not in self._name_ids:
+                name_id = len(self._name_ids)
+                self._name_ids[name] = name_id
+                data = _U16.pack(name_id) + name.encode("utf-8")
+                self._file.write(_RECORD_HEADER.pack(REC_NAME, len(data)) + data)
+        payload = encode_hand(hand, self._name_ids)
+        self._file.write(_RECORD_HEADER.pack(REC_HAND, len(payload)) + payload)
+
+    def close(self):
+        self._file.close()
+
+
+# =============================================================================
+# READER AND PRETTY-PRINTER
+# =============================================================================
+
+def open_history(path: str):
+    """Open a binary history file for reading, gzip-compressed or not."""
+    with open(path, "rb") as f:
+        compressed = f.read(2) == b"\x1f\x8b"
+    return gzip.open(path, "rb") if compressed else open(path, "rb")
+
+
+def read_hands(path: str) -> Iterator[HandRecord]:
+    """
+    Yield the hands of a binary history file one at a time.
+
+    Args:
+        path: File written by BinaryHistoryWriter (plain or gzip)
+    """
+    with open_history(path) as f:
+        header = f.read(len(MAGIC) + 1)
+        if header[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a binary hand history")
+        if header[len(MAGIC)] != VERSION:
+            raise ValueError(f"{path}: unsupported version {header[len(MAGIC)]}")
+
+        names: Dict[int, str] = {}
+        while True:
+            head = f.read(_RECORD_HEADER.size)
+            if len(head) < _RECORD_HEADER.size:
+                return
+            rtype, length = _RECORD_HEADER.unpack(head)
+            payload = f.read(length)
+            if rtype == REC_NAME:
+                (name_id,) = _U16.unpack_from(payload, 0)
+                names[name_id] = payload[2:].decode("utf-8")
+            elif rtype == REC_HAND:
+                yield decode_hand(payload, names)
+
+
+def iter_hand_records(data, names: Optional[Dict[int, str]] = None) -> Iterator[tuple]:
+    """
+    Yield (offset, length, HandRecord) for every hand of a whole binary
+    history held in memory or memory-mapped (uncompressed files only).
+
+    Args:
+        data: bytes or mmap of the file, including the header
+        names: Dict filled with the file's name ids as NAME records are read
+    """
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError("not a binary hand history")
+    names = {} if names is None else names
+    pos = len(MAGIC) + 1
+    while pos + _RECORD_HEADER.size <= len(data):
+        rtype, length = _RECORD_HEADER.unpack_from(data, pos)
+        start = pos
+        pos += _RECORD_HEADER.size + length
+        payload = bytes(data[start + _RECORD_HEADER.size:pos])
+        if rtype == REC_NAME:
+            (name_id,) = _U16.unpack_from(payload, 0)
+            names[name_id] = payload[2:].decode("utf-8")
+        elif rtype == REC_HAND:
+            yield start, pos - start, decode_hand(payload, names)
+
+
+def decode_record(chunk: bytes, names: Dict[int, str]) -> HandRecord:
+    """Decode one HAND record, header included (e.g. a slice found through an index)."""
+    return decode_hand(bytes(chunk[_RECORD_HEADER.size:]), names)
+
+
+def hand_events(record: HandRecord) -> Iterator[GameEvent]:
+    """
+    Rebuild the engine events of a recorded hand (pots are replayed from the
+    blinds and actions the same way the engine computes them).
+    """
+    players = record.players
+    yield HandStartEvent(record.hand_number, players[record.button], list(zip(players, record.start_stacks)))
+
+    pot = 0
+    round_bets = [0] * len(players)
+    if record.blinds:
+        (sb_seat, sb_amt), (bb_seat, bb_amt) = record.blinds
+        yield BlindsEvent(players[sb_seat], sb_amt, players[bb_seat], bb_amt)
+        round_bets[sb_seat] = sb_amt
+        round_bets[bb_seat] = bb_amt
+        pot = sb_amt + bb_amt
+        yield DealEvent(list(zip(players, record.hole_cards)))
+
+    board_sizes = [0, 3, 4, 5]
+    for street, name in enumerate(STREETS):
+        if street > 0:
+            if len(record.board) < board_sizes[street]:
+                break
+            round_bets = [0] * len(players)
+        elif not record.blinds:
+            break
+        yield StreetEvent(name, record.board[:board_sizes[street]])
+
+        actions = [(i, a) for i, a in enumerate(record.actions) if a[0] == street]
+        notices = [n for n in record.notices if n[0] == street]
+        for index, (_, seat, action, amount) in actions:
+            while notices and notices[0][1] <= index:
+                yield NoticeEvent(notices.pop(0)[2])
+            if action == 2:    # CALL
+                round_bets[seat] += amount
+                pot += amount
+            elif action == 3:  # RAISE (amount is the raise-to total)
+                pot += amount - round_bets[seat]
+                round_bets[seat] = amount
+            yield ActionEvent(players[seat], ACTIONS[action], amount, pot)
+        for notice in notices:
+            yield NoticeEvent(notice[2])
+
+    if record.showdown:
+        yield ShowdownEvent([(players[seat], record.hole_cards[seat], score) for seat, score in record.showdown])
+    for seat, amount, method in record.wins:
+        yield WinEvent(players[seat], amount, method)
+    if record.final_stacks:
+        yield StacksEvent(list(zip(players, record.final_stacks, record.disqualified)))
+
+
+def format_hand(record: HandRecord) -> str:
+    """Render a recorded hand in the classic history.txt text format."""
+    lines = []
+    for event in hand_events(record):
+        text = event.format()
+        if text is not None:
+            lines.append(text + "\n")
+    return "".join(lines)
+
+
+def main(argv=None):
+    """Command-line pretty-printer."""
+    parser = argparse.ArgumentParser(description="Render a binary hand history as text.")
+    parser.add_argument("path", help="binary history file (*.phh, optionally gzip-compressed)")
+    parser.add_argument("--table", type=int, default=None, help="only hands of this table id")
+    parser.add_argument("--hand", type=int, default=None, help="only this hand number")
+    args = parser.parse_args(argv)
+
+    for record in read_hands(args.path):
+        if args.table is not None and record.table_id != args.table:
+            continue
+        if args.hand is not None and record.hand_number != args.hand:
+            continue
+        sys.stdout.write(format_hand(record))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,456 @@
+"""
+Decision Corpus
+===============
+
+Records a representative sample of the PlayerStates bots are asked to act
+on, and replays that corpus through every bot - a repeatable benchmark that
+takes seconds instead of a full tournament.
+
+Usage:
+    python -m poker_toolkit.corpus record corpus.pkdc --bots-dir bots --simulations 20
+    python -m poker_toolkit.corpus bench corpus.pkdc                      # bots/ and bad_bots/
+    python -m poker_toolkit.corpus bench corpus.pkdc --bots-dir bots --time-per-action 1 --json out.json
+
+Recording plays seeded simulations with the bots wrapped in a recording
+proxy. Each street keeps a uniform reservoir sample (--per-street states), so
+the corpus covers small and large pots and deep and short stacks in the
+proportions they occur in play.
+
+Replaying runs one task per bot file on a process pool. Each task replays the
+whole corpus through the engine's own _get_action(): the same time limit
+(SIGALRM), memory limit and per-seat random stream as at a real table. The
+report shows latency percentiles per bot and street, the bot's action mix,
+and timeouts against the budget.
+
+File layout (gzip-compressed):
+    b"PKDC" + version (u8), then records of: street (u8), payload length (u32 LE), payload
+
+    payload (v = zigzag LEB128 varint, u8 = one byte; cards as in binhistory):
+        hole cards (2 x u8), board count (u8), board cards (u8 each)
+        seat, button, seat count, live opponents, all-in count (u8 each)
+        small blind, big blind, stack, to call, pot, min raise (v each)
+        stacks: one v per seat
+        action log: count (v), per action: street << 4 | action (u8), seat (u8), amount (v)
+"""
+
+import argparse
+import contextlib
+import gzip
+import json
+import os
+import random
+import struct
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional
+
+from engine import (
+    BaseAgent,
+    CARD_STRINGS,
+    EventSink,
+    NoticeEvent,
+    NullSink,
+    PlayerState,
+    TexasHoldemEngine,
+    TimeControl,
+    Verbosity,
+    card_mask,
+    derive_seed,
+    load_bot,
+    load_bots,
+    run_simulation,
+    seat_bots,
+)
+from poker_toolkit.binhistory import CARD_TO_CODE, CODE_TO_CARD, _get_varint, _put_varint
+from poker_toolkit.outcomes import STREETS
+from poker_toolkit.telemetry import BotTelemetry
+
+
+MAGIC = b"PKDC"
+VERSION = 1
+DEFAULT_PER_STREET = 2000  # States kept per street when recording
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPLAY_ACTIONS = ["FOLD", "CHECK_CALL", "RAISE", "OTHER"]  # OTHER = not an Action
+
+_RECORD_HEADER = struct.Struct("<BI")
+_STREET_OF_BOARD = {0: 0, 3: 1, 4: 2, 5: 3}  # Board size -> street
+
+
+# =============================================================================
+# ENCODING
+# =============================================================================
+
+def encode_state(state: PlayerState) -> bytes:
+    """Encode the game-state fields of a PlayerState (not the name or deadline)."""
+    buf = bytearray(CARD_TO_CODE[c] for c in state.hand_ints)
+    buf.append(len(state.board_ints))
+    buf.extend(CARD_TO_CODE[c] for c in state.board_ints)
+    buf.extend((state.seat, state.button, state.num_seats, state.live_opponents, state.all_in_count))
+    for value in (state.small_blind, state.big_blind, state.stack, state.current_bet, state.pot, state.min_raise):
+        _put_varint(buf, value)
+    for value in state.stacks:
+        _put_varint(buf, value)
+    log = state.action_log
+    _put_varint(buf, len(log) // 4)
+    for i in range(0, len(log), 4):
+        buf.append(log[i] << 4 | log[i + 2])  # street << 4 | action
+        buf.append(log[i + 1])
+        _put_varint(buf, log[i + 3])
+    return bytes(buf)
+
+
+def decode_state(payload: bytes, name: str) -> PlayerState:
+    """Rebuild a fresh PlayerState (for the bot `name`) from an encode_state() payload."""
+    hand = [CODE_TO_CARD[payload[0]], CODE_TO_CARD[payload[1]]]
+    n_board = payload[2]
+    board = [CODE_TO_CARD[code] for code in payload[3:3 + n_board]]
+    pos = 3 + n_board
+    seat, button, num_seats, live_opponents, all_in_count = payload[pos:pos + 5]
+    pos += 5
+    values = []
+    for _ in range(6):
+        value, pos = _get_varint(payload, pos)
+        values.append(value)
+    small_blind, big_blind, stack, to_call, pot, min_raise = values
+    stacks = array("q")
+    for _ in range(num_seats):
+        value, pos = _get_varint(payload, pos)
+        stacks.append(value)
+    count, pos = _get_varint(payload, pos)
+    log = array("q")
+    for _ in range(count):
+        packed, action_seat = payload[pos], payload[pos + 1]
+        amount, pos = _get_varint(payload, pos + 2)
+        log.extend((packed >> 4, action_seat, packed & 0x0F, amount))
+
+    return PlayerState(
+        name=name,
+        hand=[CARD_STRINGS[c] for c in hand],
+        community_cards=[CARD_STRINGS[c] for c in board],
+        stack=stack,
+        current_bet=to_call,
+        pot=pot,
+        min_raise=min_raise,
+        hand_ints=hand,
+        board_ints=board,
+        dead_mask=card_mask(hand) | card_mask(board),
+        seat=seat,
+        button=button,
+        num_seats=num_seats,
+        small_blind=small_blind,
+        big_blind=big_blind,
+        live_opponents=live_opponents,
+        all_in_count=all_in_count,
+        stacks=stacks,
+        action_log=log,
+    )
+
+
+def read_corpus(path: str) -> List[tuple]:
+    """
+    Load a corpus file.
+
+    Returns:
+        List of (street, payload) records; decode payloads with decode_state()
+    """
+    records = []
+    with gzip.open(path, "rb") as f:
+        header = f.read(len(MAGIC) + 1)
+        if header[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a decision corpus")
+        if header[len(MAGIC)] != VERSION:
+            raise ValueError(f"{path}: unsupported version {header[len(MAGIC)]}")
+        while True:
+            head = f.read(_RECORD_HEADER.size)
+            if len(head) < _RECORD_HEADER.size:
+                return records
+            street, length = _RECORD_HEADER.unpack(head)
+            records.append((street, f.read(length)))
+
+
+# =============================================================================
+# RECORDING
+# =============================================================================
+
+class _RecordingAgent(BaseAgent):
+    """Proxy that hands every state it sees to a CorpusRecorder, then lets the real bot act."""
+
+    def __init__(self, agent: BaseAgent, recorder: "CorpusRecorder"):
+        super().__init__(agent.name)
+        self.agent = agent
+        self.recorder = recorder
+
+    def act(self, state: PlayerState):
+        self.recorder.add(state)
+        return self.agent.act(state)
+
+
+class CorpusRecorder:
+    """
+    Keeps a uniform reservoir sample of encoded PlayerStates per street.
+
+    States are encoded when they are added, since the engine keeps updating
+    the PlayerState objects it hands out.
+
+    Args:
+        per_street: States kept per street (default: 2000)
+        seed: Seed of the reservoir sampling (default: 0)
+
+    Attributes:
+        seen: States offered per street
+        samples: Encoded states kept per street
+    """
+
+    def __init__(self, per_street: int = DEFAULT_PER_STREET, seed: int = 0):
+        self.per_street = per_street
+        self.seen = [0] * len(STREETS)
+        self.samples: List[List[bytes]] = [[] for _ in STREETS]
+        self._rng = random.Random(seed)
+
+    def wrap(self, bots: List[BaseAgent]) -> List[BaseAgent]:
+        """Recording proxies for a list of bots (seat these instead of the bots)."""
+        return [_RecordingAgent(bot, self) for bot in bots]
+
+    def add(self, state: PlayerState):
+        """Offer a state to the reservoir of its street."""
+        street = _STREET_OF_BOARD[len(state.board_ints)]
+        self.seen[street] += 1
+        sample = self.samples[street]
+        if len(sample) < self.per_street:
+            sample.append(encode_state(state))
+        else:
+            slot = self._rng.randrange(self.seen[street])
+            if slot < self.per_street:
+                sample[slot] = encode_state(state)
+
+    def save(self, path: str):
+        """Write the corpus file (gzip-compressed)."""
+        with gzip.open(path, "wb") as f:
+            f.write(MAGIC + bytes([VERSION]))
+            for street, sample in enumerate(self.samples):
+                for payload in sample:
+                    f.write(_RECORD_HEADER.pack(street, len(payload)))
+                    f.write(payload)
+
+
+def record_corpus(
+    bots: List[BaseAgent], path: str, simulations: int = 20, master_seed: int = 0,
+    per_street: int = DEFAULT_PER_STREET, table_size: int = 10, max_hands: int = 100,
+    time_control: Optional[TimeControl] = None,
+) -> CorpusRecorder:
+    """
+    Play seeded simulations and save a corpus of the states the bots acted on.
+
+    Args:
+        bots: Bots to play with (seated like the tournament runner does)
+        path: Corpus file to write
+        simulations: Simulations to play (default: 20)
+        master_seed: Seed for seating, tables and the reservoir (default: 0)
+        per_street: States kept per street (default: 2000)
+        table_size: Maximum players per table (default: 10)
+        max_hands: Hand limit per simulation (default: 100)
+        time_control: Thinking-time rules while recording (default: 3 s per action)
+
+    Returns:
+        The CorpusRecorder (its `seen` and `samples` describe the corpus)
+    """
+    recorder = CorpusRecorder(per_street, seed=master_seed)
+    proxies = recorder.wrap(bots)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):  # Bots' prints
+        for i in range(simulations):
+            seated = seat_bots(proxies, table_size, master_seed, i)
+            run_simulation(
+                seated, max_hands=max_hands, seed=derive_seed(master_seed, "simulation", i),
+                sink=NullSink(), time_control=time_control,
+            )
+    recorder.save(path)
+    return recorder
+
+
+# =============================================================================
+# REPLAY BENCHMARK
+# =============================================================================
+
+class _CrashCounter(EventSink):
+    """Counts the engine's "crashed" notices (everything else is dropped)."""
+    verbosity = Verbosity.SUMMARY
+
+    def __init__(self):
+        self.crashes = 0
+
+    def emit(self, event):
+        if isinstance(event, NoticeEvent) and " crashed: " in event.message:
+            self.crashes += 1
+
+
+def replay_bot(path: str, corpus_path: str, time_control: TimeControl, seed: int = 0) -> Dict:
+    """
+    Replay a corpus through one bot file (runs in a pool worker).
+
+    Every state goes through TexasHoldemEngine._get_action(), so the usual
+    time and memory limits, timeout fallback and per-seat random stream apply.
+
+    Returns:
+        {"bot", "file", "telemetry" (BotTelemetry), "actions" ({street: {action: count}}),
+        "crashes", "disqualified" (exceeded the memory limit; later calls fold),
+        "error" (None, or why the bot could not be loaded)}
+    """
+    sys.stdout = open(os.devnull, "w")  # Bots' prints would flood the report
+    agent = load_bot(path)
+    if agent is None:
+        return {"bot": os.path.basename(path)[:-3], "file": path, "telemetry": BotTelemetry(),
+                "actions": {}, "crashes": 0, "disqualified": False, "error": "no valid agent class"}
+
+    telemetry = BotTelemetry()
+    notices = _CrashCounter()
+    game = TexasHoldemEngine(sink=notices, seed=seed, time_control=time_control, telemetry=telemetry)
+    game.add_agent(agent)
+    seat = game.players[0]
+    actions = {street: dict.fromkeys(REPLAY_ACTIONS, 0) for street in range(len(STREETS))}
+    for street, payload in read_corpus(corpus_path):
+        state = decode_state(payload, agent.name)
+        game.street = street  # Telemetry is recorded per street
+        seat.stack = state.stack
+        action = game._get_action(seat, state)
+        name = getattr(getattr(action, "action_type", None), "name", "OTHER")
+        actions[street][name if name in actions[street] else "OTHER"] += 1
+    return {"bot": agent.name, "file": path, "telemetry": telemetry, "actions": actions,
+            "crashes": notices.crashes, "disqualified": seat.disqualified, "error": None}
+
+
+def bot_files(directories: List[str]) -> Iterator[str]:
+    """Bot files (*.py except __init__.py) of some directories, sorted per directory."""
+    for directory in directories:
+        if not os.path.isdir(directory):
+            continue
+        for filename in sorted(os.listdir(directory)):
+            if filename.endswith(".py") and filename != "__init__.py":
+                yield os.path.join(directory, filename)
+
+
+def replay_corpus(
+    corpus_path: str, directories: List[str], time_control: Optional[TimeControl] = None,
+    workers: Optional[int] = None, seed: int = 0,
+) -> List[Dict]:
+    """
+    Replay a corpus through every bot of some directories on a process pool.
+
+    Args:
+        corpus_path: File written by record_corpus
+        directories: Bot directories (e.g. ["bots", "bad_bots"])
+        time_control: Budget per decision (default: 3 s per action)
+        workers: Worker processes (default: os.cpu_count())
+        seed: Seed of the bots' random streams and the timeout fallback
+
+    Returns:
+        One replay_bot() result per bot file, in file order
+    """
+    time_control = time_control or TimeControl()
+    files = list(bot_files(directories))
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        futures = {pool.submit(replay_bot, path, corpus_path, time_control, seed): path for path in files}
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+    return [results[path] for path in files]
+
+
+def print_replay_report(results: List[Dict]):
+    """Per bot and street: latency percentiles, timeouts and the action mix (fold / call / raise)."""
+    print(f"  {'Bot':24} | {'Street':8} | {'Calls':>6} | {'p50 ms':>8} | {'p95 ms':>8} | {'p99 ms':>8} | "
+          f"{'max ms':>8} | {'Timeouts':>8} | {'Fold':>5} | {'Call':>5} | {'Raise':>5}")
+    for result in results:
+        if result["error"]:
+            print(f"  {result['bot']:24} | {result['error']}")
+            continue
+        for street, name in enumerate(STREETS):
+            stats = result["telemetry"].stats.get((result["bot"], street))
+            if stats is None:
+                continue
+            wall, counts = stats.wall, result["actions"][street]
+            total = max(1, sum(counts.values()))
+            mix = " | ".join(f"{counts[a] / total * 100:4.0f}%" for a in REPLAY_ACTIONS[:3])
+            print(f"  {result['bot']:24} | {name:8} | {wall.count:6} | {wall.quantile(0.5) * 1000:8.3f} | "
+                  f"{wall.quantile(0.95) * 1000:8.3f} | {wall.quantile(0.99) * 1000:8.3f} | "
+                  f"{wall.max * 1000:8.3f} | {stats.timeouts:8} | {mix}")
+        if result["crashes"] or result["disqualified"]:
+            print(f"  {result['bot']:24} | crashed {result['crashes']} times"
+                  + (", disqualified for exceeding the memory limit" if result["disqualified"] else ""))
+
+
+def replay_json(results: List[Dict]) -> List[Dict]:
+    """Replay results as JSON-ready rows (one per bot and street)."""
+    rows = []
+    for result in results:
+        for row in result["telemetry"].to_dict():
+            street = STREETS.index(row["street"])
+            row["file"] = result["file"]
+            row["actions"] = result["actions"][street]
+            rows.append(row)
+        if result["crashes"] or result["disqualified"]:
+            rows.append({"bot": result["bot"], "file": result["file"], "crashes": result["crashes"],
+                         "disqualified": result["disqualified"]})
+        if result["error"]:
+            rows.append({"bot": result["bot"], "file": result["file"], "error": result["error"]})
+    return rows
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Record a decision corpus and replay it through bots.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rec = commands.add_parser("record", help="play simulations and save the states bots acted on")
+    rec.add_argument("path", help="corpus file to write (e.g. corpus.pkdc)")
+    rec.add_argument("--bots-dir", default=os.path.join(PROJECT_DIR, "bots"),
+                     help="bots to play with (default: bots/)")
+    rec.add_argument("--simulations", type=int, default=20, help="simulations to play (default: 20)")
+    rec.add_argument("--per-street", type=int, default=DEFAULT_PER_STREET,
+                     help=f"states kept per street (default: {DEFAULT_PER_STREET})")
+    rec.add_argument("--max-hands", type=int, default=100, help="hand limit per simulation (default: 100)")
+    rec.add_argument("--time-per-action", type=float, default=3.0, metavar="SECONDS",
+                     help="time limit while recording (default: 3; 0 = no limit)")
+    rec.add_argument("--seed", type=int, default=0, help="master seed (default: 0)")
+
+    bench = commands.add_parser("bench", help="replay a corpus through every bot")
+    bench.add_argument("path", help="corpus file written by 'record'")
+    bench.add_argument("--bots-dir", nargs="+",
+                       default=[os.path.join(PROJECT_DIR, "bots"), os.path.join(PROJECT_DIR, "bad_bots")],
+                       help="bot directories (default: bots/ and bad_bots/)")
+    bench.add_argument("--time-per-action", type=float, default=3.0, metavar="SECONDS",
+                       help="budget per decision (default: 3; 0 = no limit)")
+    bench.add_argument("--workers", type=int, default=None, help="worker processes (default: number of CPUs)")
+    bench.add_argument("--seed", type=int, default=0, help="seed of the bots' random streams (default: 0)")
+    bench.add_argument("--json", default=None, metavar="PATH", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    try:
+        time_control = TimeControl(per_action=args.time_per_action or None)  # 0 = no limit
+    except ValueError as e:
+        parser.error(str(e))
+    if args.command == "record":
+        bots = load_bots(args.bots_dir)
+        if not bots:
+            print(f"No bots found in '{args.bots_dir}'.")
+            return 1
+        recorder = record_corpus(
+            bots, args.path, simulations=args.simulations, master_seed=args.seed,
+            per_street=args.per_street, max_hands=args.max_hands, time_control=time_control,
+        )
+        for street, name in enumerate(STREETS):
+            print(f"  {name:8}: kept {len(recorder.samples[street]):6} of {recorder.seen[street]:7} states")
+        print(f"Corpus written to {args.path} ({os.path.getsize(args.path)} bytes)")
+        return 0
+
+    results = replay_corpus(args.path, args.bots_dir, time_control, workers=args.workers, seed=args.seed)
+    print_replay_report(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(replay_json(results), f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,420 @@
+"""
+Equity Estimator Benchmark
+==========================
+
+Runs the bots' own Monte Carlo equity routines on a fixed set of spots and
+compares them with exact-enumeration ground truth. The result shows which
+approach buys the most accuracy per millisecond of the 3 s budget.
+
+Requires numpy (`pip install numpy`).
+
+Usage:
+    python -m poker_toolkit.equitybench                       # bots/, default sweep
+    python -m poker_toolkit.equitybench --levels 100 1000 --repeat 5 --json equity.json
+    python -m poker_toolkit.equitybench --truth-cache equity_truth.json   # reuse ground truth
+
+Routines are found by method name on every bot in the directory:
+    _calculate_monte_carlo        (wp_masterbot*, JohnnyDeep, malecki_bot, pm_goat1, ...)
+    calculate_multiplayer_equity  (kursa, mk_bot2, terminator, mg_terminator, ...)
+    _monte_carlo_simulation       (mb5)
+
+The call is adapted from the parameter names: cards go in as strings for
+*_strs parameters and as Treys ints otherwise. num_opponents gets the spot's
+opponent count. time_limit gets the full budget, so the iteration count
+decides the run time. The iteration count is swept (--levels) through an
+`iterations` argument or the bot's SIMULATION_COUNT / MONTE_CARLO_ITERATIONS
+attribute. Routines with neither run once, at their built-in count.
+Bots can cap or ignore that count (JohnnyDeep uses at most 100 samples, and
+a single one on the river), so the benchmark also counts the samples each
+call really drew: every routine evaluates our own hand once per sample, so
+those are the Evaluator.evaluate calls that include our hole cards. Rows
+whose sample count does not follow the requested count are flagged.
+Heads-up-only routines (no num_opponents) are only run on heads-up spots.
+poker_toolkit.equity.estimate_equity is benchmarked alongside them, as
+"poker_toolkit.estimate_equity".
+
+Ground truth enumerates every runout and every opponent holding, for one or
+two opponents on the flop, turn and river. Pre-flop spots and more opponents
+have no exact answer in reasonable time and are not in the set. A flop spot
+takes about a million hand evaluations (seconds to tens of seconds), so
+--truth-cache keeps the results between runs.
+
+"ms per 1% RMSE" is the time a routine would need for a root-mean-square
+error of one percentage point, assuming Monte Carlo error falls with
+1/sqrt(samples): ms x (RMSE / 0.01)^2. Lower is better, and it compares
+routines run at different sample counts. It uses the measured time and
+error only, so it holds for capped routines too; their rows at different
+requested counts are simply the same measurement repeated.
+"""
+
+import argparse
+import contextlib
+import inspect
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from typing import Dict, List, Optional
+
+import numpy as np
+from treys import Card, Evaluator
+
+from engine import FULL_DECK, derive_seed, load_bot
+from poker_toolkit import equity
+
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET = 3.0                              # Seconds per action in a tournament
+DEFAULT_LEVELS = (100, 300, 1000, 3000)   # Iteration counts swept
+ROUTINE_NAMES = ("_calculate_monte_carlo", "calculate_multiplayer_equity", "_monte_carlo_simulation")
+COUNT_ATTRIBUTES = ("SIMULATION_COUNT", "MONTE_CARLO_ITERATIONS")
+
+# (hole cards, board, opponents): made hands, draws and sets, heads-up and three-way
+SPOTS = [
+    ("Ah Kh", "Qh 7c 2h", 1),
+    ("Jc Td", "9h 8s 2c", 2),
+    ("As Qs", "Kd 7s 3s 2h", 1),
+    ("7h 7c", "Kc Qd 7s 2d", 2),
+    ("Ad 5d", "Kh Td 4d 9c", 1),
+    ("Kh Qh", "Ks 9d 4c 2h 7s", 1),
+    ("Tc Th", "Js 8d 4h 3c 2s", 2),
+    ("9s 8s", "Ac Kd 5h 5c Qs", 1),
+]
+
+
+def spot_key(spot: tuple) -> str:
+    """Text form of a spot, e.g. "Ah Kh | Qh 7c 2h | 1" (also the truth-cache key)."""
+    return f"{spot[0]} | {spot[1]} | {spot[2]}"
+
+
+# =============================================================================
+# GROUND TRUTH
+# =============================================================================
+
+def exact_equity(hand: List[int], board: List[int], opponents: int) -> float:
+    """
+    Exact pot share against random holdings, by enumerating every runout and
+    every opponent holding.
+
+    Ties split the pot between the tied players. For two opponents the
+    disjoint holding pairs are counted with matrix products: with w and t
+    the holdings that lose to and tie with us, the pot share summed over all
+    pairs is w.D.w + w.D.t + t.D.t / 3, where D marks pairs without a shared card.
+
+    Args:
+        hand: Hole cards (Treys ints)
+        board: 3 to 5 community cards (Treys ints)
+        opponents: 1 or 2
+
+    Returns:
+        Equity between 0 and 1
+    """
+    if opponents not in (1, 2) or len(board) < 3:
+        raise ValueError("exact enumeration needs a flop, turn or river and 1 or 2 opponents")
+    evaluate = Evaluator().evaluate
+    known = set(hand) | set(board)
+    stub = [c for c in FULL_DECK if c not in known]
+    holdings = np.array(list(combinations(range(len(stub)), 2)))
+    first, second = holdings[:, 0], holdings[:, 1]
+    if opponents == 2:
+        shared = ((first[:, None] == first[None, :]) | (first[:, None] == second[None, :])
+                  | (second[:, None] == first[None, :]) | (second[:, None] == second[None, :]))
+        disjoint = (~shared).astype(np.float64)
+
+    share = 0.0
+    count = 0.0
+    scores = np.zeros(len(holdings), dtype=np.int64)
+    for runout in combinations(range(len(stub)), 5 - len(board)):
+        full_board = board + [stub[i] for i in runout]
+        hero = evaluate(full_board, hand)
+        valid = ~np.isin(first, runout) & ~np.isin(second, runout)
+        for k in np.flatnonzero(valid):
+            scores[k] = evaluate(full_board, [stub[first[k]], stub[second[k]]])
+        worse = (valid & (scores > hero)).astype(np.float64)  # Treys: lower score = better hand
+        tied = (valid & (scores == hero)).astype(np.float64)
+        if opponents == 1:
+            share += worse.sum() + tied.sum() / 2
+            count += valid.sum()
+        else:
+            v = valid.astype(np.float64)
+            d_tied = disjoint @ tied
+            share += worse @ (disjoint @ worse) + worse @ d_tied + tied @ d_tied / 3
+            count += v @ (disjoint @ v)
+    return share / count
+
+
+def _truth_task(spot: tuple) -> float:
+    hand, board, opponents = spot
+    return exact_equity([Card.new(c) for c in hand.split()], [Card.new(c) for c in board.split()], opponents)
+
+
+def ground_truth(spots: List[tuple], pool: ProcessPoolExecutor, cache: Optional[str] = None) -> Dict[str, float]:
+    """Exact equity of every spot ({spot_key: equity}), from the cache file where possible."""
+    truth = {}
+    if cache and os.path.exists(cache):
+        with open(cache) as f:
+            truth = json.load(f)
+    missing = [spot for spot in spots if spot_key(spot) not in truth]
+    for spot, exact in zip(missing, pool.map(_truth_task, missing)):
+        truth[spot_key(spot)] = exact
+    if cache and missing:
+        with open(cache, "w") as f:
+            json.dump(truth, f, indent=2)
+    return truth
+
+
+# =============================================================================
+# BOT ROUTINES
+# =============================================================================
+
+class _SampleCounter:
+    """
+    Counts the Evaluator.evaluate calls that include one of our hole cards,
+    i.e. the samples a routine drew, while counting() is active.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    @contextlib.contextmanager
+    def counting(self, card: int):
+        """
+        Wrap Evaluator.evaluate for one routine call (bots look it up on every
+        call, or once per routine call); the original is always restored.
+        """
+        self.count = 0
+        original = Evaluator.evaluate
+
+        def evaluate(evaluator, hand, board):
+            if card in hand or card in board:  # Bots pass (board, hand) too
+                self.count += 1
+            return original(evaluator, hand, board)
+
+        Evaluator.evaluate = evaluate
+        try:
+            yield self
+        finally:
+            Evaluator.evaluate = original
+
+
+_SAMPLES = _SampleCounter()
+
+
+class EquityRoutine:
+    """
+    One bot's equity routine, callable as routine(hand, board, opponents, iterations).
+
+    Args:
+        bot: Loaded bot
+        method: Name of the routine (one of ROUTINE_NAMES)
+
+    Attributes:
+        name: "<bot>.<method>"
+        multiway: Takes the number of opponents (otherwise heads-up only)
+        knob: How the iteration count is set: "iterations" (argument), an
+              attribute name, or None (fixed in the code)
+        default: The bot's own iteration count (None if fixed in the code)
+    """
+
+    def __init__(self, bot, method: str):
+        self.bot = bot
+        self.name = f"{bot.name}.{method}"
+        self.method = getattr(bot, method)
+        params = inspect.signature(self.method).parameters
+        names = list(params)
+        self.strings = names[0].endswith("strs")
+        self.multiway = "num_opponents" in params
+        self.timed = "time_limit" in params
+        if "iterations" in params:
+            self.knob = "iterations"
+            self.default = params["iterations"].default
+        else:
+            self.knob = next((a for a in COUNT_ATTRIBUTES if hasattr(bot, a)), None)
+            self.default = getattr(bot, self.knob) if self.knob else None
+
+    def __call__(self, hand: List[str], board: List[str], opponents: int, iterations: Optional[int]) -> float:
+        cards = (hand, board) if self.strings else ([Card.new(c) for c in hand], [Card.new(c) for c in board])
+        kwargs = {}
+        if self.multiway:
+            kwargs["num_opponents"] = opponents
+        if self.timed:
+            kwargs["time_limit"] = BUDGET
+        if self.knob == "iterations":
+            kwargs["iterations"] = iterations
+        elif self.knob is not None:
+            setattr(self.bot, self.knob, iterations)
+        return self.method(*cards, **kwargs)
+
+
+def find_routines(bot) -> List[EquityRoutine]:
+    """The equity routines (ROUTINE_NAMES) a bot has."""
+    return [EquityRoutine(bot, method) for method in ROUTINE_NAMES if callable(getattr(bot, method, None))]
+
+
+def run_routine(routine: EquityRoutine, spots: List[tuple], truth: Dict[str, float], levels: List[int],
+                repeat: int, seed: int = 0) -> List[Dict]:
+    """
+    Time one routine at every iteration level on every spot it supports.
+
+    Returns:
+        One row per (level, spot): routine, iterations, spot, truth, the
+        estimates, their absolute errors, the seconds and the samples drawn per call
+    """
+    rows = []
+    sweep = sorted(set(levels) | {routine.default}) if routine.knob else [None]
+    for iterations in sweep:
+        for index, spot in enumerate(spots):
+            hand, board, opponents = spot
+            if opponents > 1 and not routine.multiway:
+                continue
+            exact = truth[spot_key(spot)]
+            estimates, seconds, samples = [], [], []
+            for rep in range(repeat):
+                random.seed(derive_seed(seed, routine.name, index, iterations or 0, rep))
+                with _SAMPLES.counting(Card.new(hand.split()[0])):
+                    start = time.perf_counter()
+                    estimates.append(routine(hand.split(), board.split(), opponents, iterations))
+                    seconds.append(time.perf_counter() - start)
+                samples.append(_SAMPLES.count)
+            rows.append({
+                "routine": routine.name, "iterations": iterations, "spot": spot_key(spot),
+                "opponents": opponents, "truth": exact, "estimates": estimates,
+                "errors": [abs(e - exact) for e in estimates], "seconds": seconds, "samples": samples,
+            })
+    return rows
+
+
+class _LibraryEquity:
+    """poker_toolkit.equity, shaped like a bot's routine so EquityRoutine can call it."""
+    name = "poker_toolkit"
+
+    def estimate_equity(self, hand, community_cards, num_opponents=1, iterations=equity.DEFAULT_SAMPLES):
+        _SAMPLES.count += iterations  # Evaluates in NumPy, not through Evaluator; no deadline, so all drawn
+        return equity.estimate_equity(hand, community_cards, num_opponents, samples=iterations)[0]
+
+
+def _library_task(spots: List[tuple], truth: Dict[str, float], levels: List[int],
+                  repeat: int, seed: int) -> List[Dict]:
+    equity.build_tables()  # Built once per process: not part of the timings
+    return run_routine(EquityRoutine(_LibraryEquity(), "estimate_equity"), spots, truth, levels, repeat, seed)
+
+
+def _bot_task(path: str, spots: List[tuple], truth: Dict[str, float], levels: List[int],
+              repeat: int, seed: int) -> List[Dict]:
+    sys.stdout = open(os.devnull, "w")  # Bots' prints would flood the report
+    bot = load_bot(path)
+    if bot is None:
+        return []
+    rows = []
+    for routine in find_routines(bot):
+        rows.extend(run_routine(routine, spots, truth, levels, repeat, seed))
+    return rows
+
+
+# =============================================================================
+# REPORT
+# =============================================================================
+
+def summarize(rows: List[Dict]) -> List[Dict]:
+    """
+    Aggregate the rows per routine and iteration level.
+
+    Returns:
+        Rows with routine, iterations (requested), samples (mean drawn per
+        call), note ("fixed" if the count cannot be set, "ignores count" if
+        the samples drawn do not follow it), spots, ms (mean per call),
+        max_ms, mae, rmse, heads-up / multiway mae, and ms_per_1pct (see
+        module docstring), fastest to 1% RMSE first
+    """
+    groups: Dict[tuple, List[Dict]] = {}
+    for row in rows:
+        groups.setdefault((row["routine"], row["iterations"]), []).append(row)
+    summary = []
+    for (routine, iterations), group in groups.items():
+        errors = np.array([e for row in group for e in row["errors"]])
+        seconds = np.array([s for row in group for s in row["seconds"]])
+        by_table = {}
+        for multiway in (False, True):
+            table = [e for row in group if (row["opponents"] > 1) == multiway for e in row["errors"]]
+            by_table[multiway] = float(np.mean(table)) if table else None
+        rmse = float(np.sqrt(np.mean(errors ** 2)))
+        ms = float(seconds.mean() * 1000)
+        samples = float(np.mean([n for row in group for n in row["samples"]]))
+        if iterations is None:
+            note = "fixed"
+        elif abs(samples - iterations) > 0.1 * iterations:
+            note = "ignores count"
+        else:
+            note = ""
+        summary.append({
+            "routine": routine, "iterations": iterations, "samples": samples, "note": note, "spots": len(group),
+            "ms": ms, "max_ms": float(seconds.max() * 1000),
+            "mae": float(errors.mean()), "rmse": rmse,
+            "mae_heads_up": by_table[False], "mae_multiway": by_table[True],
+            "ms_per_1pct": ms * (rmse / 0.01) ** 2,
+        })
+    summary.sort(key=lambda r: r["ms_per_1pct"])
+    return summary
+
+
+def print_report(summary: List[Dict]):
+    """Table of error against time per routine and level, best accuracy per ms first."""
+    def pct(value):
+        return f"{value * 100:6.2f}" if value is not None else f"{'-':>6}"
+
+    print(f"  {'Routine':48} | {'Iters':>6} | {'Samples':>8} | {'ms/call':>8} | {'max ms':>8} | {'MAE %':>6} | "
+          f"{'RMSE %':>6} | {'HU %':>6} | {'Multi %':>7} | {'ms per 1% RMSE':>14}")
+    for r in summary:
+        iterations = r["iterations"] if r["iterations"] is not None else "-"
+        notes = [r["note"]] if r["note"] else []
+        if r["max_ms"] > BUDGET * 1000:
+            notes.append("over budget")
+        print(f"  {r['routine']:48} | {iterations:>6} | {r['samples']:8.0f} | {r['ms']:8.2f} | {r['max_ms']:8.2f} | {pct(r['mae'])} | "
+              f"{pct(r['rmse'])} | {pct(r['mae_heads_up'])} | {pct(r['mae_multiway']):>7} | "
+              f"{r['ms_per_1pct']:14.1f}  {', '.join(notes)}")
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Bots' equity routines: error against time, versus exact equity.")
+    parser.add_argument("--bots-dir", default=os.path.join(PROJECT_DIR, "bots"),
+                        help="directory of bots to scan for equity routines (default: bots/)")
+    parser.add_argument("--levels", type=int, nargs="+", default=list(DEFAULT_LEVELS),
+                        help="iteration counts to sweep (default: 100 300 1000 3000; "
+                             "each bot's own count is added)")
+    parser.add_argument("--repeat", type=int, default=3, help="calls per spot and level (default: 3)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: number of CPUs)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the routines' random draws (default: 0)")
+    parser.add_argument("--truth-cache", default=None, metavar="PATH",
+                        help="JSON file to read and store the exact equities in")
+    parser.add_argument("--json", default=None, metavar="PATH",
+                        help="also write the summary and every measurement to this file (e.g. for plotting)")
+    args = parser.parse_args(argv)
+
+    paths = [os.path.join(args.bots_dir, f) for f in sorted(os.listdir(args.bots_dir))
+             if f.endswith(".py") and f != "__init__.py"]
+    with ProcessPoolExecutor(max_workers=args.workers or os.cpu_count() or 1) as pool:
+        print(f"Exact equity of {len(SPOTS)} spots...")
+        truth = ground_truth(SPOTS, pool, args.truth_cache)
+        print(f"Timing the equity routines of {len(paths)} bots...")
+        futures = [pool.submit(_bot_task, path, SPOTS, truth, args.levels, args.repeat, args.seed)
+                   for path in paths]
+        futures.append(pool.submit(_library_task, SPOTS, truth, args.levels, args.repeat, args.seed))
+        rows = [row for future in futures for row in future.result()]
+
+    if not rows:
+        print(f"No equity routines found in '{args.bots_dir}'.")
+        return 1
+    summary = summarize(rows)
+    print_report(summary)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"truth": truth, "summary": summary, "measurements": rows}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
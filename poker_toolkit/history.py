@@ -0,0 +1,564 @@
+"""
+Streaming History Parser and Index
+==================================
+
+Reads hand histories one hand at a time - without loading the whole file -
+from either the classic text log (history.txt, per-simulation .txt logs) or
+the binary format of poker_toolkit.binhistory (*.phh).
+
+A sidecar index (`<log>.idx`) stores the byte offset of every hand together
+with its simulation, hand number, the bots involved, the final street and the
+pot, so lookups such as "all showdowns involving JohnnyDeep" or "all pots over
+2000" seek straight to the matching hands through mmap.
+
+Usage:
+    for hand in iter_hands("history.txt"):
+        ...
+
+    index = open_index("history.txt")             # builds or refreshes history.txt.idx
+    for hand in index.hands(bot="JohnnyDeep", showdown=True, min_pot=2000):
+        print(hand.simulation, hand.hand_number, hand.pot)
+
+    python -m poker_toolkit.history history.txt --bot JohnnyDeep --showdown --min-pot 2000
+"""
+
+import argparse
+import array
+import ast
+import gzip
+import json
+import mmap
+import os
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional
+
+from treys import Card
+
+from engine import ActionEvent, ShowdownEvent, StacksEvent, StreetEvent, WinEvent, hand_description
+from poker_toolkit import binhistory
+
+
+STREETS = ["Pre-Flop", "Flop", "Turn", "River"]
+
+
+# =============================================================================
+# PARSED HAND
+# =============================================================================
+
+@dataclass
+class ParsedHand:
+    """
+    One hand read from a history file (text or binary).
+
+    Attributes:
+        simulation: Simulation (table) number, 0 if the log has none
+        hand_number: Hand number within the simulation (1-based)
+        button: Name of the player on the button
+        board: Community cards as strings (e.g. ['Td', '8s', '8c'])
+        actions: (street, player, action, amount, pot) tuples; action is
+                 'FOLD', 'CHECK', 'CALL' or 'RAISE'
+        showdown: (player, hole cards, hand description) for every hand shown
+        wins: (player, amount, method) - method is 'Fold' or 'Showdown'
+        stacks: (player, stack) for every seat at the end of the hand
+        final_street: Last street reached ('Pre-Flop' ... 'River')
+        pot: Chips in the pot at the end of the hand
+        offset: Byte offset of the hand in the file (None for gzip files)
+        length: Length of the hand in bytes
+    """
+    simulation: int = 0
+    hand_number: int = 0
+    button: str = ""
+    board: List[str] = field(default_factory=list)
+    actions: List[tuple] = field(default_factory=list)
+    showdown: List[tuple] = field(default_factory=list)
+    wins: List[tuple] = field(default_factory=list)
+    stacks: List[tuple] = field(default_factory=list)
+    final_street: str = "Pre-Flop"
+    pot: int = 0
+    offset: Optional[int] = None
+    length: int = 0
+
+    @property
+    def players(self) -> List[str]:
+        """Players who took part in the hand (acted, showed or won), in order of appearance."""
+        names = {}
+        for action in self.actions:
+            names[action[1]] = True
+        for shown in self.showdown:
+            names[shown[0]] = True
+        for win in self.wins:
+            names[win[0]] = True
+        return list(names)
+
+
+# =============================================================================
+# TEXT FORMAT
+# =============================================================================
+
+def _parse_text_lines(lines: List[str], hand: ParsedHand) -> ParsedHand:
+    """Fill a ParsedHand from the text lines of one hand (unknown lines are ignored)."""
+    in_stacks = False
+    for raw in lines:
+        line = raw.strip()
+        if not line:
+            continue
+        if line.startswith("=== New Hand (Button: ") and line.endswith(") ==="):
+            hand.button = line[len("=== New Hand (Button: "):-len(") ===")]
+        elif line.startswith("--- ") and line.endswith(" ---"):
+            header = line[4:-4]
+            in_stacks = header == "Player Stacks"
+            street, _, board = header.partition(": ")
+            if street in STREETS:
+                hand.final_street = street
+                if board:
+                    hand.board = ast.literal_eval(board)
+        elif in_stacks:
+            name, _, rest = line.rpartition(": ")
+            if name and rest:
+                hand.stacks.append((name, int(rest.split(" ")[0])))
+        elif line.startswith("[Pot: ") and line.endswith("]"):
+            hand.pot = int(line[6:-1])
+            if hand.actions and hand.actions[-1][4] is None:
+                hand.actions[-1] = hand.actions[-1][:4] + (hand.pot,)
+        elif line.endswith(" Folds."):
+            hand.actions.append((hand.final_street, line[:-7], "FOLD", 0, None))
+        elif line.endswith(" Checks."):
+            hand.actions.append((hand.final_street, line[:-8], "CHECK", 0, None))
+        elif " Calls " in line and line.endswith("."):
+            name, _, amount = line[:-1].rpartition(" Calls ")
+            hand.actions.append((hand.final_street, name, "CALL", int(amount), None))
+        elif " Raises to " in line and line.endswith("."):
+            name, _, amount = line[:-1].rpartition(" Raises to ")
+            hand.actions.append((hand.final_street, name, "RAISE", int(amount), None))
+        elif " shows [" in line:
+            name, _, rest = line.partition(" shows ")
+            cards, _, desc = rest.partition("] (")
+            hand.showdown.append((name, ast.literal_eval(cards + "]"), desc.rstrip(")")))
+        elif line.startswith("*** ") and line.endswith(" ***") and " WINS " in line:
+            name, _, amount = line[4:-4].rpartition(" WINS ")
+            hand.wins.append((name, int(amount), "Showdown"))
+        elif line.startswith("Winner by fold: "):
+            name, _, amount = line[len("Winner by fold: "):].rpartition(" wins ")
+            hand.wins.append((name, int(amount), "Fold"))
+    hand.pot = max(hand.pot, sum(w[1] for w in hand.wins))
+    return hand
+
+
+def _ends_hand(line: str) -> bool:
+    """True for lines that are not part of a hand (simulation and tournament output)."""
+    return (
+        line.startswith("===")
+        or line.startswith("--- Simulation ")
+        or line.startswith("Final standings:")
+    )
+
+
+def _simulation_number(line: str) -> Optional[int]:
+    """Simulation number from a '--- Simulation 3/10 ---' or '--- Simulation 3 ---' line."""
+    if line.startswith("--- Simulation ") and line.endswith(" ---"):
+        number = line[len("--- Simulation "):-4].split("/")[0]
+        if number.isdigit():
+            return int(number)
+    return None
+
+
+def iter_text_hands(path: str) -> Iterator[ParsedHand]:
+    """
+    Yield the hands of a text history one at a time, with their byte offsets.
+
+    Args:
+        path: history.txt-style log (gzip-compressed logs are read too, but
+              their hands have no usable offset)
+    """
+    compressed = is_gzip(path)
+    opener = gzip.open if compressed else open
+    simulation = 0
+    hand_number = 0
+    hand_lines: List[str] = []
+    hand_start = 0
+    hand_end = 0
+    pos = 0
+
+    def finish():
+        hand = ParsedHand(simulation=simulation, hand_number=hand_number)
+        if not compressed:
+            hand.offset = hand_start
+        hand.length = hand_end - hand_start
+        return _parse_text_lines(hand_lines, hand)
+
+    with opener(path, "rb") as f:
+        for raw in f:
+            line = raw.decode("utf-8", errors="replace").rstrip("\r\n")
+            start = pos
+            pos += len(raw)
+
+            if line.startswith("=== New Hand"):
+                if hand_lines:
+                    yield finish()
+                hand_number += 1
+                hand_lines = [line]
+                hand_start = start
+                hand_end = pos
+            elif _ends_hand(line):
+                if hand_lines:
+                    yield finish()
+                    hand_lines = []
+                sim = _simulation_number(line)
+                if sim is not None:
+                    simulation = sim
+                    hand_number = 0
+            elif hand_lines:
+                hand_lines.append(line)
+                if line.strip():
+                    hand_end = pos
+    if hand_lines:
+        yield finish()
+
+
+# =============================================================================
+# BINARY FORMAT
+# =============================================================================
+
+def _parsed_from_record(record: binhistory.HandRecord) -> ParsedHand:
+    """Convert a binary HandRecord into a ParsedHand (pots are replayed)."""
+    hand = ParsedHand(
+        simulation=record.table_id,
+        hand_number=record.hand_number,
+        button=record.players[record.button],
+        board=[Card.int_to_str(c) for c in record.board],
+    )
+    street = "Pre-Flop"
+    for event in binhistory.hand_events(record):
+        if isinstance(event, StreetEvent):
+            street = event.street
+            hand.final_street = street
+        elif isinstance(event, ActionEvent):
+            hand.actions.append((street, event.player, event.action, event.amount, event.pot))
+            hand.pot = event.pot
+        elif isinstance(event, ShowdownEvent):
+            hand.showdown = [
+                (name, [Card.int_to_str(c) for c in cards], hand_description(score))
+                for name, cards, score in event.hands
+            ]
+        elif isinstance(event, WinEvent):
+            hand.wins.append((event.player, event.amount, event.method))
+        elif isinstance(event, StacksEvent):
+            hand.stacks = [(name, stack) for name, stack, _ in event.stacks]
+    hand.pot = max(hand.pot, sum(w[1] for w in hand.wins))
+    return hand
+
+
+def iter_binary_hands(path: str, names: Optional[Dict[int, str]] = None) -> Iterator[ParsedHand]:
+    """
+    Yield the hands of a binary history one at a time.
+
+    Uncompressed files are memory-mapped (and hands get their byte offsets);
+    gzip-compressed files are streamed with binhistory.read_hands.
+
+    Args:
+        path: Binary history file
+        names: Optional dict that receives the file's name ids (uncompressed files)
+    """
+    if is_gzip(path):
+        for record in binhistory.read_hands(path):
+            yield _parsed_from_record(record)
+        return
+
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        for offset, length, record in binhistory.iter_hand_records(data, names):
+            hand = _parsed_from_record(record)
+            hand.offset = offset
+            hand.length = length
+            yield hand
+
+
+# =============================================================================
+# FORMAT DETECTION
+# =============================================================================
+
+def is_gzip(path: str) -> bool:
+    """True if the file is gzip-compressed."""
+    with open(path, "rb") as f:
+        return f.read(2) == b"\x1f\x8b"
+
+
+def is_binary_history(path: str) -> bool:
+    """True if the file is a binary hand history (plain or gzip-compressed)."""
+    with binhistory.open_history(path) as f:
+        return f.read(len(binhistory.MAGIC)) == binhistory.MAGIC
+
+
+def iter_hands(path: str) -> Iterator[ParsedHand]:
+    """
+    Yield the hands of any history file one at a time (format auto-detected).
+
+    Args:
+        path: Text log (history.txt, *.txt, *.txt.gz) or binary history (*.phh, *.phh.gz)
+    """
+    if is_binary_history(path):
+        return iter_binary_hands(path)
+    return iter_text_hands(path)
+
+
+# =============================================================================
+# SIDECAR INDEX
+# =============================================================================
+
+# Index columns: name -> array typecode
+_COLUMNS = {
+    "offset": "Q",
+    "length": "I",
+    "simulation": "I",
+    "hand_number": "I",
+    "street": "B",        # index into STREETS
+    "showdown": "B",      # 1 if the hand went to showdown
+    "pot": "Q",
+    "player_ptr": "I",    # players of hand i are player_ids[player_ptr[i]:player_ptr[i+1]]
+    "player_ids": "H",
+    "shown_ptr": "I",     # same layout for the players who showed down
+    "shown_ids": "H",
+}
+INDEX_VERSION = 1
+
+
+class HistoryIndex:
+    """
+    Column index over the hands of one (uncompressed) history file.
+
+    Attributes:
+        path: The indexed history file
+        format: "text" or "binary"
+        names: Bot names; player_ids/shown_ids index into it
+        columns: {column name: array.array} (see _COLUMNS)
+    """
+
+    def __init__(self, path: str, fmt: str, names: List[str], columns: Dict[str, array.array],
+                 binary_names: Optional[Dict[int, str]] = None):
+        self.path = path
+        self.format = fmt
+        self.names = names
+        self.columns = columns
+        self.binary_names = binary_names or {}  # Binary files: the file's own name ids
+
+    def __len__(self):
+        return len(self.columns["offset"])
+
+    # -------------------------------------------------------------------------
+    # Building, saving and loading
+    # -------------------------------------------------------------------------
+
+    @classmethod
+    def build(cls, path: str) -> "HistoryIndex":
+        """Scan a history file once and index every hand."""
+        if is_gzip(path):
+            raise ValueError("Only uncompressed history files can be indexed")
+        fmt = "binary" if is_binary_history(path) else "text"
+        columns = {name: array.array(code) for name, code in _COLUMNS.items()}
+        columns["player_ptr"].append(0)
+        columns["shown_ptr"].append(0)
+        name_ids: Dict[str, int] = {}
+
+        def name_id(name):
+            if name not in name_ids:
+                name_ids[name] = len(name_ids)
+            return name_ids[name]
+
+        binary_names: Dict[int, str] = {}
+        hands = iter_binary_hands(path, binary_names) if fmt == "binary" else iter_text_hands(path)
+        for hand in hands:
+            columns["offset"].append(hand.offset)
+            columns["length"].append(hand.length)
+            columns["simulation"].append(hand.simulation)
+            columns["hand_number"].append(hand.hand_number)
+            columns["street"].append(STREETS.index(hand.final_street))
+            columns["showdown"].append(1 if hand.showdown else 0)
+            columns["pot"].append(hand.pot)
+            columns["player_ids"].extend(name_id(n) for n in hand.players)
+            columns["player_ptr"].append(len(columns["player_ids"]))
+            columns["shown_ids"].extend(name_id(s[0]) for s in hand.showdown)
+            columns["shown_ptr"].append(len(columns["shown_ids"]))
+
+        names = sorted(name_ids, key=name_ids.get)
+        return cls(path, fmt, names, columns, binary_names)
+
+    def save(self, index_path: Optional[str] = None):
+        """
+        Write the index: one JSON header line, then the raw column arrays.
+
+        Args:
+            index_path: Where to write (default: "<history file>.idx")
+        """
+        stat = os.stat(self.path)
+        header = {
+            "version": INDEX_VERSION,
+            "format": self.format,
+            "source_size": stat.st_size,
+            "source_mtime_ns": stat.st_mtime_ns,
+            "names": self.names,
+            "binary_names": {str(k): v for k, v in self.binary_names.items()},
+            "lengths": {name: len(col) for name, col in self.columns.items()},
+        }
+        with open(index_path or self.path + ".idx", "wb") as f:
+            f.write(json.dumps(header).encode("utf-8") + b"\n")
+            for name in _COLUMNS:
+                self.columns[name].tofile(f)
+
+    @classmethod
+    def load(cls, path: str, index_path: Optional[str] = None) -> Optional["HistoryIndex"]:
+        """
+        Load the index of a history file.
+
+        Returns:
+            The index, or None if it is missing or out of date
+        """
+        index_path = index_path or path + ".idx"
+        if not os.path.exists(index_path):
+            return None
+        stat = os.stat(path)
+        with open(index_path, "rb") as f:
+            header = json.loads(f.readline())
+            if (header.get("version") != INDEX_VERSION
+                    or header["source_size"] != stat.st_size
+                    or header["source_mtime_ns"] != stat.st_mtime_ns):
+                return None
+            columns = {}
+            for name, code in _COLUMNS.items():
+                col = array.array(code)
+                col.fromfile(f, header["lengths"][name])
+                columns[name] = col
+        binary_names = {int(k): v for k, v in header["binary_names"].items()}
+        return cls(path, header["format"], header["names"], columns, binary_names)
+
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+
+    def find(
+        self,
+        simulation: Optional[int] = None,
+        hand_number: Optional[int] = None,
+        bot: Optional[str] = None,
+        showdown: Optional[bool] = None,
+        street: Optional[str] = None,
+        min_pot: Optional[int] = None,
+        max_pot: Optional[int] = None,
+    ) -> List[int]:
+        """
+        Positions (row numbers) of the hands matching every given condition.
+
+        Args:
+            simulation: Simulation number
+            hand_number: Hand number within the simulation
+            bot: Bot that took part (with showdown=True: that showed down)
+            showdown: True/False to keep only hands with/without a showdown
+            street: Final street ('Pre-Flop', 'Flop', 'Turn' or 'River')
+            min_pot: Minimum final pot
+            max_pot: Maximum final pot
+        """
+        cols = self.columns
+        rows = range(len(self))
+        if simulation is not None:
+            rows = [i for i in rows if cols["simulation"][i] == simulation]
+        if hand_number is not None:
+            rows = [i for i in rows if cols["hand_number"][i] == hand_number]
+        if showdown is not None:
+            rows = [i for i in rows if cols["showdown"][i] == int(showdown)]
+        if street is not None:
+            code = STREETS.index(street)
+            rows = [i for i in rows if cols["street"][i] == code]
+        if min_pot is not None:
+            rows = [i for i in rows if cols["pot"][i] >= min_pot]
+        if max_pot is not None:
+            rows = [i for i in rows if cols["pot"][i] <= max_pot]
+        if bot is not None:
+            if bot not in self.names:
+                return []
+            bot_id = self.names.index(bot)
+            prefix = "shown" if showdown else "player"
+            ptr, ids = cols[prefix + "_ptr"], cols[prefix + "_ids"]
+            rows = [i for i in rows if bot_id in ids[ptr[i]:ptr[i + 1]]]
+        return list(rows)
+
+    def hands(self, **conditions) -> Iterator[ParsedHand]:
+        """Yield the matching hands (see find), reading only their bytes through mmap."""
+        rows = self.find(**conditions)
+        if not rows:
+            return
+        with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for i in rows:
+                yield self._read_hand(data, i)
+
+    def raw(self, row: int, data) -> bytes:
+        """Bytes of one indexed hand, from an mmap (or bytes) of the history file."""
+        offset = self.columns["offset"][row]
+        return data[offset:offset + self.columns["length"][row]]
+
+    def _read_hand(self, data, row: int) -> ParsedHand:
+        """Decode one indexed hand."""
+        offset = self.columns["offset"][row]
+        length = self.columns["length"][row]
+        chunk = self.raw(row, data)
+        if self.format == "binary":
+            hand = _parsed_from_record(binhistory.decode_record(chunk, self.binary_names))
+        else:
+            hand = ParsedHand(
+                simulation=self.columns["simulation"][row],
+                hand_number=self.columns["hand_number"][row],
+            )
+            _parse_text_lines(chunk.decode("utf-8", errors="replace").splitlines(), hand)
+        hand.offset = offset
+        hand.length = length
+        return hand
+
+
+def open_index(path: str, rebuild: bool = False) -> HistoryIndex:
+    """
+    Load the sidecar index of a history file, building (and saving) it if it
+    is missing, out of date, or rebuild is set.
+    """
+    index = None if rebuild else HistoryIndex.load(path)
+    if index is None:
+        index = HistoryIndex.build(path)
+        index.save()
+    return index
+
+
+def main(argv=None):
+    """Command-line lookup: print the matching hands."""
+    parser = argparse.ArgumentParser(description="Query a hand history through its sidecar index.")
+    parser.add_argument("path", help="history file (text or binary, uncompressed)")
+    parser.add_argument("--simulation", type=int, default=None)
+    parser.add_argument("--hand", type=int, default=None, help="hand number within the simulation")
+    parser.add_argument("--bot", default=None, help="bot that took part (with --showdown: showed down)")
+    parser.add_argument("--showdown", action="store_true", help="only hands that went to showdown")
+    parser.add_argument("--street", choices=STREETS, default=None, help="final street")
+    parser.add_argument("--min-pot", type=int, default=None)
+    parser.add_argument("--max-pot", type=int, default=None)
+    parser.add_argument("--count", action="store_true", help="only print the number of matches")
+    parser.add_argument("--rebuild", action="store_true", help="rebuild the index first")
+    args = parser.parse_args(argv)
+
+    index = open_index(args.path, rebuild=args.rebuild)
+    conditions = dict(
+        simulation=args.simulation, hand_number=args.hand, bot=args.bot,
+        showdown=True if args.showdown else None, street=args.street,
+        min_pot=args.min_pot, max_pot=args.max_pot,
+    )
+    if args.count:
+        print(len(index.find(**conditions)))
+        return
+
+    rows = index.find(**conditions)
+    with open(args.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        for row in rows:
+            print(f"# simulation {index.columns['simulation'][row]}, hand {index.columns['hand_number'][row]}")
+            if index.format == "binary":
+                record = binhistory.decode_record(index.raw(row, data), index.binary_names)
+                sys.stdout.write(binhistory.format_hand(record))
+            else:
+                sys.stdout.write(index.raw(row, data).decode("utf-8", errors="replace") + "\n")
+
+
+if __name__ == "__main__":
+    main()
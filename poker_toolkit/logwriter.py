@@ -0,0 +1,229 @@
+"""
+Background Log Writer
+=====================
+
+A hand-history writer that never blocks the betting loop. Text and game
+events are put on a queue; a background thread formats them, writes them in
+large batches, rotates files by size (or on request, e.g. once per
+simulation) and can gzip-compress them as a stream.
+
+Usage:
+    writer = BackgroundLogWriter("logs/history.txt", max_bytes=50_000_000, compress=True)
+    game = TexasHoldemEngine(sink=writer)      # as an event sink...
+    sys.stdout = writer                        # ...or as a file-like stdout
+    ...
+    writer.rotate()                            # start a new file (e.g. per simulation)
+    writer.close()
+
+The first file is the base path itself, later ones get a running number:
+    logs/history.txt.gz, logs/history.2.txt.gz, logs/history.3.txt.gz, ...
+"""
+
+import gzip
+import os
+import queue
+import threading
+from typing import Optional
+
+from engine import EventSink, GameEvent, Verbosity
+
+
+# Control records understood by the writer thread
+_ROTATE = object()
+_FLUSH = object()
+_STOP = object()
+
+
+class BackgroundLogWriter(EventSink):
+    """
+    Queue-backed log writer with a dedicated writer thread.
+
+    It is both a file-like object (write/flush, so it can replace sys.stdout)
+    and an EventSink (events are formatted on the writer thread, not in the
+    engine).
+
+    Args:
+        path: Base path of the log files (e.g. "history.txt")
+        max_bytes: Start a new file once the current one reaches this size on
+                   disk, checked before each batch, so a part can exceed it by
+                   at most one batch (default: None, no size-based rotation)
+        max_files: Keep only the newest N files, deleting older ones (default: None, keep all)
+        compress: Write gzip-compressed files (adds ".gz")
+        compresslevel: gzip level, 1 (fast) to 9 (small) (default: 6)
+        batch_size: Maximum number of records written per batch (default: 4096)
+        verbosity: Verbosity when used as an EventSink (default: FULL)
+        echo: Optional stream that also receives every batch (e.g. the terminal)
+        tracer: Optional poker_toolkit.tracing.Tracer; every batch write is recorded as a span
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: Optional[int] = None,
+        max_files: Optional[int] = None,
+        compress: bool = False,
+        compresslevel: int = 6,
+        batch_size: int = 4096,
+        verbosity: Verbosity = Verbosity.FULL,
+        echo=None,
+        tracer=None,
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        self.compress = compress
+        self.compresslevel = compresslevel
+        self.batch_size = batch_size
+        self.verbosity = verbosity
+        self.echo = echo
+        self.tracer = tracer
+
+        self.files = []       # Paths of the files written so far (oldest first)
+        self._raw = None      # Underlying binary file
+        self._stream = None   # raw file or GzipFile wrapping it
+        self._error = None    # Exception raised on the writer thread
+        self._closed = False
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    # -------------------------------------------------------------------------
+    # Producer side (called from the engine thread - never touches the disk)
+    # -------------------------------------------------------------------------
+
+    def write(self, text: str):
+        """Queue raw text (file-like interface)."""
+        if self._error is not None:
+            raise self._error  # The writer thread is gone: nothing would drain the queue
+        if text:
+            self._queue.put(text)
+
+    def emit(self, event: GameEvent):
+        """Queue a game event; it is formatted on the writer thread."""
+        if self._error is not None:
+            raise self._error
+        if event.level <= self.verbosity:
+            self._queue.put(event)
+
+    def rotate(self):
+        """Start a new file once everything queued so far has been written."""
+        self._queue.put(_ROTATE)
+
+    def flush(self):
+        """
+        Ask the writer thread to flush its file. Does not wait for it;
+        use close() to be sure everything is on disk.
+        """
+        self._queue.put(_FLUSH)
+
+    def close(self):
+        """Write everything still queued, close the file and stop the thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    # -------------------------------------------------------------------------
+    # Writer thread
+    # -------------------------------------------------------------------------
+
+    def _run(self):
+        """Writer thread main loop: block for one record, then drain a batch."""
+        try:
+            running = True
+            while running:
+                batch = [self._queue.get()]
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if self.tracer is None:
+                    running = self._write_batch(batch)
+                else:
+                    start = self.tracer.now()
+                    running = self._write_batch(batch)
+                    self.tracer.complete("Log write", "log", start, {"records": len(batch)})
+        except BaseException as e:  # Surface the error in the next write(), emit() or close()
+            self._error = e
+        finally:
+            self._close_file()
+
+    def _write_batch(self, batch) -> bool:
+        """Write one batch; returns False once the stop record is seen."""
+        parts = []
+        for record in batch:
+            if isinstance(record, str):
+                parts.append(record)
+            elif isinstance(record, GameEvent):
+                text = record.format()
+                if text is not None:
+                    parts.append(text + "\n")
+            else:
+                self._write_text("".join(parts))
+                parts = []
+                if record is _ROTATE:
+                    self._close_file()
+                elif record is _FLUSH:
+                    if self._stream is not None:
+                        self._stream.flush()
+                elif record is _STOP:
+                    return False
+        self._write_text("".join(parts))
+        return True
+
+    def _write_text(self, text: str):
+        """Write text to the current file, rotating first if it is full."""
+        if not text:
+            return
+        if self.echo is not None:
+            self.echo.write(text)
+        if self._stream is None:
+            self._open_file()
+        elif self.max_bytes is not None and self._size() >= self.max_bytes:
+            self._close_file()
+            self._open_file()
+        self._stream.write(text.encode("utf-8"))
+
+    def _size(self) -> int:
+        """Bytes in the current file so far (compressed output gzip still holds is flushed first)."""
+        if self._stream is not self._raw:
+            self._stream.flush()  # Z_SYNC_FLUSH: keeps the compression state
+        return self._raw.tell()
+
+    def _open_file(self):
+        """Open the next numbered file and apply the retention limit."""
+        path = self.path
+        if self.files:
+            root, ext = os.path.splitext(self.path)
+            path = f"{root}.{len(self.files) + 1}{ext}"
+        if self.compress:
+            path += ".gz"
+        self._raw = open(path, "wb", buffering=1024 * 1024)
+        if self.compress:
+            self._stream = gzip.GzipFile(fileobj=self._raw, mode="wb", compresslevel=self.compresslevel)
+        else:
+            self._stream = self._raw
+        self.files.append(path)
+
+        if self.max_files is not None:
+            for old in self.files[:-self.max_files]:
+                if os.path.exists(old):
+                    os.remove(old)
+
+    def _close_file(self):
+        """Close the current file (if any); the next write opens a new one."""
+        if self._stream is None:
+            return
+        if self._stream is not self._raw:
+            self._stream.close()
+        self._raw.close()
+        self._stream = None
+        self._raw = None
@@ -0,0 +1,270 @@
+"""
+Columnar Results Export (NumPy / NPZ)
+=====================================
+
+An event sink that accumulates one row per seat per hand and one row per
+action in preallocated, growable typed NumPy arrays, and saves them as
+`.npz` column files. Statistics such as bb/100, showdown win rates and
+aggression are then plain vectorized NumPy over millions of hands.
+
+Requires numpy (`pip install numpy`).
+
+Usage:
+    exporter = NpzExporter(bot_names=[bot.name for bot in bots])
+    game = TexasHoldemEngine(sink=MultiSink([PrintSink(), exporter]))
+    ...
+    exporter.save("results.npz")
+
+    python -m poker_toolkit.tournament --export-npz results.npz
+    python -m poker_toolkit.npzexport results.npz          # per-bot summary
+
+Columns (saved as "hands.<name>" and "actions.<name>", plus "bot_names"):
+    hands:   simulation, hand, seat, bot, big_blind, chips (won or lost this hand),
+             street (last street reached: 0 = pre-flop ... 3 = river), showdown (0/1)
+    actions: simulation, hand, seat, bot, street, action (0 = fold, 1 = check,
+             2 = call, 3 = raise), amount, pot (after the action)
+"""
+
+import argparse
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from poker_toolkit.outcomes import HandOutcomeTracker, HandState
+
+
+HAND_COLUMNS = {
+    "simulation": np.int32,
+    "hand": np.int32,
+    "seat": np.int8,
+    "bot": np.int16,
+    "big_blind": np.int32,
+    "chips": np.int64,
+    "street": np.int8,
+    "showdown": np.int8,
+}
+ACTION_COLUMNS = {
+    "simulation": np.int32,
+    "hand": np.int32,
+    "seat": np.int8,
+    "bot": np.int16,
+    "street": np.int8,
+    "action": np.int8,
+    "amount": np.int64,
+    "pot": np.int64,
+}
+
+
+class ColumnTable:
+    """
+    A set of equally long typed columns in preallocated NumPy arrays that
+    double their capacity when full.
+
+    Args:
+        dtypes: {column name: numpy dtype}
+        capacity: Initial number of rows allocated (default: 4096)
+    """
+
+    def __init__(self, dtypes: Dict[str, type], capacity: int = 4096):
+        self.dtypes = dtypes
+        self.size = 0
+        self._data = {name: np.empty(capacity, dtype=dtype) for name, dtype in dtypes.items()}
+
+    def __len__(self):
+        return self.size
+
+    def _reserve(self, rows: int):
+        """Make room for `rows` more rows."""
+        capacity = len(next(iter(self._data.values())))
+        if self.size + rows <= capacity:
+            return
+        while capacity < self.size + rows:
+            capacity *= 2
+        for name, col in self._data.items():
+            grown = np.empty(capacity, dtype=col.dtype)
+            grown[:self.size] = col[:self.size]
+            self._data[name] = grown
+
+    def append(self, *values):
+        """Append one row (values in column order)."""
+        self._reserve(1)
+        i = self.size
+        for col, value in zip(self._data.values(), values):
+            col[i] = value
+        self.size += 1
+
+    def extend(self, columns: Dict[str, np.ndarray]):
+        """Append many rows given as {column name: array}."""
+        rows = len(next(iter(columns.values())))
+        self._reserve(rows)
+        for name, col in self._data.items():
+            col[self.size:self.size + rows] = columns[name]
+        self.size += rows
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """The filled part of every column (views, not copies)."""
+        return {name: col[:self.size] for name, col in self._data.items()}
+
+
+class NpzExporter(HandOutcomeTracker):
+    """
+    Event sink that records per-hand and per-action rows for NumPy analysis.
+
+    Args:
+        bot_names: Known bot names; their position is the bot id. Unknown names
+                   are appended as they appear.
+        simulation: Simulation id stored with the following hands (see start_table)
+    """
+
+    def __init__(self, bot_names: Optional[List[str]] = None, simulation: int = 0):
+        super().__init__(simulation)
+        self.bot_names = list(bot_names or [])
+        self._bot_ids = {name: i for i, name in enumerate(self.bot_names)}
+        self.hands = ColumnTable(HAND_COLUMNS)
+        self.actions = ColumnTable(ACTION_COLUMNS)
+
+    def _bot_id(self, name: str) -> int:
+        if name not in self._bot_ids:
+            self._bot_ids[name] = len(self.bot_names)
+            self.bot_names.append(name)
+        return self._bot_ids[name]
+
+    # -------------------------------------------------------------------------
+    # Event handling
+    # -------------------------------------------------------------------------
+
+    def action(self, hand: HandState, seat: int, action: int, amount: int, pot: int):
+        self.actions.append(
+            hand.simulation, hand.number, seat, self._bot_id(hand.names[seat]), hand.street,
+            action, amount, pot,
+        )
+
+    def hand_finished(self, hand: HandState):
+        for seat, name, chips, street, shown in hand.outcomes():
+            self.hands.append(
+                hand.simulation, hand.number, seat, self._bot_id(name), hand.big_blind,
+                chips, street, shown,
+            )
+
+    # -------------------------------------------------------------------------
+    # Merging and saving
+    # -------------------------------------------------------------------------
+
+    def columns(self) -> Dict[str, Dict[str, np.ndarray]]:
+        """All rows so far: {"hands": {...}, "actions": {...}, "bot_names": [...]}."""
+        return {
+            "hands": self.hands.columns(),
+            "actions": self.actions.columns(),
+            "bot_names": list(self.bot_names),
+        }
+
+    def extend(self, columns: Dict):
+        """
+        Merge rows exported elsewhere (e.g. returned by a worker process).
+        Bot ids are remapped onto this exporter's names.
+        """
+        remap = np.array([self._bot_id(name) for name in columns["bot_names"]], dtype=np.int16)
+        for table, key in ((self.hands, "hands"), (self.actions, "actions")):
+            cols = dict(columns[key])
+            if len(cols["bot"]):
+                cols["bot"] = remap[cols["bot"]]
+                table.extend(cols)
+
+    def save(self, path: str):
+        """Write all columns to a compressed .npz file."""
+        arrays = {"bot_names": np.array(self.bot_names)}
+        for name, col in self.hands.columns().items():
+            arrays["hands." + name] = col
+        for name, col in self.actions.columns().items():
+            arrays["actions." + name] = col
+        np.savez_compressed(path, **arrays)
+
+
+# =============================================================================
+# LOADING AND STATISTICS
+# =============================================================================
+
+def load(path: str) -> Dict:
+    """
+    Load an exported .npz file.
+
+    Returns:
+        {"hands": {column: array}, "actions": {column: array}, "bot_names": [...]}
+    """
+    with np.load(path) as data:
+        result = {"hands": {}, "actions": {}, "bot_names": [str(n) for n in data["bot_names"]]}
+        for key in data.files:
+            table, _, column = key.partition(".")
+            if column:
+                result[table][column] = data[key]
+    return result
+
+
+def bot_stats(data: Dict) -> List[Dict]:
+    """
+    Per-bot statistics computed with vectorized NumPy.
+
+    Returns:
+        One dict per bot: hands, bb_per_100, showdowns, showdown_win_rate,
+        aggression (raises / calls) and vpip (share of hands with a voluntary
+        call or raise pre-flop), sorted by bb/100
+    """
+    hands, actions = data["hands"], data["actions"]
+    n_bots = len(data["bot_names"])
+
+    played = np.bincount(hands["bot"], minlength=n_bots)
+    big_blind = np.where(hands["big_blind"] > 0, hands["big_blind"], 1)
+    won_bb = np.bincount(hands["bot"], weights=hands["chips"] / big_blind, minlength=n_bots)
+    showdown = hands["showdown"] == 1
+    showdowns = np.bincount(hands["bot"][showdown], minlength=n_bots)
+    showdown_wins = np.bincount(hands["bot"][showdown & (hands["chips"] > 0)], minlength=n_bots)
+
+    raises = np.bincount(actions["bot"][actions["action"] == 3], minlength=n_bots)
+    calls = np.bincount(actions["bot"][actions["action"] == 2], minlength=n_bots)
+
+    # VPIP: distinct (simulation, hand, seat) with a pre-flop call or raise
+    voluntary = (actions["street"] == 0) & (actions["action"] >= 2)
+    keys = np.unique(np.stack([
+        actions["simulation"][voluntary], actions["hand"][voluntary],
+        actions["seat"][voluntary], actions["bot"][voluntary],
+    ]), axis=1)
+    vpip_hands = np.bincount(keys[3], minlength=n_bots) if keys.size else np.zeros(n_bots, dtype=int)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        bb100 = np.where(played > 0, won_bb / played * 100, 0.0)
+        sd_rate = np.where(showdowns > 0, showdown_wins / showdowns, 0.0)
+        aggression = np.where(calls > 0, raises / calls, raises.astype(float))
+        vpip = np.where(played > 0, vpip_hands / played, 0.0)
+
+    stats = [
+        {
+            "bot": name,
+            "hands": int(played[i]),
+            "bb_per_100": float(bb100[i]),
+            "showdowns": int(showdowns[i]),
+            "showdown_win_rate": float(sd_rate[i]),
+            "aggression": float(aggression[i]),
+            "vpip": float(vpip[i]),
+        }
+        for i, name in enumerate(data["bot_names"])
+    ]
+    stats.sort(key=lambda s: s["bb_per_100"], reverse=True)
+    return stats
+
+
+def main(argv=None):
+    """Command-line summary of an exported .npz file."""
+    parser = argparse.ArgumentParser(description="Per-bot statistics from an exported .npz file.")
+    parser.add_argument("path", help=".npz file written by NpzExporter")
+    args = parser.parse_args(argv)
+
+    data = load(args.path)
+    print(f"{len(data['hands']['bot'])} hand rows, {len(data['actions']['bot'])} action rows")
+    print(f"  {'Bot':20} | {'Hands':>7} | {'bb/100':>8} | {'SD':>6} | {'SD won':>6} | {'AF':>5} | {'VPIP':>5}")
+    for s in bot_stats(data):
+        print(f"  {s['bot']:20} | {s['hands']:7} | {s['bb_per_100']:8.1f} | {s['showdowns']:6} | "
+              f"{s['showdown_win_rate'] * 100:5.1f}% | {s['aggression']:5.2f} | {s['vpip'] * 100:4.1f}%")
+
+
+if __name__ == "__main__":
+    main()
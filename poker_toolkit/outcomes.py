@@ -0,0 +1,157 @@
+"""
+Hand Outcome Tracking
+=====================
+
+Base event sink for exporters that need per-seat results of every hand
+(chips won or lost, street reached, showdown) rather than the raw event
+stream. It follows the events of a hand and calls hand_finished() once the
+final stacks are known.
+
+Usage:
+    class MyExporter(HandOutcomeTracker):
+        def hand_finished(self, hand):
+            for seat, name, chips, street, shown in hand.outcomes():
+                ...
+"""
+
+from typing import Iterator
+
+from engine import (
+    ActionEvent,
+    BlindsEvent,
+    DealEvent,
+    EventSink,
+    GameEvent,
+    HandStartEvent,
+    ShowdownEvent,
+    StacksEvent,
+    StreetEvent,
+    Verbosity,
+)
+
+
+STREETS = ["Pre-Flop", "Flop", "Turn", "River"]
+ACTIONS = ["FOLD", "CHECK", "CALL", "RAISE"]
+
+
+class HandState:
+    """
+    What a HandOutcomeTracker knows about the hand being played.
+
+    Attributes:
+        simulation: Simulation id of the table
+        number: Hand number at the table
+        button: Name of the player on the button
+        names: Player names, in seat order
+        seat_of: {name: seat}
+        start_stacks: Stacks at hand start (before blinds)
+        final_stacks: Stacks at hand end (set when the hand is finished)
+        disqualified: Disqualified flag per seat (set when the hand is finished)
+        dealt: True for seats dealt into the hand
+        active: True for seats dealt in and not folded
+        street_reached: Last street (0-3) each seat was still in the hand for
+        shown: True for seats that showed down
+        big_blind: The table's big blind this hand (not a short stack's all-in post)
+        street: Current street (0 = pre-flop ... 3 = river)
+        pot: Pot after the latest blind or action
+    """
+    __slots__ = (
+        "simulation", "number", "button", "names", "seat_of", "start_stacks", "final_stacks",
+        "disqualified", "dealt", "active", "street_reached", "shown", "big_blind", "street", "pot",
+    )
+
+    def __init__(self, simulation: int, event: HandStartEvent):
+        n = len(event.seats)
+        self.simulation = simulation
+        self.number = event.hand_number
+        self.button = event.button
+        self.names = [name for name, _ in event.seats]
+        self.seat_of = {name: seat for seat, name in enumerate(self.names)}
+        self.start_stacks = [stack for _, stack in event.seats]
+        self.final_stacks = []
+        self.disqualified = []
+        self.dealt = [False] * n
+        self.active = [False] * n
+        self.street_reached = [0] * n
+        self.shown = [False] * n
+        self.big_blind = 0
+        self.street = 0
+        self.pot = 0
+
+    @property
+    def showdown(self) -> bool:
+        """True if the hand went to showdown."""
+        return any(self.shown)
+
+    def outcomes(self) -> Iterator[tuple]:
+        """Yield (seat, name, chips won or lost, street reached, shown) for every seat dealt in."""
+        for seat, name in enumerate(self.names):
+            if self.dealt[seat]:
+                yield (seat, name, self.final_stacks[seat] - self.start_stacks[seat],
+                       self.street_reached[seat], self.shown[seat])
+
+
+class HandOutcomeTracker(EventSink):
+    """
+    Event sink that tracks each hand and reports it when it is finished.
+
+    Subclasses implement hand_finished() and may override action().
+
+    Args:
+        simulation: Simulation id stored with the following hands (see start_table)
+    """
+    verbosity = Verbosity.FULL
+
+    def __init__(self, simulation: int = 0):
+        self.simulation = simulation
+        self._hand = None
+
+    def start_table(self, simulation: int):
+        """Tag the following hands with a new simulation id."""
+        self.simulation = simulation
+        self._hand = None
+
+    def action(self, hand: HandState, seat: int, action: int, amount: int, pot: int):
+        """
+        Called for every action. action indexes ACTIONS; amount is the call or
+        raise-to amount; pot is the pot afterwards.
+        """
+        pass
+
+    def hand_finished(self, hand: HandState):
+        """Called once per hand, after the final stacks are known."""
+        raise NotImplementedError("Implement hand_finished method")
+
+    def emit(self, event: GameEvent):
+        if isinstance(event, HandStartEvent):
+            self._hand = HandState(self.simulation, event)
+            return
+
+        hand = self._hand
+        if hand is None:
+            return
+        if isinstance(event, ActionEvent):
+            seat = hand.seat_of[event.player]
+            hand.pot = event.pot
+            if event.action == "FOLD":
+                hand.active[seat] = False
+            self.action(hand, seat, ACTIONS.index(event.action), event.amount, event.pot)
+        elif isinstance(event, StreetEvent):
+            hand.street = STREETS.index(event.street)
+            for seat, active in enumerate(hand.active):
+                if active:
+                    hand.street_reached[seat] = hand.street
+        elif isinstance(event, DealEvent):
+            hand.dealt = [bool(cards) for _, cards in event.hands]
+            hand.active = list(hand.dealt)
+        elif isinstance(event, BlindsEvent):
+            hand.big_blind = event.big_blind or event.bb_amount  # Table's blind, not a short stack's post
+            hand.pot = event.sb_amount + event.bb_amount
+        elif isinstance(event, ShowdownEvent):
+            for name, _, _ in event.hands:
+                hand.shown[hand.seat_of[name]] = True
+        elif isinstance(event, StacksEvent):
+            hand.final_stacks = [stack for _, stack, _ in event.stacks]
+            hand.disqualified = [dq for _, _, dq in event.stacks]
+            self._hand = None
+            self.hand_finished(hand)
@@ -0,0 +1,163 @@
+"""
+Per-Bot Profiling
+=================
+
+Runs a sample of every bot's act() calls under cProfile and merges the
+results per bot - across hands, simulations and tournament worker
+processes - so a slow bot's hotspots (e.g. Deck() construction or
+list.remove in a Monte Carlo loop) can be found without profiling the
+whole engine.
+
+Usage:
+    profiler = BotProfiler(sample_every=10)
+    run_simulation(bots, seed=12345, profiler=profiler)
+    profiler.save("profiles/")          # <bot>.pstats per bot + summary.txt
+    print(profiler.summary(top=15))
+
+    python -m poker_toolkit.tournament --profile profiles/ --profile-every 10
+    python -m pstats profiles/kursa.pstats        # or snakeviz, gprof2dot, ...
+
+Only 1 in sample_every calls of each bot is profiled, so other calls run at
+full speed. A profiled call runs noticeably slower, which also shows in
+--telemetry and can push a bot over a tight time limit. Sandboxed bots
+(--sandbox) run in their own processes and are not profiled.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+from typing import Dict, Optional
+
+
+class BotProfiler:
+    """
+    One cProfile.Profile per bot, switched on for sampled act() calls.
+
+    The engine asks sample() before every in-process act() call and enables
+    the returned profile around it. Stats are kept per bot name.
+
+    Args:
+        sample_every: Profile 1 in N act() calls of each bot (default: 10; 1 = every call)
+
+    Attributes:
+        calls: {bot name: act() calls seen}
+        sampled: {bot name: act() calls profiled}
+    """
+
+    def __init__(self, sample_every: int = 10):
+        if sample_every < 1:
+            raise ValueError("sample_every must be at least 1")
+        self.sample_every = sample_every
+        self.calls: Dict[str, int] = {}
+        self.sampled: Dict[str, int] = {}
+        self._profiles: Dict[str, cProfile.Profile] = {}  # Live profiles, since the last fold
+        self._merged: Dict[str, pstats.Stats] = {}        # Folded and merged stats
+
+    def sample(self, bot: str) -> Optional[cProfile.Profile]:
+        """
+        Called by the engine before an act() call.
+
+        Returns:
+            The bot's profile to enable around the call, or None if this call
+            is not sampled
+        """
+        n = self.calls.get(bot, 0)
+        self.calls[bot] = n + 1
+        if n % self.sample_every:
+            return None
+        self.sampled[bot] = self.sampled.get(bot, 0) + 1
+        profile = self._profiles.get(bot)
+        if profile is None:
+            profile = self._profiles[bot] = cProfile.Profile()
+        return profile
+
+    # -------------------------------------------------------------------------
+    # Merging
+    # -------------------------------------------------------------------------
+
+    def _fold(self):
+        """Move the live profiles into the merged stats (a profile is only read once)."""
+        for bot, profile in self._profiles.items():
+            self._add(bot, pstats.Stats(profile))
+        self._profiles.clear()
+
+    def _add(self, bot: str, stats: pstats.Stats):
+        if bot in self._merged:
+            self._merged[bot].add(stats)
+        else:
+            self._merged[bot] = stats
+
+    def drain(self) -> Dict:
+        """
+        Remove and return everything recorded so far as plain picklable data
+        (e.g. to send from a worker process to the parent, which merge()s it).
+        """
+        self._fold()
+        dump = {
+            bot: (stats.stats, self.calls.get(bot, 0), self.sampled.get(bot, 0))
+            for bot, stats in self._merged.items()
+        }
+        self._merged.clear()
+        self.calls.clear()
+        self.sampled.clear()
+        return dump
+
+    def merge(self, dump: Dict):
+        """Add the stats of another profiler's drain()."""
+        for bot, (raw, calls, sampled) in dump.items():
+            stats = pstats.Stats()
+            stats.stats = raw
+            stats.get_top_level_stats()  # Recompute the totals from the raw entries
+            self._add(bot, stats)
+            self.calls[bot] = self.calls.get(bot, 0) + calls
+            self.sampled[bot] = self.sampled.get(bot, 0) + sampled
+
+    def stats(self) -> Dict[str, pstats.Stats]:
+        """Merged pstats.Stats per bot."""
+        self._fold()
+        return dict(self._merged)
+
+    # -------------------------------------------------------------------------
+    # Output
+    # -------------------------------------------------------------------------
+
+    def summary(self, top: int = 20, sort: str = "tottime") -> str:
+        """
+        Text report with the top functions of every bot.
+
+        Args:
+            top: Functions listed per bot (default: 20)
+            sort: pstats sort key (default: "tottime", time spent in the function
+                  itself; "cumulative" includes callees)
+
+        Returns:
+            The report, slowest bots (by profiled time per sampled call) first
+        """
+        per_bot = self.stats()
+
+        def time_per_call(bot):
+            return per_bot[bot].total_tt / max(1, self.sampled.get(bot, 0))
+
+        parts = []
+        for bot in sorted(per_bot, key=time_per_call, reverse=True):
+            buffer = io.StringIO()
+            stats = per_bot[bot]
+            stats.stream = buffer
+            stats.sort_stats(sort).print_stats(top)
+            stats.stream = None
+            parts.append(
+                f"=== {bot}: {self.sampled.get(bot, 0)} of {self.calls.get(bot, 0)} act() calls profiled, "
+                f"{time_per_call(bot) * 1000:.2f} ms per profiled call ===\n" + buffer.getvalue()
+            )
+        return "\n".join(parts)
+
+    def save(self, directory: str, top: int = 20):
+        """
+        Write <bot>.pstats for every bot and summary.txt (see summary()) into a directory.
+        """
+        os.makedirs(directory, exist_ok=True)
+        for bot, stats in self.stats().items():
+            stats.dump_stats(os.path.join(directory, f"{bot}.pstats"))
+        with open(os.path.join(directory, "summary.txt"), "w") as f:
+            f.write(self.summary(top))
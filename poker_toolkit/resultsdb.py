@@ -0,0 +1,402 @@
+"""
+SQLite Results Store
+====================
+
+Keeps tournament outcomes across runs in one SQLite database (stdlib
+sqlite3) so bots - and different versions of the same bot - can be compared
+long after the process that played the hands is gone.
+
+Rows are buffered and written with executemany() in large transactions, and
+the database runs in WAL mode, so recording results costs the engine next to
+nothing.
+
+Usage:
+    python -m poker_toolkit.tournament --results-db results.db --run-label "gold vs diamond"
+    python -m poker_toolkit.resultsdb results.db              # leaderboard over all runs
+    python -m poker_toolkit.resultsdb results.db --runs       # list the recorded runs
+    python -m poker_toolkit.resultsdb results.db --run 3 4    # leaderboard of runs 3 and 4
+
+    store = ResultsStore("results.db")
+    run_id = store.start_run(label="test", master_seed=12345, bots={"CallBot": None})
+    recorder = ResultsRecorder(simulation=1)
+    result = run_simulation(bots, seed=seed, sink=MultiSink([PrintSink(), recorder]))
+    store.add_simulation(run_id, 1, result, seed=seed)
+    store.add_hands(run_id, recorder.drain())
+    store.close()
+
+Tables:
+    runs:               run_id, started_at, label, master_seed (text), config (JSON)
+    run_bots:           run_id, bot, source_hash (sha256 of the bot file, if known)
+    simulations:        run_id, simulation, seed (text), winner, hands
+    simulation_results: run_id, simulation, bot, final_stack, won (0/1)
+    hands:              run_id, simulation, hand, button, big_blind, pot,
+                        street (0 = pre-flop ... 3 = river), showdown (0/1)
+    hand_outcomes:      run_id, simulation, hand, seat, bot, chips (won or lost),
+                        street (last street reached), showdown (0/1)
+"""
+
+import argparse
+import datetime
+import json
+import sqlite3
+from typing import Dict, Iterable, List, Optional
+
+from poker_toolkit.outcomes import HandOutcomeTracker, HandState
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id      INTEGER PRIMARY KEY,
+    started_at  TEXT NOT NULL,
+    label       TEXT,
+    master_seed TEXT,
+    config      TEXT
+);
+CREATE TABLE IF NOT EXISTS run_bots (
+    run_id      INTEGER NOT NULL REFERENCES runs(run_id),
+    bot         TEXT NOT NULL,
+    source_hash TEXT,
+    PRIMARY KEY (run_id, bot)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS simulations (
+    run_id     INTEGER NOT NULL REFERENCES runs(run_id),
+    simulation INTEGER NOT NULL,
+    seed       TEXT,
+    winner     TEXT,
+    hands      INTEGER NOT NULL,
+    PRIMARY KEY (run_id, simulation)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS simulation_results (
+    run_id      INTEGER NOT NULL,
+    simulation  INTEGER NOT NULL,
+    bot         TEXT NOT NULL,
+    final_stack INTEGER NOT NULL,
+    won         INTEGER NOT NULL,
+    PRIMARY KEY (run_id, simulation, bot)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS hands (
+    run_id     INTEGER NOT NULL,
+    simulation INTEGER NOT NULL,
+    hand       INTEGER NOT NULL,
+    button     TEXT,
+    big_blind  INTEGER NOT NULL,
+    pot        INTEGER NOT NULL,
+    street     INTEGER NOT NULL,
+    showdown   INTEGER NOT NULL,
+    PRIMARY KEY (run_id, simulation, hand)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS hand_outcomes (
+    run_id     INTEGER NOT NULL,
+    simulation INTEGER NOT NULL,
+    hand       INTEGER NOT NULL,
+    seat       INTEGER NOT NULL,
+    bot        TEXT NOT NULL,
+    chips      INTEGER NOT NULL,
+    street     INTEGER NOT NULL,
+    showdown   INTEGER NOT NULL,
+    PRIMARY KEY (run_id, simulation, hand, seat)
+) WITHOUT ROWID;
+
+-- The primary keys already index run_id and (run_id, simulation)
+CREATE INDEX IF NOT EXISTS run_bots_bot ON run_bots(bot);
+CREATE INDEX IF NOT EXISTS simulation_results_bot ON simulation_results(bot, run_id);
+CREATE INDEX IF NOT EXISTS hand_outcomes_bot ON hand_outcomes(bot, run_id);
+"""
+
+_INSERTS = {
+    "simulations": "INSERT OR REPLACE INTO simulations VALUES (?, ?, ?, ?, ?)",
+    "simulation_results": "INSERT OR REPLACE INTO simulation_results VALUES (?, ?, ?, ?, ?)",
+    "hands": "INSERT OR REPLACE INTO hands VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+    "hand_outcomes": "INSERT OR REPLACE INTO hand_outcomes VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+}
+
+
+def _seed_text(seed: Optional[int]) -> Optional[str]:
+    """Seeds are stored as text: derived seeds use all 64 bits, SQLite integers are signed."""
+    return None if seed is None else str(seed)
+
+
+# =============================================================================
+# RECORDING HANDS
+# =============================================================================
+
+class ResultsRecorder(HandOutcomeTracker):
+    """
+    Event sink that collects hand and per-bot outcome rows for a ResultsStore.
+
+    Rows are plain tuples without the run id, so a worker process can collect
+    them and hand them to the process that owns the database.
+
+    Args:
+        simulation: Simulation id stored with the following hands (see start_table)
+    """
+
+    def __init__(self, simulation: int = 0):
+        super().__init__(simulation)
+        self.hands = []     # (simulation, hand, button, big_blind, pot, street, showdown)
+        self.outcomes = []  # (simulation, hand, seat, bot, chips, street, showdown)
+
+    def hand_finished(self, hand: HandState):
+        self.hands.append((
+            hand.simulation, hand.number, hand.button, hand.big_blind, hand.pot,
+            hand.street, int(hand.showdown),
+        ))
+        for seat, name, chips, street, shown in hand.outcomes():
+            self.outcomes.append((hand.simulation, hand.number, seat, name, chips, street, int(shown)))
+
+    def drain(self) -> Dict[str, List[tuple]]:
+        """Return the rows collected so far and start over: {"hands": [...], "outcomes": [...]}."""
+        rows = {"hands": self.hands, "outcomes": self.outcomes}
+        self.hands = []
+        self.outcomes = []
+        return rows
+
+
+# =============================================================================
+# THE STORE
+# =============================================================================
+
+class ResultsStore:
+    """
+    SQLite database of runs, simulations, hands and per-bot hand outcomes.
+
+    Writes are buffered and committed in one transaction per batch_rows rows
+    (and on flush/close).
+
+    Args:
+        path: Database file (created if missing)
+        batch_rows: Buffered rows that trigger a write (default: 50000)
+    """
+
+    def __init__(self, path: str, batch_rows: int = 50_000):
+        self.path = path
+        self.batch_rows = batch_rows
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._pending = {table: [] for table in _INSERTS}
+        self._pending_rows = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -------------------------------------------------------------------------
+    # Writing
+    # -------------------------------------------------------------------------
+
+    def start_run(
+        self, label: Optional[str] = None, master_seed: Optional[int] = None,
+        config: Optional[Dict] = None, bots: Optional[Dict[str, Optional[str]]] = None
+    ) -> int:
+        """
+        Register a new run.
+
+        Args:
+            label: Free-form description (e.g. "GOLD vs DIAMOND")
+            master_seed: Master seed of the run, so it can be reproduced
+            config: Run settings, stored as JSON
+            bots: {bot name: source hash or None} of the bots taking part
+
+        Returns:
+            The new run id
+        """
+        started_at = datetime.datetime.now().isoformat(timespec="seconds")
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO runs (started_at, label, master_seed, config) VALUES (?, ?, ?, ?)",
+                (started_at, label, _seed_text(master_seed), json.dumps(config or {})),
+            )
+            run_id = cursor.lastrowid
+            self.conn.executemany(
+                "INSERT INTO run_bots VALUES (?, ?, ?)",
+                [(run_id, name, source_hash) for name, source_hash in (bots or {}).items()],
+            )
+        return run_id
+
+    def add_simulation(self, run_id: int, simulation: int, result: Dict, seed: Optional[int] = None):
+        """
+        Queue one simulation result (as returned by run_simulation).
+
+        Args:
+            run_id: Run the simulation belongs to
+            simulation: Simulation id (1-based, as printed)
+            result: {"stacks": {...}, "winner": ..., "hands": ...}
+            seed: Table seed of the simulation
+        """
+        self._pending["simulations"].append(
+            (run_id, simulation, _seed_text(seed), result["winner"], result["hands"])
+        )
+        self._pending["simulation_results"].extend(
+            (run_id, simulation, name, stack, int(name == result["winner"]))
+            for name, stack in result["stacks"].items()
+        )
+        self._pending_rows += 1 + len(result["stacks"])
+        self._maybe_flush()
+
+    def add_hands(self, run_id: int, rows: Dict[str, List[tuple]]):
+        """Queue hand and outcome rows collected by a ResultsRecorder."""
+        self._pending["hands"].extend((run_id,) + row for row in rows["hands"])
+        self._pending["hand_outcomes"].extend((run_id,) + row for row in rows["outcomes"])
+        self._pending_rows += len(rows["hands"]) + len(rows["outcomes"])
+        self._maybe_flush()
+
+    def _maybe_flush(self):
+        if self._pending_rows >= self.batch_rows:
+            self.flush()
+
+    def flush(self):
+        """Write all queued rows in a single transaction."""
+        if not self._pending_rows:
+            return
+        with self.conn:
+            for table, sql in _INSERTS.items():
+                if self._pending[table]:
+                    self.conn.executemany(sql, self._pending[table])
+                    self._pending[table] = []
+        self._pending_rows = 0
+
+    def close(self):
+        """Write queued rows and close the database."""
+        if self.conn is None:
+            return
+        self.flush()
+        self.conn.close()
+        self.conn = None
+
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+
+    def _query(self, sql: str, params: Iterable = ()) -> List[Dict]:
+        self.flush()
+        cursor = self.conn.execute(sql, tuple(params))
+        columns = [c[0] for c in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    @staticmethod
+    def _run_filter(run_ids: Optional[List[int]], column: str = "run_id"):
+        """SQL condition and parameters restricting a query to some runs."""
+        if not run_ids:
+            return "1", []
+        return f"{column} IN ({', '.join('?' * len(run_ids))})", list(run_ids)
+
+    def runs(self) -> List[Dict]:
+        """All runs with their simulation and hand counts, newest first."""
+        return self._query(
+            """
+            SELECT r.run_id, r.started_at, r.label, r.master_seed,
+                   (SELECT COUNT(*) FROM simulations s WHERE s.run_id = r.run_id) AS simulations,
+                   (SELECT COUNT(*) FROM hands h WHERE h.run_id = r.run_id) AS hands
+            FROM runs r
+            ORDER BY r.run_id DESC
+            """
+        )
+
+    def leaderboard(self, run_ids: Optional[List[int]] = None, by_version: bool = False) -> List[Dict]:
+        """
+        Simulation leaderboard across runs - the same figures as the final
+        ranking of engine.py, summed over every recorded run.
+
+        Args:
+            run_ids: Restrict to these runs (default: all runs)
+            by_version: Rank each bot version (source hash) separately
+
+        Returns:
+            One dict per bot: bot, source_hash (with by_version), runs, games,
+            wins, win_rate, total_chips, avg_chips; sorted by total chips
+        """
+        where, params = self._run_filter(run_ids, "sr.run_id")
+        version = "rb.source_hash" if by_version else "NULL"
+        rows = self._query(
+            f"""
+            SELECT sr.bot AS bot, {version} AS source_hash,
+                   COUNT(DISTINCT sr.run_id) AS runs,
+                   COUNT(*) AS games,
+                   SUM(sr.won) AS wins,
+                   SUM(sr.final_stack) AS total_chips
+            FROM simulation_results sr
+            LEFT JOIN run_bots rb ON rb.run_id = sr.run_id AND rb.bot = sr.bot
+            WHERE {where}
+            GROUP BY sr.bot, {version}
+            ORDER BY total_chips DESC
+            """,
+            params,
+        )
+        for row in rows:
+            row["win_rate"] = row["wins"] / row["games"] if row["games"] else 0.0
+            row["avg_chips"] = row["total_chips"] / row["games"] if row["games"] else 0.0
+            if not by_version:
+                del row["source_hash"]
+        return rows
+
+    def hand_stats(self, run_ids: Optional[List[int]] = None) -> List[Dict]:
+        """
+        Per-bot hand statistics across runs.
+
+        Returns:
+            One dict per bot: bot, hands, bb_per_100, showdowns, showdown_wins;
+            sorted by bb/100
+        """
+        where, params = self._run_filter(run_ids, "o.run_id")
+        rows = self._query(
+            f"""
+            SELECT o.bot AS bot,
+                   COUNT(*) AS hands,
+                   SUM(CAST(o.chips AS REAL) / MAX(h.big_blind, 1)) AS won_bb,
+                   SUM(o.showdown) AS showdowns,
+                   SUM(o.showdown AND o.chips > 0) AS showdown_wins
+            FROM hand_outcomes o
+            JOIN hands h USING (run_id, simulation, hand)
+            WHERE {where}
+            GROUP BY o.bot
+            """,
+            params,
+        )
+        for row in rows:
+            row["bb_per_100"] = row.pop("won_bb") / row["hands"] * 100 if row["hands"] else 0.0
+        rows.sort(key=lambda r: r["bb_per_100"], reverse=True)
+        return rows
+
+
+def main(argv=None):
+    """Command-line leaderboard of a results database."""
+    parser = argparse.ArgumentParser(description="Leaderboards from a results database.")
+    parser.add_argument("path", help="SQLite database written with --results-db")
+    parser.add_argument("--runs", action="store_true", help="list the recorded runs")
+    parser.add_argument("--run", type=int, nargs="+", default=None, metavar="ID",
+                        help="only include these runs (default: all)")
+    parser.add_argument("--by-version", action="store_true",
+                        help="rank each version (source hash) of a bot separately")
+    args = parser.parse_args(argv)
+
+    with ResultsStore(args.path) as store:
+        if args.runs:
+            print(f"  {'Run':>4} | {'Started':19} | {'Seed':>10} | {'Sims':>5} | {'Hands':>7} | Label")
+            for r in store.runs():
+                seed = "" if r["master_seed"] is None else r["master_seed"]
+                print(f"  {r['run_id']:4} | {r['started_at']:19} | {seed:>10} | "
+                      f"{r['simulations']:5} | {r['hands']:7} | {r['label'] or ''}")
+            return
+
+        print(f"  {'Bot':28} | {'Runs':>4} | {'Games':>5} | {'Wins':>5} | {'Win %':>6} | {'Avg chips':>9}")
+        for r in store.leaderboard(args.run, by_version=args.by_version):
+            name = r["bot"]
+            if args.by_version and r["source_hash"]:
+                name += "@" + r["source_hash"][:7]
+            print(f"  {name:28} | {r['runs']:4} | {r['games']:5} | {r['wins']:5} | "
+                  f"{r['win_rate'] * 100:5.1f}% | {r['avg_chips']:9.0f}")
+
+        stats = store.hand_stats(args.run)
+        if stats:
+            print(f"\n  {'Bot':28} | {'Hands':>7} | {'bb/100':>8} | {'SD':>6} | {'SD won':>6}")
+            for s in stats:
+                print(f"  {s['bot']:28} | {s['hands']:7} | {s['bb_per_100']:8.1f} | "
+                      f"{s['showdowns']:6} | {s['showdown_wins']:6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,373 @@
+"""
+Sandboxed Bot Workers
+=====================
+
+Runs each bot in its own long-lived worker process instead of inside the
+engine. Limits are applied once, when the worker starts (an RLIMIT_AS memory
+cap, optionally an RLIMIT_CPU budget), and the engine talks to the worker
+over a pipe. A bot that runs out of time or memory only takes its own worker
+down; the worker is restarted for the next action.
+
+Since the engine does not install signal handlers or resource limits for
+sandboxed bots, tables can also run in threads.
+
+Usage:
+    bots = load_sandboxed_bots("bots/", memory_limit=512 * 1024 * 1024, time_limit=1.0)
+    run_simulation(bots, seed=12345)
+    close_all(bots)
+
+    python -m poker_toolkit.tournament --sandbox
+
+Each SandboxedAgent owns one worker, so an agent must only be used at one
+table at a time (load one set of bots per concurrent table). A restarted
+worker starts with a fresh bot instance: whatever the bot learned before
+timing out is lost. An anytime bot that committed an action before its time
+ran out keeps its worker: the late replies of that action are discarded.
+
+Bots that implement ponder() think in their worker while the other players
+act; any new request from the engine cancels the call in progress.
+"""
+
+import inspect
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import time
+from typing import List, Optional
+
+from engine import (
+    Action,
+    ActionType,
+    BaseAgent,
+    Deadline,
+    PlayerState,
+    TimeoutException,
+    load_bot,
+    run_anytime,
+)
+
+
+DEFAULT_MEMORY_LIMIT = 1024 * 1024 * 1024  # 1GB, same as in-process bots
+DEFAULT_TIME_LIMIT = 3.0                   # Seconds per action, same as in-process bots
+
+
+# =============================================================================
+# WORKER PROCESS
+# =============================================================================
+
+def _worker_main(conn, path: str, memory_limit: Optional[int], cpu_seconds: Optional[int]):
+    """
+    Worker process main loop: apply the limits, load the bot and answer requests.
+
+    Requests:  ("act", seq, PlayerState) | ("ponder", PlayerState) | ("random", state) | ("stop",)
+    Replies:   ("ready", name, bot implements ponder) once, then for every "act":
+               any number of ("commit", seq, action type name, amount), then
+               ("ok", seq, action type name, amount, cpu seconds, peak memory bytes)
+               | ("memory", seq) | ("error", seq, message)
+               "ponder" gets no reply unless the bot runs out of memory: ("memory", None)
+    """
+    sys.stdout = open(os.devnull, "w")  # Bots' prints would interleave with the engine's output
+    if memory_limit is not None:
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard != resource.RLIM_INFINITY:
+            memory_limit = min(memory_limit, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, hard))
+    if cpu_seconds is not None:
+        _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, hard))
+
+    agent = load_bot(path)
+    if agent is None:
+        conn.send(("error", f"no valid agent class in {path}"))
+        return
+    conn.send(("ready", agent.name, type(agent).ponder is not BaseAgent.ponder))
+
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            return
+        kind = request[0]
+        if kind == "act":
+            _, seq, state = request
+            state._commit_hook = lambda action: conn.send(("commit", seq) + _encode(action))
+            cpu_started = time.process_time()
+            try:
+                action = agent.act(state)
+                if inspect.isgenerator(action):
+                    action = run_anytime(action, state)
+                usage = (time.process_time() - cpu_started,
+                         resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024)  # ru_maxrss is in KB
+                conn.send(("ok", seq) + _encode(action) + usage)
+            except MemoryError:
+                conn.send(("memory", seq))
+                return
+            except Exception as e:
+                conn.send(("error", seq, str(e)))
+        elif kind == "ponder":
+            if conn.poll():
+                continue  # Already superseded by a newer request
+            state = request[1]
+            state.deadline = _PonderDeadline(conn, state.deadline)
+            try:
+                agent.ponder(state)
+            except MemoryError:
+                conn.send(("memory", None))
+                return
+            except Exception:
+                pass
+        elif kind == "random":
+            random.setstate(request[1])
+        elif kind == "stop":
+            return
+
+
+class _PonderDeadline(Deadline):
+    """Deadline of a ponder() call in the worker: also expires as soon as the engine sends a request."""
+    __slots__ = ("_conn",)
+
+    def __init__(self, conn, deadline: Deadline):
+        self.at = deadline.at
+        self.budget = deadline.budget
+        self._conn = conn
+
+    def remaining(self) -> float:
+        return 0.0 if self._conn.poll() else super().remaining()
+
+    def expired(self, margin: float = 0.0) -> bool:
+        return self._conn.poll() or super().expired(margin)
+
+
+def _encode(action: Action) -> tuple:
+    """(action type name, amount) of an action, as sent over the pipe."""
+    atype = action.action_type
+    return (atype.name if hasattr(atype, "name") else str(atype), action.amount)
+
+
+# =============================================================================
+# ENGINE SIDE
+# =============================================================================
+
+class SandboxedAgent(BaseAgent):
+    """
+    Proxy agent whose bot runs in a separate worker process.
+
+    The engine sees an ordinary agent with isolated = True: it calls
+    act_timed() with the bot's time budget, which raises TimeoutException / MemoryError / other
+    exceptions exactly like an in-process bot would, so the engine applies the
+    usual penalties (random action, disqualification, fold). Actions the bot
+    commits (state.commit() or an act() generator) are forwarded as they
+    arrive, so an anytime bot that runs out of time plays its last one.
+
+    Args:
+        path: Bot file (loaded in the worker with engine.load_bot)
+        memory_limit: Address-space limit of the worker in bytes (default: 1GB; None = no limit)
+        time_limit: Seconds the bot may take per action when act() is called
+                    directly (default: 3.0). At a table, the engine's TimeControl
+                    decides the budget of every action.
+        cpu_seconds: Total CPU seconds the worker may use before it is killed
+                     (default: None, no limit); it is then restarted
+        start_method: multiprocessing start method (default: "spawn", which
+                      gives each worker a clean interpreter)
+    """
+    isolated = True
+
+    def __init__(
+        self,
+        path: str,
+        memory_limit: Optional[int] = DEFAULT_MEMORY_LIMIT,
+        time_limit: float = DEFAULT_TIME_LIMIT,
+        cpu_seconds: Optional[int] = None,
+        start_method: str = "spawn",
+    ):
+        super().__init__(os.path.basename(path)[:-3])
+        self.path = os.path.abspath(path)
+        self.memory_limit = memory_limit
+        self.time_limit = time_limit
+        self.cpu_seconds = cpu_seconds
+        self.restarts = 0             # Workers replaced after a timeout or crash
+        self._context = multiprocessing.get_context(start_method)
+        self._process = None
+        self._conn = None
+        self._random_state = None     # Seat stream to load into (re)started workers
+        self._seq = 0                 # Number of the latest "act" request
+        self._ponders = False         # The worker's bot implements ponder()
+        self.last_usage = (None, None)  # (CPU seconds, peak memory bytes) of the last action, from the worker
+
+    # -------------------------------------------------------------------------
+    # Worker lifecycle
+    # -------------------------------------------------------------------------
+
+    def start(self):
+        """
+        Start the worker (done lazily by act(); call it to pay the start-up cost
+        early). A running worker's late replies are dropped, and one that ran
+        out of memory since the last action (in ponder() or in an action that
+        already timed out) is replaced.
+        """
+        if self._process is not None:
+            while self._conn.poll():
+                if self._receive()[0] in ("memory", "exit"):
+                    self._kill()
+                    break
+            if self._process is not None:
+                return
+        parent_conn, child_conn = self._context.Pipe()
+        self._process = self._context.Process(
+            target=_worker_main,
+            args=(child_conn, self.path, self.memory_limit, self.cpu_seconds),
+            name=f"bot-{self.name}",
+            daemon=True,
+        )
+        self._process.start()
+        child_conn.close()
+        self._conn = parent_conn
+
+        reply = self._receive()
+        if reply[0] != "ready":
+            self.close()
+            raise RuntimeError(f"Bot {self.name} failed to start: {reply[-1]}")
+        self._ponders = reply[2]
+        if self._random_state is not None:
+            self._conn.send(("random", self._random_state))
+
+    def close(self):
+        """Stop the worker (it is restarted by the next act())."""
+        if self._process is None:
+            return
+        try:
+            self._conn.send(("stop",))
+        except (BrokenPipeError, OSError):
+            pass
+        self._process.join(timeout=1.0)
+        if self._process.is_alive():
+            self._process.kill()
+            self._process.join()
+        self._conn.close()
+        self._process = None
+        self._conn = None
+
+    def _kill(self):
+        """Kill a misbehaving worker right away."""
+        self._process.kill()
+        self._process.join()
+        self._conn.close()
+        self._process = None
+        self._conn = None
+        self.restarts += 1
+
+    def _receive(self):
+        """Read one reply; a dead worker is reported as an error reply."""
+        try:
+            return self._conn.recv()
+        except (EOFError, OSError):
+            self._process.join()
+            return ("exit", f"worker exited with code {self._process.exitcode}")
+
+    # -------------------------------------------------------------------------
+    # Agent interface
+    # -------------------------------------------------------------------------
+
+    def set_random_state(self, state):
+        """Seed the worker's global random module with the seat's stream (called by add_agent)."""
+        self._random_state = state
+        if self._process is not None:
+            self._conn.send(("random", state))
+
+    def act(self, state: PlayerState) -> Action:
+        return self.act_timed(state, self.time_limit)
+
+    def ponder(self, state: PlayerState):
+        """Hand a pondering snapshot to the worker (returns at once; no-op if the bot does not ponder)."""
+        if self._process is None or not self._ponders:
+            return
+        try:
+            self._conn.send(("ponder", state))
+        except (BrokenPipeError, OSError):
+            pass  # Worker died while pondering: the next act() reports it
+
+    def act_timed(self, state: PlayerState, timeout: Optional[float]) -> Action:
+        """
+        Ask the worker for an action, waiting at most `timeout` seconds
+        (None = no limit). The engine calls this with the bot's time budget.
+
+        Committed actions are recorded with state.commit() as they arrive. On a
+        timeout the worker is only killed if nothing was committed; otherwise it
+        finishes in the background and its late replies are dropped. A worker
+        that runs out of memory outside this action is restarted and asked again.
+        """
+        self.start()
+        self.last_usage = (None, None)
+        self._seq += 1
+        try:
+            self._conn.send(("act", self._seq, state))
+        except (BrokenPipeError, OSError):
+            pass  # Worker died (e.g. while pondering): its last reply or EOF is read below
+        deadline = Deadline(timeout)
+        while True:
+            if not self._conn.poll(None if timeout is None else max(0.0, deadline.remaining())):
+                if state.committed is None:
+                    self._kill()
+                raise TimeoutException()
+
+            reply = self._receive()
+            kind = reply[0]
+            if kind == "memory":
+                self._kill()
+                if reply[1] == self._seq:
+                    raise MemoryError()
+                # ponder() (seq None) or an abandoned action ran out: not this action's fault
+                self.start()
+                self._conn.send(("act", self._seq, state))
+                continue
+            if kind == "exit":
+                self._kill()
+                raise RuntimeError(reply[1])
+            if reply[1] != self._seq:
+                continue  # Late reply to an action that already timed out
+            if kind == "commit":
+                state.commit(Action(ActionType[reply[2]], reply[3]))
+            elif kind == "ok":
+                self.last_usage = (reply[4], reply[5])
+                return Action(ActionType[reply[2]], reply[3])
+            else:
+                raise RuntimeError(reply[2])
+
+
+def load_sandboxed_bots(directory: str, start: bool = True, **limits) -> List[SandboxedAgent]:
+    """
+    Create a SandboxedAgent for every bot file in a directory.
+
+    Args:
+        directory: Directory containing bot files
+        start: Start the workers now and skip files that fail to load, like
+               load_bots does (default: True). With False, the workers start on
+               first use and a broken file only shows up as a crashing bot.
+        **limits: memory_limit, time_limit, cpu_seconds, start_method (see SandboxedAgent)
+
+    Returns:
+        List of SandboxedAgent, sorted by name
+    """
+    bots = []
+    if not os.path.isdir(directory):
+        return bots
+    for filename in sorted(os.listdir(directory)):
+        if filename.endswith(".py") and filename != "__init__.py":
+            bot = SandboxedAgent(os.path.join(directory, filename), **limits)
+            if start:
+                try:
+                    bot.start()
+                except RuntimeError as e:
+                    print(e)
+                    continue
+            bots.append(bot)
+    return bots
+
+
+def close_all(bots: List[BaseAgent]):
+    """Stop the workers of all sandboxed bots in a list."""
+    for bot in bots:
+        if isinstance(bot, SandboxedAgent):
+            bot.close()
@@ -0,0 +1,274 @@
+"""
+Bot Telemetry
+=============
+
+Records how long every act() call takes - wall time, CPU time and (for
+sandboxed bots) peak memory - per bot and per street, so slow bots show up
+before they start timing out in a tournament.
+
+Values go into streaming log-bucketed histograms: recording is a logarithm
+and a dict update, memory does not grow with the number of calls, and
+histograms from several tables or worker processes merge by adding counts.
+Percentiles are accurate to about 2%.
+
+Usage:
+    telemetry = BotTelemetry()
+    run_simulation(bots, seed=12345, time_control=TimeControl(per_action=1.0), telemetry=telemetry)
+    print(telemetry.report())
+    telemetry.save_json("telemetry.json")
+
+    python -m poker_toolkit.tournament --telemetry --telemetry-json telemetry.json
+
+CPU time is the engine thread's time.thread_time() for in-process bots and
+the worker's process time for sandboxed bots. Peak memory is the worker's
+maximum resident set size; in-process bots share the engine's process, so
+none is recorded for them.
+"""
+
+import json
+import math
+from typing import Dict, Iterator, List, Optional
+
+from poker_toolkit.outcomes import STREETS
+
+
+# =============================================================================
+# STREAMING HISTOGRAM
+# =============================================================================
+
+class StreamingHistogram:
+    """
+    Histogram of non-negative values in logarithmic buckets.
+
+    Bucket i holds values in (GROWTH**(i-1), GROWTH**i]; values at or below
+    FLOOR share the lowest bucket. Quantiles are reported as the upper edge of
+    their bucket (capped at the exact maximum), i.e. at most 2% too high.
+
+    Attributes:
+        buckets: {bucket index: count}
+        count: Number of values recorded
+        total: Sum of the values
+        max: Largest value recorded (0.0 if none)
+    """
+    GROWTH = 1.02
+    FLOOR = 1e-7  # 0.1 microseconds: below timer resolution
+
+    _INV_LOG_GROWTH = 1.0 / math.log(GROWTH)
+    _FLOOR_INDEX = math.ceil(math.log(FLOOR) * _INV_LOG_GROWTH)
+
+    __slots__ = ("buckets", "count", "total", "max")
+
+    def __init__(self):
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value: float):
+        """Record one value."""
+        if value > self.FLOOR:
+            index = math.ceil(math.log(value) * self._INV_LOG_GROWTH)
+        else:
+            index = self._FLOOR_INDEX
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "StreamingHistogram"):
+        """Add another histogram's values to this one."""
+        for index, n in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + n
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> float:
+        """
+        Value below which a fraction q of the recorded values fall.
+
+        Args:
+            q: Fraction between 0 and 1 (0.99 = p99)
+
+        Returns:
+            The quantile (0.0 for an empty histogram)
+        """
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(self.GROWTH ** index, self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        """Average of the recorded values (0.0 for an empty histogram)."""
+        return self.total / self.count if self.count else 0.0
+
+    def summary(self) -> Dict[str, float]:
+        """count, mean, p50, p95, p99 and max as a dict."""
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "p50": self.quantile(0.50),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "max": self.max,
+        }
+
+
+# =============================================================================
+# PER-BOT COLLECTOR
+# =============================================================================
+
+class ActStats:
+    """
+    Telemetry of one bot on one street.
+
+    Attributes:
+        wall: Wall-clock seconds per act() call, as seen by the engine
+        cpu: CPU seconds per call (only calls where it was measured)
+        peak_memory: Largest peak resident memory in bytes (None = not measured)
+        budget_used: Largest fraction of the time budget a call used (0.0 = no limited calls)
+        timeouts: Calls that ran out of time
+    """
+    __slots__ = ("wall", "cpu", "peak_memory", "budget_used", "timeouts")
+
+    def __init__(self):
+        self.wall = StreamingHistogram()
+        self.cpu = StreamingHistogram()
+        self.peak_memory = None
+        self.budget_used = 0.0
+        self.timeouts = 0
+
+    def merge(self, other: "ActStats"):
+        """Add another ActStats' calls to this one."""
+        self.wall.merge(other.wall)
+        self.cpu.merge(other.cpu)
+        if other.peak_memory is not None:
+            self.peak_memory = max(self.peak_memory or 0, other.peak_memory)
+        self.budget_used = max(self.budget_used, other.budget_used)
+        self.timeouts += other.timeouts
+
+
+class BotTelemetry:
+    """
+    Collects act() telemetry per bot and street (pass it to TexasHoldemEngine
+    or run_simulation as telemetry=...).
+
+    Objects pickle compactly, so process-pool workers can send theirs back
+    to be merge()d by the parent.
+
+    Attributes:
+        stats: {(bot name, street): ActStats}, street 0 = pre-flop ... 3 = river
+    """
+
+    def __init__(self):
+        self.stats: Dict[tuple, ActStats] = {}
+
+    def record(
+        self, bot: str, street: int, wall: float, cpu: Optional[float] = None,
+        peak_memory: Optional[int] = None, budget: Optional[float] = None, timed_out: bool = False
+    ):
+        """
+        Record one act() call (called by the engine).
+
+        Args:
+            bot: Bot name
+            street: Street of the action (0 = pre-flop ... 3 = river)
+            wall: Wall-clock seconds the call took
+            cpu: CPU seconds the call used (None = not measured)
+            peak_memory: Peak resident memory in bytes (None = not measured)
+            budget: Seconds the bot was allowed (None = no limit)
+            timed_out: The call ran out of time
+        """
+        key = (bot, street)
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = ActStats()
+        stats.wall.add(wall)
+        if cpu is not None:
+            stats.cpu.add(cpu)
+        if peak_memory is not None and (stats.peak_memory is None or peak_memory > stats.peak_memory):
+            stats.peak_memory = peak_memory
+        if budget:
+            used = wall / budget
+            if used > stats.budget_used:
+                stats.budget_used = used
+        if timed_out:
+            stats.timeouts += 1
+
+    def merge(self, other: "BotTelemetry"):
+        """Add another collector's calls (e.g. from a worker process) to this one."""
+        for key, stats in other.stats.items():
+            mine = self.stats.get(key)
+            if mine is None:
+                mine = self.stats[key] = ActStats()
+            mine.merge(stats)
+
+    def ranked(self) -> Iterator[tuple]:
+        """
+        Yield (bot, street, ActStats), closest to the time limit first
+        (most timeouts, then largest fraction of the budget used, then slowest p99).
+        """
+        order = sorted(
+            self.stats.items(),
+            key=lambda item: (item[1].timeouts, item[1].budget_used, item[1].wall.quantile(0.99)),
+            reverse=True,
+        )
+        for (bot, street), stats in order:
+            yield bot, street, stats
+
+    def to_dict(self) -> List[Dict]:
+        """Rows for JSON, in ranked() order; times in seconds, memory in bytes."""
+        rows = []
+        for bot, street, stats in self.ranked():
+            rows.append({
+                "bot": bot,
+                "street": STREETS[street],
+                "calls": stats.wall.count,
+                "wall": stats.wall.summary(),
+                "cpu": stats.cpu.summary(),
+                "peak_memory": stats.peak_memory,
+                "budget_used": stats.budget_used,
+                "timeouts": stats.timeouts,
+            })
+        return rows
+
+    def save_json(self, path: str):
+        """Write to_dict() to a JSON file."""
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def report(self, limit: Optional[int] = None) -> str:
+        """
+        Text table of the telemetry, closest to the time limit first.
+
+        Args:
+            limit: Only show this many rows (default: all)
+
+        Returns:
+            The report (times in milliseconds, memory in MB)
+        """
+        lines = [
+            "=== BOT TELEMETRY (act() times in ms, closest to the limit first) ===",
+            f"  {'Bot':20} | {'Street':8} | {'Calls':>6} | {'Wall p50':>8} | {'p95':>7} | {'p99':>7} | "
+            f"{'max':>7} | {'CPU p99':>7} | {'Peak MB':>7} | {'Limit %':>7} | {'Timeouts':>8}",
+        ]
+        for n, (bot, street, stats) in enumerate(self.ranked()):
+            if limit is not None and n >= limit:
+                break
+            wall = stats.wall
+            cpu = f"{stats.cpu.quantile(0.99) * 1000:7.3f}" if stats.cpu.count else f"{'-':>7}"
+            peak = f"{stats.peak_memory / 2**20:7.0f}" if stats.peak_memory is not None else f"{'-':>7}"
+            used = f"{stats.budget_used * 100:6.1f}%" if stats.budget_used else f"{'-':>7}"
+            lines.append(
+                f"  {bot:20} | {STREETS[street]:8} | {wall.count:6} | {wall.quantile(0.5) * 1000:8.3f} | "
+                f"{wall.quantile(0.95) * 1000:7.3f} | {wall.quantile(0.99) * 1000:7.3f} | "
+                f"{wall.max * 1000:7.3f} | {cpu} | {peak} | {used} | {stats.timeouts:8}"
+            )
+        return "\n".join(lines)
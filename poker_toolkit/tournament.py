@@ -0,0 +1,550 @@
+"""
+Parallel Tournament Runner
+==========================
+
+Runs the same simulations as `python engine.py`, but farms each simulation
+(one TexasHoldemEngine plus its seated bots) out to a process pool sized to
+the machine. Workers return compact per-simulation results and the parent
+merges them into the usual final ranking.
+
+Usage:
+    python -m poker_toolkit.tournament
+    python -m poker_toolkit.tournament --workers 8 --simulations 200 --log-dir logs/
+    python -m poker_toolkit.tournament --log-dir logs/ --compress --max-log-mb 100
+    python -m poker_toolkit.tournament --export-npz results.npz   # per-hand/per-action columns
+    python -m poker_toolkit.tournament --results-db results.db    # keep results across runs
+    python -m poker_toolkit.tournament --sandbox                  # one worker process per bot
+    python -m poker_toolkit.tournament --time-per-action 0.05     # blitz regression run
+    python -m poker_toolkit.tournament --time-bank 60 --time-increment 1 --bank-per simulation
+    python -m poker_toolkit.tournament --sandbox --ponder 1    # bots think while others act
+    python -m poker_toolkit.tournament --telemetry --telemetry-json telemetry.json  # act() timings
+    python -m poker_toolkit.tournament --trace trace.json      # timeline for ui.perfetto.dev
+    python -m poker_toolkit.tournament --profile profiles/     # per-bot cProfile hotspots
+    python -m poker_toolkit.tournament --seed 12345 --only 17   # re-run simulation 17 alone
+
+Each worker loads its own copy of the bots once (at pool start-up) and reuses
+them for every simulation it is given, exactly like the sequential runner
+reuses bot instances across simulations.
+
+All randomness (seating, deck, timeout fallback and each bot seat) is derived
+from one master seed, so a simulation plays out the same whichever worker runs
+it - as long as the bots themselves do not carry state between simulations.
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional
+
+from engine import (
+    MultiSink,
+    NullSink,
+    TimeControl,
+    Verbosity,
+    derive_seed,
+    example_bots,
+    load_bots,
+    print_final_ranking,
+    record_simulation,
+    run_simulation,
+    seat_bots,
+)
+from poker_toolkit.binhistory import BinaryHistoryWriter
+from poker_toolkit.logwriter import BackgroundLogWriter
+from poker_toolkit.resultsdb import ResultsRecorder, ResultsStore
+from poker_toolkit.sandbox import SandboxedAgent, close_all, load_sandboxed_bots
+from poker_toolkit.profiling import BotProfiler
+from poker_toolkit.telemetry import BotTelemetry
+from poker_toolkit.tracing import Tracer
+
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# =============================================================================
+# WORKER SIDE
+# =============================================================================
+
+# Bots loaded by this worker process, keyed by name (filled by _init_worker)
+_WORKER_BOTS: Dict[str, object] = {}
+_WORKER_LOG_DIR: Optional[str] = None
+_WORKER_VERBOSITY = Verbosity.NONE
+_WORKER_LOG_OPTIONS: Dict = {}
+_WORKER_EXPORT_NAMES: Optional[List[str]] = None  # Bot names for NPZ export (None = no export)
+_WORKER_RECORD_RESULTS = False  # Collect hand rows for the results database
+_WORKER_TELEMETRY = False       # Collect per-bot act() telemetry
+_WORKER_TRACER: Optional[Tracer] = None  # Timeline tracer (None = not tracing)
+_WORKER_PROFILER: Optional[BotProfiler] = None  # Per-bot profiler (None = not profiling)
+
+
+def load_tournament_bots(bots_dir: str, sandbox: bool = False) -> List:
+    """
+    Load bots from a directory, falling back to the built-in example bots.
+
+    Args:
+        bots_dir: Directory containing bot files
+        sandbox: Run each bot in its own worker process (see poker_toolkit.sandbox);
+                 the workers are not started here (see _start_seated)
+
+    Returns:
+        List of BaseAgent instances
+    """
+    if sandbox:
+        bots = load_sandboxed_bots(bots_dir, start=False)
+    else:
+        bots = load_bots(bots_dir)
+    if not bots:
+        bots = example_bots()
+    return bots
+
+
+def tournament_bot_names(bots_dir: str) -> List[str]:
+    """
+    Names of the bots load_tournament_bots would load, read from the bot file
+    names (in load_bots order) without importing any bot.
+
+    Returns:
+        List of bot names (the example bots' when there are no bot files)
+    """
+    names = []
+    if os.path.exists(bots_dir):
+        names = [f[:-3] for f in os.listdir(bots_dir) if f.endswith(".py") and f != "__init__.py"]
+    return names or [bot.name for bot in example_bots()]
+
+
+def _init_worker(
+    bots_dir: str, log_dir: Optional[str], verbosity: Verbosity, log_options: Dict,
+    export_names: Optional[List[str]], record_results: bool, sandbox: bool, telemetry: bool,
+    trace_capacity: Optional[int], profile_every: Optional[int]
+):
+    """
+    Process pool initializer: load the bots once per worker process and
+    silence the hand-by-hand output (it is only kept when log_dir is set).
+    """
+    global _WORKER_LOG_DIR, _WORKER_VERBOSITY, _WORKER_LOG_OPTIONS, _WORKER_EXPORT_NAMES
+    global _WORKER_RECORD_RESULTS, _WORKER_TELEMETRY, _WORKER_TRACER, _WORKER_PROFILER
+    sys.stdout = open(os.devnull, "w")
+    _WORKER_LOG_DIR = log_dir
+    _WORKER_VERBOSITY = verbosity if log_dir else Verbosity.NONE
+    _WORKER_LOG_OPTIONS = log_options
+    _WORKER_EXPORT_NAMES = export_names
+    _WORKER_RECORD_RESULTS = record_results
+    _WORKER_TELEMETRY = telemetry
+    _WORKER_TRACER = Tracer(trace_capacity) if trace_capacity else None
+    _WORKER_PROFILER = BotProfiler(profile_every) if profile_every else None
+    for bot in load_tournament_bots(bots_dir, sandbox):
+        _WORKER_BOTS[bot.name] = bot
+
+
+def _start_seated(bots: List) -> List:
+    """
+    Start the workers of the seated sandboxed bots (only these: a pool worker
+    never runs more sandbox processes than one table needs).
+
+    Returns:
+        The bots that can play; those whose worker fails to load are left out
+    """
+    seated = []
+    for bot in bots:
+        if isinstance(bot, SandboxedAgent):
+            try:
+                bot.start()
+            except RuntimeError as e:
+                print(e)
+                continue
+        seated.append(bot)
+    return seated
+
+
+def _run_simulation_task(
+    sim_index: int, bot_names: List[str], start_stack: int, max_hands: int, seed: int,
+    time_control: TimeControl
+) -> Dict:
+    """
+    Run one simulation inside a worker process.
+
+    Args:
+        sim_index: 0-based simulation number (used for the log file name)
+        bot_names: Names of the bots to seat, in seating order
+        start_stack: Starting chip count for each player
+        max_hands: Hand limit for the simulation
+        seed: Table seed for the simulation
+        time_control: Thinking-time rules for the bots
+
+    Returns:
+        Compact result dict from run_simulation, plus "index" (and "columns"
+        with the NPZ export rows when exporting, "rows" with the results
+        database rows when recording, "telemetry" with a BotTelemetry when
+        collecting telemetry, "trace" with the simulation's spans when tracing,
+        "profile" with the BotProfiler.drain() data when profiling)
+    """
+    # A bot file that failed to load in this worker is left out of the table
+    bots = [_WORKER_BOTS[name] for name in bot_names if name in _WORKER_BOTS]
+
+    devnull = sys.stdout
+    sinks = []
+    if _WORKER_LOG_DIR:
+        log_format = _WORKER_LOG_OPTIONS["format"]
+        base = os.path.join(_WORKER_LOG_DIR, f"simulation_{sim_index + 1:04d}")
+        if log_format in ("text", "both") and _WORKER_VERBOSITY != Verbosity.NONE:
+            # Text hand history goes through a background writer (one file set per simulation)
+            writer = BackgroundLogWriter(
+                base + ".txt",
+                verbosity=_WORKER_VERBOSITY,
+                compress=_WORKER_LOG_OPTIONS["compress"],
+                max_bytes=_WORKER_LOG_OPTIONS["max_bytes"],
+                tracer=_WORKER_TRACER,
+            )
+            sys.stdout = writer
+            sinks.append(writer)
+        if log_format in ("binary", "both"):
+            suffix = ".phh.gz" if _WORKER_LOG_OPTIONS["compress"] else ".phh"
+            sinks.append(BinaryHistoryWriter(
+                base + suffix, table_id=sim_index + 1, compress=_WORKER_LOG_OPTIONS["compress"]
+            ))
+    exporter = None
+    if _WORKER_EXPORT_NAMES is not None:
+        from poker_toolkit.npzexport import NpzExporter
+        exporter = NpzExporter(_WORKER_EXPORT_NAMES, simulation=sim_index + 1)
+        sinks.append(exporter)
+    recorder = None
+    if _WORKER_RECORD_RESULTS:
+        recorder = ResultsRecorder(simulation=sim_index + 1)
+        sinks.append(recorder)
+    telemetry = BotTelemetry() if _WORKER_TELEMETRY else None
+    try:
+        print(f"\n--- Simulation {sim_index + 1} ---")
+        playing = _start_seated(bots)
+        sink = MultiSink(sinks) if sinks else NullSink()
+        result = run_simulation(
+            playing, start_stack=start_stack, max_hands=max_hands, seed=seed, sink=sink,
+            time_control=time_control, telemetry=telemetry, tracer=_WORKER_TRACER,
+            profiler=_WORKER_PROFILER,
+        )
+    finally:
+        close_all(bots)  # Sandbox workers only live for their simulation
+        sys.stdout = devnull
+        for s in sinks:
+            s.close()
+
+    result["index"] = sim_index
+    if exporter is not None:
+        result["columns"] = exporter.columns()
+    if recorder is not None:
+        result["rows"] = recorder.drain()
+    if telemetry is not None:
+        result["telemetry"] = telemetry
+    if _WORKER_TRACER is not None:
+        result["trace"] = _WORKER_TRACER.drain()
+    if _WORKER_PROFILER is not None:
+        result["profile"] = _WORKER_PROFILER.drain()
+    return result
+
+
+# =============================================================================
+# PARENT SIDE
+# =============================================================================
+
+def bot_source_hashes(bots_dir: str, bot_names: List[str]) -> Dict[str, Optional[str]]:
+    """
+    sha256 of each bot's source file, so results of different versions of a
+    bot with the same name can be told apart (None for bots without a file).
+    """
+    hashes = {}
+    for name in bot_names:
+        path = os.path.join(bots_dir, name + ".py")
+        if os.path.isfile(path):
+            with open(path, "rb") as f:
+                hashes[name] = hashlib.sha256(f.read()).hexdigest()
+        else:
+            hashes[name] = None
+    return hashes
+
+
+def run_tournament(
+    bots_dir: str,
+    num_simulations: Optional[int] = None,
+    subset_size: int = 10,
+    workers: Optional[int] = None,
+    start_stack: int = 2000,
+    max_hands: int = 100,
+    log_dir: Optional[str] = None,
+    master_seed: Optional[int] = None,
+    only: Optional[List[int]] = None,
+    verbosity: Verbosity = Verbosity.FULL,
+    compress_logs: bool = False,
+    max_log_bytes: Optional[int] = None,
+    log_format: str = "text",
+    export_npz: Optional[str] = None,
+    results_db: Optional[str] = None,
+    run_label: Optional[str] = None,
+    sandbox: bool = False,
+    time_control: Optional[TimeControl] = None,
+    telemetry: Optional[BotTelemetry] = None,
+    tracer: Optional[Tracer] = None,
+    profiler: Optional[BotProfiler] = None,
+):
+    """
+    Run a tournament over a process pool and return the merged statistics.
+
+    Args:
+        bots_dir: Directory containing bot files
+        num_simulations: Number of simulations (default: 10 if the field fits
+                         at one table, 100 otherwise - same as engine.py)
+        subset_size: Maximum players per table (default: 10)
+        workers: Number of worker processes (default: os.cpu_count())
+        start_stack: Starting chip count for each player (default: 2000)
+        max_hands: Hand limit per simulation (default: 100)
+        log_dir: If set, each simulation's hand history is written there
+        master_seed: Seed all random streams derive from (default: a random one,
+                     printed so the run can be reproduced)
+        only: If set, run only these 0-based simulation numbers
+        verbosity: Detail of the per-simulation logs (only used with log_dir;
+                   without it, workers run headless)
+        compress_logs: gzip the per-simulation logs
+        max_log_bytes: Split a simulation's text log into parts of at most this size
+        log_format: "text" (history.txt format), "binary" (see binhistory) or "both"
+        export_npz: If set, save per-hand and per-action columns to this .npz file
+        results_db: If set, record the run in this SQLite results database
+        run_label: Description of the run stored in the results database
+        sandbox: Run every bot in its own long-lived worker process with the
+                 limits applied at spawn, instead of signals and rlimits in the
+                 simulation process
+        time_control: Thinking-time rules for the bots (default: 3 s per action)
+        telemetry: If set, the act() telemetry of every simulation is merged into it
+        tracer: If set, the workers trace every simulation and their spans are added to it
+        profiler: If set, the workers profile the bots (at its sample_every rate)
+                  and their stats are merged into it. Sandboxed bots are not profiled.
+
+    Returns:
+        Tuple (total_chips, games_played, games_won) of {bot name: value} dicts
+    """
+    bot_names = tournament_bot_names(bots_dir)  # The workers load the bots themselves
+    num_players = len(bot_names)
+    print(f"Loaded {num_players} bots.")
+
+    if num_simulations is None:
+        num_simulations = 100 if num_players > subset_size else 10
+    if master_seed is None:
+        master_seed = random.randrange(2**32)
+    print(f"Master seed: {master_seed}")
+
+    sim_indices = list(range(num_simulations)) if only is None else list(only)
+    workers = workers or os.cpu_count() or 1
+    workers = max(1, min(workers, len(sim_indices)))
+    print(f"Running {len(sim_indices)} simulations on {workers} worker processes.")
+
+    if log_dir:
+        os.makedirs(log_dir, exist_ok=True)
+    log_options = {"compress": compress_logs, "max_bytes": max_log_bytes, "format": log_format}
+
+    # Statistics tracking
+    total_chips = {name: 0 for name in bot_names}
+    games_played = {name: 0 for name in bot_names}
+    games_won = {name: 0 for name in bot_names}
+
+    exporter = None
+    if export_npz:
+        from poker_toolkit.npzexport import NpzExporter
+        exporter = NpzExporter(bot_names)
+
+    store = None
+    if results_db:
+        store = ResultsStore(results_db)
+        run_id = store.start_run(
+            label=run_label,
+            master_seed=master_seed,
+            config={
+                "bots_dir": os.path.abspath(bots_dir), "simulations": num_simulations,
+                "only": only, "table_size": subset_size, "start_stack": start_stack,
+                "max_hands": max_hands,
+                "time_control": vars(time_control or TimeControl()),
+            },
+            bots=bot_source_hashes(bots_dir, bot_names),
+        )
+        print(f"Recording results as run {run_id} in {results_db}")
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker,
+        initargs=(
+            bots_dir, log_dir, verbosity, log_options, bot_names if exporter else None,
+            store is not None, sandbox, telemetry is not None,
+            tracer.capacity if tracer is not None else None,
+            profiler.sample_every if profiler is not None else None,
+        ),
+    ) as pool:
+        futures = []
+        sim_seeds = {}
+        for i in sim_indices:
+            # Seating and table seed depend only on the master seed and the index
+            seated = seat_bots(bot_names, subset_size, master_seed, i)
+            sim_seeds[i] = derive_seed(master_seed, "simulation", i)
+            futures.append(pool.submit(
+                _run_simulation_task, i, seated, start_stack, max_hands, sim_seeds[i], time_control
+            ))
+
+        for done, future in enumerate(as_completed(futures), 1):
+            result = future.result()
+            record_simulation(result, total_chips, games_played, games_won)
+            if exporter is not None:
+                exporter.extend(result.pop("columns"))
+            if store is not None:
+                store.add_simulation(run_id, result["index"] + 1, result, seed=sim_seeds[result["index"]])
+                store.add_hands(run_id, result.pop("rows"))
+            if telemetry is not None:
+                telemetry.merge(result.pop("telemetry"))
+            if tracer is not None:
+                tracer.extend(result.pop("trace"))
+            if profiler is not None:
+                profiler.merge(result.pop("profile"))
+            print(f"  Simulation {result['index'] + 1} finished ({done}/{len(sim_indices)}): "
+                  f"winner {result['winner']} after {result['hands']} hands")
+
+    if exporter is not None:
+        exporter.save(export_npz)
+        print(f"Exported {len(exporter.hands)} hand rows and {len(exporter.actions)} action rows to {export_npz}")
+    if store is not None:
+        store.close()
+
+    return total_chips, games_played, games_won
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Run a poker bot tournament on a process pool.")
+    parser.add_argument("--bots-dir", default=os.path.join(PROJECT_DIR, "bots"),
+                        help="directory with bot files (default: bots/)")
+    parser.add_argument("--simulations", type=int, default=None,
+                        help="number of simulations (default: 10, or 100 for >10 bots)")
+    parser.add_argument("--table-size", type=int, default=10,
+                        help="maximum players per table (default: 10)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: number of CPUs)")
+    parser.add_argument("--start-stack", type=int, default=2000,
+                        help="starting chips per player (default: 2000)")
+    parser.add_argument("--max-hands", type=int, default=100,
+                        help="hand limit per simulation (default: 100)")
+    parser.add_argument("--log-dir", default=None,
+                        help="write one hand-history file per simulation into this directory")
+    parser.add_argument("--verbosity", choices=[v.name.lower() for v in Verbosity], default="full",
+                        help="detail of the --log-dir hand histories (default: full)")
+    parser.add_argument("--log-format", choices=["text", "binary", "both"], default="text",
+                        help="format of the --log-dir hand histories (default: text)")
+    parser.add_argument("--compress", action="store_true",
+                        help="gzip the --log-dir hand histories")
+    parser.add_argument("--max-log-mb", type=float, default=None,
+                        help="split each simulation's hand history into files of at most this size")
+    parser.add_argument("--export-npz", default=None, metavar="PATH",
+                        help="save per-hand and per-action columns to this .npz file (needs numpy)")
+    parser.add_argument("--results-db", default=None, metavar="PATH",
+                        help="record the run in this SQLite results database")
+    parser.add_argument("--run-label", default=None,
+                        help="description of the run stored with --results-db")
+    parser.add_argument("--sandbox", action="store_true",
+                        help="run each bot in its own worker process (limits applied once at spawn)")
+    parser.add_argument("--time-per-action", type=float, default=3.0, metavar="SECONDS",
+                        help="time limit per action, may be fractional (default: 3; 0 = no limit)")
+    parser.add_argument("--time-per-street", type=float, default=None, metavar="SECONDS",
+                        help="total thinking time per bot per street (default: no limit; 0 = no limit)")
+    parser.add_argument("--time-bank", type=float, default=None, metavar="SECONDS",
+                        help="chess-clock time bank per bot (default: none; 0 = none)")
+    parser.add_argument("--time-increment", type=float, default=0.0, metavar="SECONDS",
+                        help="seconds added to a bot's time bank after each action (default: 0)")
+    parser.add_argument("--bank-per", choices=["hand", "simulation"], default="hand",
+                        help="refill the time banks every hand or every simulation (default: hand)")
+    parser.add_argument("--ponder", type=float, default=0.0, metavar="SECONDS",
+                        help="let sandboxed bots ponder() for up to this long after each change of the hand "
+                             "(default: 0 = off)")
+    parser.add_argument("--telemetry", action="store_true",
+                        help="print per-bot act() latency, CPU and memory percentiles after the run")
+    parser.add_argument("--telemetry-json", default=None, metavar="PATH",
+                        help="write the per-bot telemetry to this JSON file (implies --telemetry)")
+    parser.add_argument("--trace", default=None, metavar="PATH",
+                        help="write a Chrome trace-event timeline of the run to this JSON file (open in ui.perfetto.dev)")
+    parser.add_argument("--trace-capacity", type=int, default=500_000, metavar="N",
+                        help="spans kept by --trace; older ones are dropped (default: 500000)")
+    parser.add_argument("--profile", default=None, metavar="DIR",
+                        help="profile the bots' act() calls with cProfile and write <bot>.pstats "
+                             "and summary.txt into this directory (not with --sandbox)")
+    parser.add_argument("--profile-every", type=int, default=10, metavar="N",
+                        help="profile 1 in N act() calls of each bot (default: 10)")
+    parser.add_argument("--profile-top", type=int, default=20, metavar="N",
+                        help="functions per bot in the printed --profile summary (default: 20)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="master seed (default: random, printed at start-up)")
+    parser.add_argument("--only", type=int, nargs="+", default=None, metavar="N",
+                        help="run only these simulations (1-based numbers, as printed)")
+    parser.add_argument("--history", default=os.path.join(PROJECT_DIR, "history.txt"),
+                        help="file that receives the tournament summary (default: history.txt)")
+    args = parser.parse_args(argv)
+    try:
+        time_control = TimeControl(
+            per_action=args.time_per_action or None,  # 0 = no limit
+            per_street=args.time_per_street or None,
+            bank=args.time_bank or None,
+            increment=args.time_increment,
+            bank_per=args.bank_per,
+            ponder=args.ponder,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+
+    # The parent's summary goes to the console and, from a background thread, to the history file
+    log_writer = BackgroundLogWriter(args.history, echo=sys.__stdout__)
+    sys.stdout = log_writer
+    try:
+        telemetry = BotTelemetry() if args.telemetry or args.telemetry_json else None
+        tracer = Tracer(args.trace_capacity) if args.trace else None
+        profiler = BotProfiler(args.profile_every) if args.profile else None
+        if profiler is not None and args.sandbox:
+            print("Note: sandboxed bots run in their own processes and are not profiled.")
+        if args.ponder and not args.sandbox:
+            print("Note: only sandboxed bots ponder; --ponder has no effect without --sandbox.")
+        totals = run_tournament(
+            args.bots_dir,
+            num_simulations=args.simulations,
+            subset_size=args.table_size,
+            workers=args.workers,
+            start_stack=args.start_stack,
+            max_hands=args.max_hands,
+            log_dir=args.log_dir,
+            master_seed=args.seed,
+            only=[n - 1 for n in args.only] if args.only else None,
+            verbosity=Verbosity[args.verbosity.upper()],
+            compress_logs=args.compress,
+            max_log_bytes=int(args.max_log_mb * 1024 * 1024) if args.max_log_mb else None,
+            log_format=args.log_format,
+            export_npz=args.export_npz,
+            results_db=args.results_db,
+            run_label=args.run_label,
+            sandbox=args.sandbox,
+            time_control=time_control,
+            telemetry=telemetry,
+            tracer=tracer,
+            profiler=profiler,
+        )
+        print_final_ranking(*totals)
+        if telemetry is not None:
+            print(telemetry.report())
+            if args.telemetry_json:
+                telemetry.save_json(args.telemetry_json)
+                print(f"Telemetry written to {args.telemetry_json}")
+        if tracer is not None:
+            tracer.save(args.trace)
+            print(f"Trace with {len(tracer.events)} spans written to {args.trace}"
+                  + (f" ({tracer.dropped} older spans dropped)" if tracer.dropped else ""))
+        if profiler is not None:
+            profiler.save(args.profile, top=args.profile_top)
+            print(profiler.summary(top=args.profile_top))
+            print(f"Profiles written to {args.profile}")
+
+    finally:
+        sys.stdout = sys.__stdout__
+        log_writer.close()  # Waits until everything is written
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Timeline Tracing
+================
+
+Records where a simulation spends its time - simulations, hands, streets,
+every bot action, showdowns, deck construction and log writes - as spans in
+a ring buffer, and saves them as Chrome trace-event JSON. Open the file in
+https://ui.perfetto.dev or chrome://tracing.
+
+Usage:
+    tracer = Tracer()
+    run_simulation(bots, seed=12345, tracer=tracer)
+    tracer.save("trace.json")
+
+    python -m poker_toolkit.tournament --trace trace.json
+
+The engine only checks `self.tracer is not None` when tracing is off. When
+it is on, a span costs about a microsecond: two perf_counter_ns() calls and
+a deque append. The buffer keeps the newest `capacity` spans, so tracing can
+stay on in long staging runs without growing without bound.
+
+Timestamps come from time.perf_counter_ns() (CLOCK_MONOTONIC on Linux),
+which all processes of a machine share. Spans recorded by tournament worker
+processes therefore line up on one timeline, one track per process and
+thread.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+
+DEFAULT_CAPACITY = 500_000  # Spans kept in the ring buffer (~100 bytes each)
+
+
+class Tracer:
+    """
+    Ring buffer of timed spans.
+
+    Spans are (name, category, start ns, duration ns, pid, tid, args) tuples.
+    Recording is thread-safe (deque appends are atomic), so the log writer
+    thread can record into the same tracer as the engine.
+
+    Args:
+        capacity: Number of spans kept; older ones are dropped (default: 500,000)
+
+    Attributes:
+        events: The ring buffer of spans, oldest first
+        threads: {(pid, tid): thread name} of the threads that recorded spans
+        dropped: Spans pushed out of the ring buffer so far
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.events = deque(maxlen=capacity)
+        self.threads: Dict[tuple, str] = {}
+        self.dropped = 0
+        self._pid = os.getpid()
+
+    @staticmethod
+    def now() -> int:
+        """Start timestamp for complete() (time.perf_counter_ns())."""
+        return time.perf_counter_ns()
+
+    def complete(self, name: str, category: str, start: int, args: Optional[Dict] = None):
+        """
+        Record a span that started at `start` (from now()) and ends now.
+
+        Args:
+            name: Span name shown on the timeline (e.g. the bot's name)
+            category: Span category ("simulation", "hand", "street", "act", ...)
+            start: Value of now() when the span began
+            args: Optional details shown when the span is selected
+        """
+        end = time.perf_counter_ns()
+        tid = threading.get_native_id()
+        if (self._pid, tid) not in self.threads:
+            self.threads[(self._pid, tid)] = threading.current_thread().name
+        if len(self.events) == self.capacity:
+            self.dropped += 1
+        self.events.append((name, category, start, end - start, self._pid, tid, args))
+
+    @contextmanager
+    def span(self, name: str, category: str, args: Optional[Dict] = None):
+        """Context manager version of complete(), for code outside the hot path."""
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.complete(name, category, start, args)
+
+    # -------------------------------------------------------------------------
+    # Collecting and saving
+    # -------------------------------------------------------------------------
+
+    def drain(self) -> Dict:
+        """
+        Remove and return the recorded spans (e.g. to send them from a worker
+        process to the parent, which extend()s its own tracer with them).
+        """
+        dump = {"events": list(self.events), "threads": dict(self.threads), "dropped": self.dropped}
+        self.events.clear()
+        self.dropped = 0
+        return dump
+
+    def extend(self, dump: Dict):
+        """Add the spans of another tracer's drain()."""
+        overflow = len(self.events) + len(dump["events"]) - self.capacity
+        self.dropped += dump["dropped"] + max(0, overflow)
+        self.events.extend(dump["events"])
+        self.threads.update(dump["threads"])
+
+    def to_chrome(self) -> Dict:
+        """The spans as a Chrome trace-event JSON object ("X" complete events, times in µs)."""
+        trace = []
+        pids = set()
+        for (pid, tid), thread_name in self.threads.items():
+            pids.add(pid)
+            trace.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                          "args": {"name": thread_name}})
+        for pid in sorted(pids):
+            label = "engine" if pid == self._pid else f"worker {pid}"
+            trace.append({"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": label}})
+        for name, category, start, duration, pid, tid, args in self.events:
+            event = {"name": name, "cat": category, "ph": "X", "ts": start / 1000, "dur": duration / 1000,
+                     "pid": pid, "tid": tid}
+            if args:
+                event["args"] = args
+            trace.append(event)
+        return {"traceEvents": trace, "displayTimeUnit": "ms", "otherData": {"dropped_spans": self.dropped}}
+
+    def save(self, path: str):
+        """Write the spans to a Chrome trace-event JSON file."""
+        with open(path, "w") as f:
+            json.dump(self.to_chrome(), f, separators=(",", ":"))